@@ -1,9 +1,12 @@
 #!/usr/bin/env python3
+# Marca a origem do trace de inicialização (PAC22_STARTUP_TRACE=1)
+from browser.api import startup_trace
 import os
 import sys
-from PySide6.QtWidgets import QApplication
-from browser.browser import Browser
-from browser.form_login import FormLogin
+import json
+import time
+# Só biblioteca padrão até saber se já existe uma instância aberta
+from browser.api.instance_client import forward_to_running
 
 # Força Qt usar o rendering | Arch + Wayland
 os.environ["QT_QUICK_BACKEND"] = "software"
@@ -20,20 +23,102 @@ os.environ["BROWSER_SECURE"] = "0"
 USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:131.0) Gecko/20100101 (KHTML, like Gecko) Firefox/131.0 Windows 10"
 
 
+def start_caching_proxy(path):
+    # Proxy com cache compartilhado (seção "proxy" do config.json). Precisa ser
+    # configurado antes do primeiro objeto do QtWebEngine.
+    from PySide6.QtNetwork import QNetworkProxy
+    from browser.api.caching_proxy import CachingProxy, proxy_settings, probe_proxy
+    from browser.api.event_log import get_logger, fields
+    config = {}
+    config_path = os.path.join(path, "config.json")
+    if os.path.exists(config_path):
+        with open(config_path, "r") as f:
+            config = json.load(f)
+    settings = proxy_settings(config)
+    if not settings["enabled"]:
+        return None
+    proxy = CachingProxy(settings["folder"], settings["max_size"])
+    try:
+        port = proxy.start_in_thread(port=settings["port"])
+    except OSError as e:
+        # Porta ocupada: reaproveita só se for o proxy de outra instância (outro perfil)
+        proxy, port = None, settings["port"]
+        if not probe_proxy(port):
+            get_logger("proxy").warning("porta do proxy ocupada por outro programa; navegando sem proxy",
+                                        extra=fields(port=port, error=str(e)))
+            return None
+    QNetworkProxy.setApplicationProxy(QNetworkProxy(QNetworkProxy.ProxyType.HttpProxy, "127.0.0.1", port))
+    return proxy
+
+
+def registered_folder():
+    # Pasta do usuário já criado (a instância pré-aquecida não mostra o login)
+    from browser.form_login import CONFIG_DIR, init_user_folder, load_config
+    init_user_folder()
+    username = load_config().get("username")
+    return CONFIG_DIR if username and username != "unknown" else None
+
+
 def main():
+    # app.py [--prewarm] [URL | arquivo.txt ...]
+    prewarm = "--prewarm" in sys.argv[1:]
+    args = [a for a in sys.argv[1:] if a != "--prewarm"]
+
+    # Já existe um navegador aberto: entrega os argumentos (novas abas) e sai
+    t0 = time.perf_counter()
+    if forward_to_running({"args": args, "cwd": os.getcwd(), "show": not prewarm}):
+        print(f"Entregue à instância aberta em {(time.perf_counter() - t0) * 1000:.1f} ms")
+        sys.exit(0)
+
+    # QtWebEngineWidgets precisa vir antes do QApplication; o resto do navegador
+    # (browser.browser e painéis) só depois do login
+    from PySide6.QtWidgets import QApplication
+    from PySide6 import QtWebEngineWidgets
+    from browser.form_login import FormLogin
+
     app = QApplication(sys.argv)
+    startup_trace.mark("imports")
 
-    f = FormLogin()
-    f.exec()
+    folder = registered_folder() if prewarm else None
+    if folder is None:
+        f = FormLogin()
+        f.exec()
+        folder = f.diretorio
+        prewarm = False
+    startup_trace.mark("login")
 
     # Se usuário não passou nada, cai fora
-    if not f.diretorio:
+    if not folder:
         print("Nenhum diretório definido pelo login, saindo...")
         sys.exit(0)
 
+    proxy = start_caching_proxy(folder)
+    if proxy is not None:
+        app.aboutToQuit.connect(proxy.shutdown)
+
+    from browser.browser import Browser
+    from browser.ui.single_instance import InstanceServer
+    from browser.api.event_log import get_logger, fields
+    startup_trace.mark("browser_imports")
+
     # Inicializa browser já com diretório vindo do FormLogin
-    browser = Browser(f.diretorio, user_agent=USER_AGENT)
-    browser.show()
+    browser = Browser(folder, user_agent=USER_AGENT, proxy=proxy)
+
+    # Próximas execuções do app.py viram abas nesta janela
+    instance = InstanceServer(parent=browser)
+    instance.received.connect(browser.handle_remote)
+    if not instance.listen():
+        get_logger("app").warning("modo instância única indisponível",
+                                  extra=fields(error=instance.server.errorString() or "outra instância já responde no socket"))
+    app.aboutToQuit.connect(instance.close)
+
+    if prewarm:
+        # Fica em segundo plano até a próxima execução pedir a janela
+        app.setQuitOnLastWindowClosed(False)
+        browser.prewarm()
+    else:
+        browser.show()
+    browser.open_launch_args(args, os.getcwd())
 
     sys.exit(app.exec())
 
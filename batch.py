@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+# Renderização em lote sem janela: screenshot, PDF e/ou texto de uma lista de URLs
+# com N páginas em paralelo. Resultados em JSONL (uma linha por URL).
+#
+#   python3 batch.py urls.txt --out arquivo/ --png --pdf --txt -j 8 --results arquivo/results.jsonl
+#   python3 batch.py urls.txt --out arquivo/ --pdf --resume --results arquivo/results.jsonl
+import os
+import sys
+import json
+import argparse
+
+# Sem janela e sem GPU, antes de qualquer import do Qt
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+os.environ["QT_QUICK_BACKEND"] = "software"
+os.environ["QT_WEBENGINE_CHROMIUM_FLAGS"] = "--disable-gpu --disable-software-rasterizer"
+
+BASE_PATH = os.path.dirname(os.path.realpath(__file__))
+os.environ["BROWSER_PATH"] = BASE_PATH
+os.environ["BROWSER_SECURE"] = "0"
+
+from browser.api.page_loads import read_url_file, launch_targets
+from browser.api.batch_jobs import ResultWriter, completed_urls, OUTPUTS, DEFAULT_CONCURRENCY, DEFAULT_TIMEOUT, DEFAULT_RETRIES
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:131.0) Gecko/20100101 (KHTML, like Gecko) Firefox/131.0 Windows 10"
+DEFAULT_PROFILE = "~/.pac22_user/batch"
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Renderização em lote (sem janela) de uma lista de URLs")
+    parser.add_argument("targets", nargs="+", help="arquivos .txt com uma URL por linha e/ou URLs")
+    parser.add_argument("--out", default="batch-out", help="pasta de saída")
+    parser.add_argument("--png", action="store_true", help="screenshot")
+    parser.add_argument("--pdf", action="store_true", help="printToPdf")
+    parser.add_argument("--txt", action="store_true", help="texto da página (toPlainText)")
+    parser.add_argument("--full-page", action="store_true", help="screenshot da página inteira")
+    parser.add_argument("-j", "--concurrency", type=int, default=DEFAULT_CONCURRENCY, help="páginas em paralelo")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT, help="segundos por URL")
+    parser.add_argument("--retries", type=int, default=DEFAULT_RETRIES, help="novas tentativas por URL")
+    parser.add_argument("--settle", type=int, default=None, help="ms de espera após o load antes de capturar")
+    parser.add_argument("--width", type=int, default=None)
+    parser.add_argument("--height", type=int, default=None)
+    parser.add_argument("--results", default=None, help="arquivo JSONL (padrão: stdout)")
+    parser.add_argument("--resume", action="store_true", help="pula URLs que já deram certo em --results")
+    parser.add_argument("--profile", default=DEFAULT_PROFILE, help="pasta do perfil (cookies, cache)")
+    parser.add_argument("--dark", action="store_true", help="mantém o tema escuro do navegador")
+    return parser.parse_args(argv)
+
+
+def batch_config(folder, dark):
+    # config.json do perfil (se houver) sobre o padrão; sem tema escuro no arquivo
+    from browser.form_login import DEFAULT_CONFIG
+    config = json.loads(json.dumps(DEFAULT_CONFIG))
+    path = os.path.join(folder, "config.json")
+    if os.path.exists(path):
+        with open(path, "r") as f:
+            for key, value in json.load(f).items():
+                if isinstance(value, dict) and isinstance(config.get(key), dict):
+                    config[key].update(value)
+                else:
+                    config[key] = value
+    if not dark:
+        config["settings"]["ForceDarkMode"] = False
+        config["scripts"] = {name: False for name in config.get("scripts", {})}
+    return config
+
+
+def main():
+    args = parse_args(sys.argv[1:])
+    outputs = [kind for kind in OUTPUTS if getattr(args, kind)] or ["png"]
+    urls, lists = launch_targets(args.targets, os.getcwd())
+    for path in lists:
+        urls += read_url_file(path)
+    if not urls:
+        print("Nenhuma URL para processar")
+        sys.exit(2)
+    skip = completed_urls(args.results) if args.resume else set()
+
+    from PySide6.QtWidgets import QApplication
+    from PySide6 import QtWebEngineWidgets
+    from browser.ui.private_profile import PrivateProfile
+    from browser.ui.batch_renderer import BatchRenderer, DEFAULT_WIDTH, DEFAULT_HEIGHT, DEFAULT_SETTLE_MS
+
+    app = QApplication(sys.argv[:1])
+    folder = os.path.expanduser(args.profile)
+    os.makedirs(folder, exist_ok=True)
+    profile = PrivateProfile(folder, batch_config(folder, args.dark))
+    profile.setHttpUserAgent(USER_AGENT)
+
+    options = {
+        "out": os.path.abspath(args.out),
+        "outputs": outputs,
+        "full_page": args.full_page,
+        "concurrency": args.concurrency,
+        "timeout": args.timeout,
+        "retries": args.retries,
+        "settle_ms": DEFAULT_SETTLE_MS if args.settle is None else args.settle,
+        "width": args.width or DEFAULT_WIDTH,
+        "height": args.height or DEFAULT_HEIGHT,
+    }
+    writer = ResultWriter(args.results, append=args.resume)
+    renderer = BatchRenderer(profile, urls, options, writer, skip=skip)
+
+    summary = {}
+    def finished(result):
+        summary.update(result)
+        app.quit()
+    renderer.done.connect(finished)
+    renderer.start()
+    app.exec()
+    writer.close()
+
+    print(json.dumps(summary), file=sys.stderr)
+    sys.exit(1 if summary.get("failed") else 0)
+
+
+if __name__ == "__main__":
+    main()
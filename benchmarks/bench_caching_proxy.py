@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+# Benchmark do proxy com cache, todo local e sem rede: um servidor de origem serve
+# N recursos (parte com max-age, parte com ETag e no-cache) com latência artificial.
+# Mede três rodadas pelo proxy: fria, quente e quente depois de reiniciar o proxy
+# (outra execução com a mesma pasta). Também dispara pedidos simultâneos iguais
+# para mostrar o colapso: a origem deve receber um só.
+#
+#   python3 benchmarks/bench_caching_proxy.py [recursos] [latência_ms]
+import os, sys, time, json, shutil, hashlib, tempfile, threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+import requests
+
+BASE_PATH = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+sys.path.append(BASE_PATH)
+
+from browser.api.caching_proxy import CachingProxy
+
+ASSET_SIZE = 32 * 1024
+WORKERS = 8
+
+
+class Origin(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    hits = 0
+    lock = threading.Lock()
+    latency = 0.05
+
+    def do_GET(self):
+        with Origin.lock:
+            Origin.hits += 1
+        time.sleep(Origin.latency)
+        n = int(self.path.strip("/").split(".")[0].lstrip("a") or 0)
+        body = (f"/* {n} */".encode() + b"x" * ASSET_SIZE)[:ASSET_SIZE]
+        etag = '"' + hashlib.md5(body).hexdigest() + '"'
+        if n % 2 and self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/css")
+        if n % 2:
+            # Ímpares: precisam revalidar sempre (304 sem corpo)
+            self.send_header("Cache-Control", "no-cache")
+            self.send_header("ETag", etag)
+        else:
+            self.send_header("Cache-Control", "public, max-age=3600")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def fetch_all(urls, proxies):
+    session = requests.Session()
+    session.proxies = proxies
+    sizes = []
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(WORKERS) as pool:
+        for response in pool.map(session.get, urls):
+            response.raise_for_status()
+            sizes.append(len(response.content))
+    return time.perf_counter() - t0, sum(sizes)
+
+
+def round_trip(label, urls, proxies):
+    Origin.hits = 0
+    seconds, size = fetch_all(urls, proxies)
+    print(f"{label:>22}: {seconds * 1000:7.0f} ms  {size / 1024:6.0f} KB  {Origin.hits:4d} pedidos na origem")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    Origin.latency = (float(sys.argv[2]) if len(sys.argv) > 2 else 50) / 1000
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Origin)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    urls = [f"{base}/a{i}.css" for i in range(count)]
+    folder = tempfile.mkdtemp(prefix="bench-proxy-")
+    print(f"{count} recursos de {ASSET_SIZE // 1024} KB, latência {Origin.latency * 1000:.0f} ms, {WORKERS} conexões")
+
+    try:
+        round_trip("direto", urls, {})
+
+        proxy = CachingProxy(folder)
+        port = proxy.start_in_thread()
+        proxies = {"http": f"http://127.0.0.1:{port}"}
+        round_trip("proxy frio", urls, proxies)
+        round_trip("proxy quente", urls, proxies)
+        proxy.shutdown()
+
+        proxy = CachingProxy(folder)
+        proxies = {"http": f"http://127.0.0.1:{proxy.start_in_thread()}"}
+        round_trip("proxy reiniciado", urls, proxies)
+        round_trip("colapso (32 iguais)", [f"{base}/a{count * 2}.css"] * 32, proxies)
+        stats = requests.get(f"http://127.0.0.1:{proxy.port}/stats").json()
+        print("contadores:", json.dumps(stats))
+        proxy.shutdown()
+    finally:
+        server.shutdown()
+        shutil.rmtree(folder, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
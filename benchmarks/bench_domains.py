@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+# Benchmark do resolvedor de domínio registrável: carga da trie compilada e
+# lookups/segundo (hosts distintos e com repetição, como em títulos de abas e
+# subrecursos), comparando com tldextract sem rede (snapshot embutido dele).
+#
+#   python3 benchmarks/bench_domains.py [lookups]
+import os, sys, time, random
+
+BASE_PATH = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+sys.path.append(BASE_PATH)
+
+from browser.api import domains
+
+TLDS = ["com", "net", "org", "com.br", "io", "co.uk", "de", "github.io", "s3.amazonaws.com", "kobe.jp", "gov.br"]
+
+
+def random_label(rnd):
+    return "".join(rnd.choice("abcdefghijklmnopqrstuvwxyz0123456789") for _ in range(rnd.randint(3, 10)))
+
+
+def make_hosts(count, rnd):
+    hosts = []
+    for _ in range(count):
+        labels = [random_label(rnd) for _ in range(rnd.randint(1, 3))]
+        hosts.append(".".join(labels) + "." + rnd.choice(TLDS))
+    return hosts
+
+
+def rate(func, hosts):
+    t0 = time.perf_counter()
+    for host in hosts:
+        func(host)
+    return len(hosts) / (time.perf_counter() - t0)
+
+
+def main():
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    rnd = random.Random(8)
+    distinct = make_hosts(total, rnd)
+    # Tráfego real repete poucos hosts muitas vezes
+    popular = distinct[:500]
+    repeated = [popular[min(int(rnd.paretovariate(1.2)) - 1, len(popular) - 1)] for _ in range(total)]
+
+    t0 = time.perf_counter()
+    domains.load_trie()
+    load = time.perf_counter() - t0
+
+    domains.registrable_domain.cache_clear()
+    ours_distinct = rate(domains.registrable_domain, distinct)
+    ours_repeated = rate(domains.registrable_domain, repeated)
+
+    print(f"lookups:             {total}")
+    print(f"carga da trie:       {load * 1000:.1f} ms")
+    print(f"registrable_domain:  {ours_distinct:,.0f}/s distintos, {ours_repeated:,.0f}/s com repetição (LRU)")
+
+    try:
+        import tldextract
+    except ImportError:
+        print("tldextract não instalado: sem comparação")
+        return
+    t0 = time.perf_counter()
+    extract = tldextract.TLDExtract(suffix_list_urls=(), cache_dir=None, include_psl_private_domains=True)
+    extract("example.com")
+    tld_load = time.perf_counter() - t0
+    tld_distinct = rate(extract, distinct)
+    tld_repeated = rate(extract, repeated)
+    print(f"tldextract carga:    {tld_load * 1000:.1f} ms")
+    print(f"tldextract:          {tld_distinct:,.0f}/s distintos, {tld_repeated:,.0f}/s com repetição")
+    print(f"ganho:               {ours_distinct / tld_distinct:.1f}x distintos, {ours_repeated / tld_repeated:.1f}x com repetição")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+# Benchmark do cache HTTP do perfil: um servidor local serve uma página com N
+# recursos estáticos (Cache-Control max-age, latência artificial por pedido).
+# Cada modo (memory, disk) roda duas vezes em processos separados com a mesma
+# pasta de cache, como dois inícios do navegador: frio e quente.
+#
+#   python3 benchmarks/bench_http_cache.py [recursos] [latência_ms]
+import os, sys, json, time, shutil, tempfile, threading, subprocess
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+BASE_PATH = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+sys.path.append(BASE_PATH)
+
+ASSET_SIZE = 64 * 1024
+
+
+class Handler(BaseHTTPRequestHandler):
+    hits = 0
+    lock = threading.Lock()
+    assets = 40
+    latency = 0.05
+
+    def do_GET(self):
+        with Handler.lock:
+            Handler.hits += 1
+        time.sleep(Handler.latency)
+        if self.path == "/":
+            links = "".join(f'<link rel="stylesheet" href="/s{i}.css">' for i in range(Handler.assets))
+            body = f"<html><head>{links}</head><body>bench</body></html>".encode()
+            self.reply(body, "text/html", "no-cache")
+        elif self.path.startswith("/s") and self.path.endswith(".css"):
+            body = (b"/*" + b"x" * (ASSET_SIZE - 4) + b"*/")
+            self.reply(body, "text/css", "public, max-age=3600")
+        else:
+            self.send_error(404)
+
+    def reply(self, body, mime, cache_control):
+        self.send_response(200)
+        self.send_header("Content-Type", mime)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", cache_control)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def child(url, folder, cache_type):
+    # Um "início do navegador": perfil novo apontando para a mesma pasta de cache
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PySide6.QtWidgets import QApplication
+    from PySide6.QtCore import QUrl, QTimer
+    from PySide6.QtWebEngineCore import QWebEngineProfile, QWebEnginePage
+    from browser.api.http_cache import cache_settings
+    from browser.ui.private_profile import apply_http_cache
+
+    app = QApplication(sys.argv[:1])
+    profile = QWebEngineProfile("bench-http-cache")
+    profile.setPersistentStoragePath(os.path.join(folder, "default"))
+    apply_http_cache(profile, folder, cache_settings({"cache": {"type": cache_type}}))
+    page = QWebEnginePage(profile)
+    result = {}
+
+    def finished(ok):
+        result["seconds"] = time.perf_counter() - started
+        result["ok"] = ok
+        # Dá tempo do cache em disco terminar de gravar antes de sair
+        QTimer.singleShot(1000, app.quit)
+
+    page.loadFinished.connect(finished)
+    started = time.perf_counter()
+    page.setUrl(QUrl(url))
+    app.exec()
+    del page
+    del profile
+    print(json.dumps(result))
+
+
+def run(url, folder, cache_type):
+    Handler.hits = 0
+    out = subprocess.run(
+        [sys.executable, os.path.realpath(__file__), "--child", url, folder, cache_type],
+        capture_output=True, text=True, check=True,
+    ).stdout.strip().splitlines()[-1]
+    result = json.loads(out)
+    result["requests"] = Handler.hits
+    return result
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "--child":
+        child(*sys.argv[2:5])
+        return
+    Handler.assets = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+    Handler.latency = (float(sys.argv[2]) if len(sys.argv) > 2 else 50) / 1000
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/"
+    print(f"{Handler.assets} recursos de {ASSET_SIZE // 1024} KB, latência {Handler.latency * 1000:.0f} ms por pedido")
+
+    for cache_type in ("memory", "disk"):
+        folder = tempfile.mkdtemp(prefix="bench-http-cache-")
+        try:
+            cold = run(url, folder, cache_type)
+            warm = run(url, folder, cache_type)
+        finally:
+            shutil.rmtree(folder, ignore_errors=True)
+        print(
+            f"{cache_type:>6}: frio {cold['seconds'] * 1000:7.0f} ms ({cold['requests']} pedidos)"
+            f"  |  quente {warm['seconds'] * 1000:7.0f} ms ({warm['requests']} pedidos)"
+        )
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# Benchmark da API de automação contra o navegador aberto ("rpc": {"enabled": true}
+# no config.json). Compara N chamadas uma a uma (uma ida e volta da GUI cada) com as
+# mesmas N em pipeline e num lote JSON-RPC: latência p50/p99 e chamadas por segundo.
+# Com abas abertas também mede tabs.list e tab.eval (JS de verdade no renderer).
+#
+#   python3 benchmarks/bench_rpc.py [chamadas] [socket]
+import os, sys, time
+
+BASE_PATH = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+sys.path.append(BASE_PATH)
+
+from browser.api.rpc_client import RpcClient, RpcError
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p / 100))]
+
+
+def sequential(rpc, method, params, count):
+    latencies = []
+    start = time.perf_counter()
+    for _ in range(count):
+        t0 = time.perf_counter()
+        rpc.call(method, **params)
+        latencies.append(time.perf_counter() - t0)
+    return time.perf_counter() - start, latencies
+
+
+def pipelined(rpc, method, params, count):
+    start = time.perf_counter()
+    results = rpc.pipeline([(method, params)] * count)
+    errors = [r for r in results if isinstance(r, RpcError)]
+    if errors:
+        raise errors[0]
+    return time.perf_counter() - start
+
+
+def batched(rpc, method, params, count):
+    start = time.perf_counter()
+    rpc.batch([(method, params)] * count)
+    return time.perf_counter() - start
+
+
+def report(rpc, label, method, params, count):
+    seconds, latencies = sequential(rpc, method, params, count)
+    print(f"{label:>14} uma a uma: {count / seconds:9.0f} chamadas/s  "
+          f"p50 {percentile(latencies, 50) * 1e6:7.0f} µs  p99 {percentile(latencies, 99) * 1e6:7.0f} µs")
+    seconds = pipelined(rpc, method, params, count)
+    print(f"{label:>14} pipeline:  {count / seconds:9.0f} chamadas/s  total {seconds * 1000:7.1f} ms")
+    seconds = batched(rpc, method, params, count)
+    print(f"{label:>14} lote:      {count / seconds:9.0f} chamadas/s  total {seconds * 1000:7.1f} ms")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    path = sys.argv[2] if len(sys.argv) > 2 else None
+    try:
+        rpc = RpcClient(path)
+    except OSError as e:
+        print("Navegador com a API ligada não encontrado:", e)
+        sys.exit(1)
+    with rpc:
+        report(rpc, "ping", "ping", {}, count)
+        tabs = rpc.call("tabs.list")
+        print(f"{len(tabs)} abas abertas")
+        report(rpc, "tabs.list", "tabs.list", {}, count)
+        live = [t for t in tabs if t["materialized"]]
+        if live:
+            report(rpc, "tab.eval", "tab.eval", {"id": live[0]["id"], "script": "document.title"}, max(1, count // 10))
+
+
+if __name__ == "__main__":
+    main()
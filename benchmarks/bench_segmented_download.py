@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# Benchmark do download segmentado contra um servidor HTTP local com suporte a Range.
+# Cada conexão do servidor é limitada (simula um link por conexão), então a vazão
+# de 1 segmento vs N segmentos fica visível mesmo em localhost. Também testa a
+# retomada: cancela no meio e continua pelo journal, conferindo o SHA-256.
+#
+#   python3 benchmarks/bench_segmented_download.py [tamanho_mb] [segmentos] [mb_por_conexao]
+import os, sys, time, hashlib, tempfile, threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+BASE_PATH = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+sys.path.append(BASE_PATH)
+
+from browser.api.segmented_download import SegmentedDownload, DownloadCancelled, make_session
+
+
+class RangeHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    data = b""
+    rate = 0
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        size = len(self.data)
+        start, end, status = 0, size - 1, 200
+        header = self.headers.get("Range")
+        if header and header.startswith("bytes="):
+            first, _, last = header[6:].partition("-")
+            start = int(first)
+            end = min(int(last), size - 1) if last else size - 1
+            status = 206
+        self.send_response(status)
+        self.send_header("Accept-Ranges", "bytes")
+        self.send_header("ETag", '"bench"')
+        self.send_header("Content-Length", str(end - start + 1))
+        if status == 206:
+            self.send_header("Content-Range", f"bytes {start}-{end}/{size}")
+        self.end_headers()
+        pos, block = start, 64 * 1024
+        began = time.monotonic()
+        try:
+            while pos <= end:
+                chunk = self.data[pos:min(pos + block, end + 1)]
+                self.wfile.write(chunk)
+                pos += len(chunk)
+                if self.rate:
+                    ahead = (pos - start) / self.rate - (time.monotonic() - began)
+                    if ahead > 0:
+                        time.sleep(ahead)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+
+def start_server(data, rate):
+    RangeHandler.data = data
+    RangeHandler.rate = rate
+    server = ThreadingHTTPServer(("127.0.0.1", 0), RangeHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def run(url, path, segments):
+    job = SegmentedDownload(url, path, segments=segments, session=make_session(segments), min_segment_size=1024 * 1024)
+    return job.run()
+
+
+def main():
+    size_mb = int(sys.argv[1]) if len(sys.argv) > 1 else 64
+    segments = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    rate_mb = float(sys.argv[3]) if len(sys.argv) > 3 else 16
+    data = os.urandom(size_mb * 1024 * 1024)
+    expected = hashlib.sha256(data).hexdigest()
+    server = start_server(data, int(rate_mb * 1024 * 1024))
+    url = f"http://127.0.0.1:{server.server_address[1]}/file.bin"
+
+    with tempfile.TemporaryDirectory() as folder:
+        for n in (1, segments):
+            path = os.path.join(folder, f"file-{n}.bin")
+            result = run(url, path, n)
+            ok = result["sha256"] == expected
+            print(f"{n:>2} segmento(s): {size_mb / result['elapsed']:7.1f} MB/s  sha256 {'ok' if ok else 'DIFERENTE'}")
+
+        # Retomada: cancela por volta da metade e continua em outro objeto
+        path = os.path.join(folder, "resume.bin")
+        job = None
+
+        def progress(received, total):
+            if received > total // 2:
+                job.cancel()
+
+        job = SegmentedDownload(url, path, segments=segments, progress=progress, min_segment_size=1024 * 1024)
+        try:
+            job.run()
+        except DownloadCancelled:
+            pass
+        partial = job.received()
+        result = run(url, path, segments)
+        ok = result["sha256"] == expected
+        print(f"retomada: {partial / 1024 / 1024:.1f} MB reaproveitados, resumed={result['resumed']}  sha256 {'ok' if ok else 'DIFERENTE'}")
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# Benchmark das sugestões da barra de endereço: cria um HistoryStore com N entradas
+# sintéticas e mede a latência por tecla digitando consultas letra a letra
+# (p50/p99/máx), comparando com a varredura linear antiga sobre a lista. "tecla" é
+# o tempo na thread da GUI (FTS numa thread, como no navegador); "lista completa"
+# inclui a resposta do FTS; "síncrono" roda tudo na tecla.
+#
+#   python3 benchmarks/bench_suggestions.py [entradas]
+import os, sys, time, random, tempfile, threading
+
+BASE_PATH = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+sys.path.append(BASE_PATH)
+
+from browser.api.history_store import HistoryStore, normalize_url
+from browser.api.suggestions import SuggestionEngine
+
+WORDS = ["news", "mail", "docs", "video", "search", "shop", "wiki", "forum", "blog", "maps",
+         "github", "python", "linux", "arch", "debian", "qt", "browser", "music", "photo", "cloud"]
+TLDS = ["com", "net", "org", "com.br", "io", "dev"]
+
+
+def make_rows(total, rnd):
+    now = time.time()
+    rows = []
+    for i in range(total):
+        host = f"{rnd.choice(WORDS)}{rnd.randint(0, total // 20)}.{rnd.choice(TLDS)}"
+        path = "/".join(rnd.choice(WORDS) for _ in range(rnd.randint(0, 3)))
+        url = f"https://{host}/{path}?id={i}"
+        title = " ".join(rnd.choice(WORDS).capitalize() for _ in range(rnd.randint(1, 5)))
+        last = now - rnd.random() * 200 * 86400
+        rows.append((normalize_url(url), url, title, rnd.randint(1, 50), last, last))
+    return rows
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+def main():
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    rnd = random.Random(6)
+    rows = make_rows(total, rnd)
+
+    with tempfile.TemporaryDirectory() as folder:
+        store = HistoryStore(folder)
+        t0 = time.perf_counter()
+        with store.conn:
+            store.conn.executemany(
+                "INSERT INTO urls(url, display_url, title, visit_count, first_visit, last_visit) VALUES(?, ?, ?, ?, ?, ?)", rows)
+        insert = time.perf_counter() - t0
+
+        engine = SuggestionEngine(store)
+        t0 = time.perf_counter()
+        engine.build()
+        build = time.perf_counter() - t0
+
+        queries = ["github", "python12", "docs.com", "wiki", "news4", "maps/shop", "qt browser", "zzz", "arch1", "https://cloud"]
+        queries += [f"{rnd.choice(WORDS)}{rnd.randint(0, total // 20)}" for _ in range(40)]
+        times, complete = [], []
+        arrived = threading.Event()
+        requested = []
+        request_deep = engine.request_deep
+        engine.request_deep = lambda *args: (requested.append(True), request_deep(*args))
+        for query in queries:
+            for n in range(1, len(query) + 1):
+                arrived.clear()
+                requested.clear()
+                t0 = time.perf_counter()
+                engine.suggest(query[:n], deep=lambda text, result: arrived.set())
+                times.append((time.perf_counter() - t0) * 1000)
+                if requested:
+                    arrived.wait(5)
+                complete.append((time.perf_counter() - t0) * 1000)
+
+        sync = []
+        for query in queries:
+            for n in range(1, len(query) + 1):
+                t0 = time.perf_counter()
+                engine.suggest(query[:n])
+                sync.append((time.perf_counter() - t0) * 1000)
+
+        # Varredura antiga: [url for url in history if text in url.lower()]
+        history = [r[1] for r in rows]
+        linear = []
+        for query in queries[:10]:
+            for n in range(1, len(query) + 1):
+                t0 = time.perf_counter()
+                text = query[:n].lower()
+                [url for url in history if text in url.lower()]
+                linear.append((time.perf_counter() - t0) * 1000)
+        store.close()
+
+    print(f"entradas:            {total}")
+    print(f"índice (insert+FTS): {insert:.2f} s (uma vez, incremental depois)")
+    print(f"head em memória:     {build * 1000:.0f} ms")
+    print(f"teclas medidas:      {len(times)}")
+    print(f"tecla   p50/p99/máx: {percentile(times, .5):.3f} / {percentile(times, .99):.3f} / {max(times):.3f} ms")
+    print(f"lista completa p50/p99/máx: {percentile(complete, .5):.3f} / {percentile(complete, .99):.3f} / {max(complete):.3f} ms")
+    print(f"síncrono p50/p99/máx: {percentile(sync, .5):.3f} / {percentile(sync, .99):.3f} / {max(sync):.3f} ms")
+    print(f"linear  p50/p99/máx: {percentile(linear, .5):.3f} / {percentile(linear, .99):.3f} / {max(linear):.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
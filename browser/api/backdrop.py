@@ -0,0 +1,76 @@
+import os, sys, hashlib
+
+BROWSER_PATH = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+sys.path.append(BROWSER_PATH)
+
+BLUR_RADIUS = 7
+BYTES_PER_PIXEL = 4
+SUFFIX = ".bgrx"
+
+# ---------------- Fundo borrado em cache ----------------
+# O fundo do login (redimensionado + GaussianBlur) é renderizado uma vez por
+# tamanho e guardado em disco já no layout de QImage.Format_RGB32 (bytes BGRX):
+# nas próximas execuções basta ler o arquivo, sem PIL e sem decodificar PNG.
+# O nome do arquivo leva o hash da imagem original e o tamanho.
+
+
+def source_hash(source):
+    digest = hashlib.sha1()
+    with open(source, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()[:16]
+
+
+def backdrop_path(folder, digest, width, height):
+    return os.path.join(folder, f"{digest}-{width}x{height}{SUFFIX}")
+
+
+def load_backdrop(folder, digest, width, height):
+    path = backdrop_path(folder, digest, width, height)
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError:
+        return None
+    # Arquivo truncado: renderiza de novo
+    if len(data) != width * height * BYTES_PER_PIXEL:
+        return None
+    return data
+
+
+def render_backdrop(source, width, height, radius=BLUR_RADIUS):
+    # PIL só aqui: o caminho com cache não importa nada
+    from PIL import Image, ImageFilter
+    with Image.open(source) as img:
+        img = img.convert("RGB").resize((width, height), Image.Resampling.LANCZOS)
+    return img.filter(ImageFilter.GaussianBlur(radius)).tobytes("raw", "BGRX")
+
+
+def store_backdrop(folder, digest, width, height, data):
+    os.makedirs(folder, exist_ok=True)
+    path = backdrop_path(folder, digest, width, height)
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+    # Renderizações de uma imagem de fundo antiga não servem mais
+    for name in os.listdir(folder):
+        if name.endswith(SUFFIX) and not name.startswith(digest + "-"):
+            try:
+                os.remove(os.path.join(folder, name))
+            except OSError:
+                pass
+
+
+def backdrop(source, width, height, folder):
+    # bytes BGRX (width x height) do fundo borrado, do cache ou renderizado agora
+    digest = source_hash(source)
+    data = load_backdrop(folder, digest, width, height)
+    if data is None:
+        data = render_backdrop(source, width, height)
+        try:
+            store_backdrop(folder, digest, width, height, data)
+        except OSError:
+            pass
+    return data
@@ -0,0 +1,234 @@
+import os, sys, time, threading
+
+BROWSER_PATH = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+sys.path.append(BROWSER_PATH)
+
+INTERACTIVE = "interactive"
+NORMAL = "normal"
+BULK = "bulk"
+PRIORITIES = (INTERACTIVE, NORMAL, BULK)
+
+DEFAULT_WEIGHTS = {INTERACTIVE: 8, NORMAL: 4, BULK: 1}
+DEFAULT_FOREGROUND_BACKOFF = 0.2
+# Sem limite global, a aba carregando ainda precisa de espaço: normal/bulk caem
+# para esse teto enquanto ela carrega
+DEFAULT_FOREGROUND_CAP_KBPS = 512
+RATE_WINDOW = 1.0
+MAX_SLEEP = 0.25
+
+
+# ---------------- TokenBucket ----------------
+# rate em bytes/s; 0 = sem limite. burst padrão = 1/4 s de tráfego.
+class TokenBucket:
+    def __init__(self, rate=0, burst=None):
+        self.lock = threading.Lock()
+        self.rate = 0
+        self.burst = 0
+        self.tokens = 0.0
+        self.stamp = time.monotonic()
+        self.set_rate(rate, burst)
+
+    def set_rate(self, rate, burst=None):
+        with self.lock:
+            self.refill()
+            self.rate = max(0, rate)
+            self.burst = burst if burst is not None else max(64 * 1024, self.rate / 4)
+            self.tokens = min(self.tokens, self.burst)
+
+    def refill(self):
+        now = time.monotonic()
+        if self.rate:
+            self.tokens = min(self.burst, self.tokens + (now - self.stamp) * self.rate)
+        self.stamp = now
+
+    def reserve(self, amount):
+        # Desconta já (pode ficar negativo); a dívida vira espera em delay()
+        with self.lock:
+            if self.rate:
+                self.refill()
+                self.tokens -= amount
+
+    def delay(self):
+        with self.lock:
+            if not self.rate:
+                return 0.0
+            self.refill()
+            return -self.tokens / self.rate if self.tokens < 0 else 0.0
+
+
+# ---------------- RateMeter ----------------
+class RateMeter:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.samples = []
+        self.total = 0
+
+    def add(self, amount):
+        now = time.monotonic()
+        with self.lock:
+            self.samples.append((now, amount))
+            self.total += amount
+            self.trim(now)
+
+    def trim(self, now):
+        limit = now - RATE_WINDOW
+        i = 0
+        while i < len(self.samples) and self.samples[i][0] < limit:
+            i += 1
+        if i:
+            del self.samples[:i]
+
+    def rate(self):
+        now = time.monotonic()
+        with self.lock:
+            self.trim(now)
+            return sum(amount for _, amount in self.samples) / RATE_WINDOW
+
+
+# ---------------- Channel ----------------
+# Um canal por download: limite próprio + bucket da classe de prioridade
+class Channel:
+    def __init__(self, scheduler, name, priority=NORMAL, cap=0):
+        self.scheduler = scheduler
+        self.name = name
+        self.priority = priority if priority in PRIORITIES else NORMAL
+        self.bucket = TokenBucket(cap)
+        self.meter = RateMeter()
+        self.closed = False
+
+    def consume(self, amount):
+        # Chamado pelas threads de download antes de gravar cada bloco. Dorme em
+        # fatias curtas para reagir logo a mudanças de limite/prioridade.
+        self.bucket.reserve(amount)
+        self.scheduler.buckets[self.priority].reserve(amount)
+        while not self.closed:
+            wait = max(self.bucket.delay(), self.scheduler.buckets[self.priority].delay())
+            if wait <= 0:
+                break
+            time.sleep(min(wait, MAX_SLEEP))
+
+    def account(self, amount):
+        self.meter.add(amount)
+        self.scheduler.meter.add(amount)
+
+    def throttle(self, amount):
+        self.consume(amount)
+        self.account(amount)
+
+    def set_cap(self, cap):
+        self.bucket.set_rate(cap)
+
+    def set_priority(self, priority):
+        if priority in PRIORITIES and priority != self.priority:
+            self.scheduler.move(self, priority)
+
+    def rate(self):
+        return self.meter.rate()
+
+    def close(self):
+        self.closed = True
+        self.scheduler.remove(self)
+
+
+# ---------------- BandwidthScheduler ----------------
+# Token bucket global dividido entre as classes ativas por peso. Enquanto a aba em
+# primeiro plano carrega, normal e bulk juntas ficam em global * "foreground_backoff"
+# (no máximo foreground_cap; sem limite global, só foreground_cap).
+class BandwidthScheduler:
+    def __init__(self, global_rate=0, per_download_rate=0, weights=None,
+                 foreground_backoff=DEFAULT_FOREGROUND_BACKOFF, foreground_cap=DEFAULT_FOREGROUND_CAP_KBPS * 1024):
+        self.lock = threading.Lock()
+        self.global_rate = global_rate
+        self.per_download_rate = per_download_rate
+        self.weights = dict(DEFAULT_WEIGHTS, **(weights or {}))
+        self.foreground_backoff = foreground_backoff
+        self.foreground_cap = foreground_cap
+        self.foreground_busy = False
+        self.channels = {p: [] for p in PRIORITIES}
+        self.buckets = {p: TokenBucket(0) for p in PRIORITIES}
+        self.meter = RateMeter()
+
+    @classmethod
+    def from_config(cls, config):
+        config = (config or {}).get("bandwidth", {})
+        return cls(
+            global_rate=int(config.get("global_kbps", 0)) * 1024,
+            per_download_rate=int(config.get("per_download_kbps", 0)) * 1024,
+            weights=config.get("priorities"),
+            foreground_backoff=float(config.get("foreground_backoff", DEFAULT_FOREGROUND_BACKOFF)),
+            foreground_cap=int(config.get("foreground_cap_kbps", DEFAULT_FOREGROUND_CAP_KBPS)) * 1024,
+        )
+
+    def channel(self, name, priority=NORMAL, cap=None):
+        channel = Channel(self, name, priority, self.per_download_rate if cap is None else cap)
+        with self.lock:
+            self.channels[channel.priority].append(channel)
+        self.rebalance()
+        return channel
+
+    def remove(self, channel):
+        with self.lock:
+            if channel in self.channels[channel.priority]:
+                self.channels[channel.priority].remove(channel)
+        self.rebalance()
+
+    def move(self, channel, priority):
+        with self.lock:
+            if channel in self.channels[channel.priority]:
+                self.channels[channel.priority].remove(channel)
+            channel.priority = priority
+            self.channels[priority].append(channel)
+        self.rebalance()
+
+    def set_foreground_busy(self, busy):
+        if busy != self.foreground_busy:
+            self.foreground_busy = busy
+            self.rebalance()
+
+    def set_global_rate(self, rate):
+        self.global_rate = rate
+        self.rebalance()
+
+    def class_weight(self, priority):
+        return self.weights.get(priority, 1)
+
+    def background_limit(self):
+        # Teto absoluto de normal + bulk enquanto a aba carrega; o resto da banda
+        # fica livre para a página
+        if self.global_rate:
+            limit = self.global_rate * self.foreground_backoff
+            return min(limit, self.foreground_cap) if self.foreground_cap else limit
+        return self.foreground_cap
+
+    def rebalance(self):
+        with self.lock:
+            active = [p for p in PRIORITIES if self.channels[p]]
+            total = sum(self.class_weight(p) for p in active) or 1
+            rates = {p: self.global_rate * self.class_weight(p) / total for p in PRIORITIES}
+            if self.foreground_busy:
+                background = [p for p in PRIORITIES if p != INTERACTIVE]
+                limit = self.background_limit()
+                # Dividido entre as classes ativas pelo peso; com limite global, sem
+                # passar do que já tinham (sem limite global a parte é o teto)
+                weights = sum(self.class_weight(p) for p in background if p in active) or 1
+                for p in background:
+                    share = limit * self.class_weight(p) / weights
+                    rates[p] = min(rates[p], share) if self.global_rate else share
+            for p in PRIORITIES:
+                self.buckets[p].set_rate(int(rates[p]))
+
+    def rates(self):
+        with self.lock:
+            channels = [c for p in PRIORITIES for c in self.channels[p]]
+        by_class = {p: 0.0 for p in PRIORITIES}
+        by_channel = {}
+        for channel in channels:
+            rate = channel.rate()
+            by_channel[channel.name] = rate
+            by_class[channel.priority] += rate
+        return {
+            "total": self.meter.rate(),
+            "foreground_busy": self.foreground_busy,
+            "classes": by_class,
+            "downloads": by_channel,
+        }
@@ -0,0 +1,105 @@
+import os, sys, re, json, time
+from collections import deque
+from urllib.parse import urlsplit
+
+BROWSER_PATH = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+sys.path.append(BROWSER_PATH)
+
+# Saídas por URL: screenshot, PDF (printToPdf) e texto (toPlainText)
+OUTPUTS = ("png", "pdf", "txt")
+DEFAULT_CONCURRENCY = 4
+DEFAULT_TIMEOUT = 30
+DEFAULT_RETRIES = 2
+SLUG_LENGTH = 80
+
+
+def output_stem(index, url):
+    # 00042-intranet.local-docs-page: ordem da lista + host/caminho legível
+    try:
+        parts = urlsplit(url)
+        text = (parts.hostname or "") + parts.path
+    except ValueError:
+        text = url
+    slug = re.sub(r"[^A-Za-z0-9._-]+", "-", text).strip("-.")[:SLUG_LENGTH] or "page"
+    return f"{index:05d}-{slug}"
+
+
+def completed_urls(path):
+    # URLs que já deram certo num results.jsonl anterior (--resume)
+    done = set()
+    if not path or not os.path.exists(path):
+        return done
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if record.get("ok"):
+                done.add(record.get("url"))
+    return done
+
+
+# ---------------- BatchQueue ----------------
+# Fila de URLs do lote. Uma URL que falha volta para o fim da fila até esgotar
+# "retries"; finish() conta sucessos e falhas para o relatório de vazão.
+class BatchQueue:
+    def __init__(self, urls, retries=DEFAULT_RETRIES, skip=()):
+        skip = set(skip)
+        self.jobs = deque({"index": i, "url": url, "attempts": 0}
+                          for i, url in enumerate(urls) if url not in skip)
+        self.total = len(self.jobs)
+        self.skipped = len(urls) - self.total
+        self.retries = retries
+        self.succeeded = 0
+        self.failed = 0
+        self.started = time.monotonic()
+
+    def next(self):
+        if not self.jobs:
+            return None
+        job = self.jobs.popleft()
+        job["attempts"] += 1
+        return job
+
+    def retry(self, job):
+        if job["attempts"] > self.retries:
+            return False
+        self.jobs.append(job)
+        return True
+
+    def finish(self, job, ok):
+        if ok:
+            self.succeeded += 1
+        else:
+            self.failed += 1
+
+    def done(self):
+        return self.succeeded + self.failed >= self.total
+
+    def throughput(self, now=None):
+        # Páginas concluídas (com ou sem sucesso) por minuto
+        now = time.monotonic() if now is None else now
+        elapsed = max(now - self.started, 1e-6)
+        return (self.succeeded + self.failed) / elapsed * 60
+
+    def summary(self, now=None):
+        now = time.monotonic() if now is None else now
+        return {"total": self.total, "ok": self.succeeded, "failed": self.failed, "skipped": self.skipped,
+                "seconds": round(now - self.started, 1), "pages_per_minute": round(self.throughput(now), 1)}
+
+
+# ---------------- ResultWriter ----------------
+# Uma linha JSON por URL concluída, gravada na hora (acompanha com tail -f)
+class ResultWriter:
+    def __init__(self, path=None, append=False):
+        self.file = open(path, "a" if append else "w", encoding="utf-8") if path else sys.stdout
+        self.owned = path is not None
+
+    def write(self, record):
+        self.file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self.file.flush()
+
+    def close(self):
+        if self.owned:
+            self.file.close()
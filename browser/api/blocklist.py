@@ -0,0 +1,230 @@
+import os, sys, mmap, struct, hashlib, functools
+
+BROWSER_PATH = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+sys.path.append(BROWSER_PATH)
+
+# Formato binário compilado (little-endian):
+#   header | tabela de bloqueio (uint64 * slots) | tabela de exceções (uint64 * slots)
+# Cada domínio vira um fingerprint de 64 bits; lookup testa cada sufixo do host
+# (com.exemplo -> exemplo.com -> ads.exemplo.com), ou seja O(labels).
+MAGIC = b"P22BLK01"
+HEADER = struct.Struct("<8s32sQQQQ")
+COMPILED_FILE = "compiled.bin"
+SOURCE_EXTS = (".txt", ".hosts", ".list")
+HOSTS_PREFIXES = ("0.0.0.0", "127.0.0.1", "::1", "::", "::0")
+LOOKUP_CACHE_SIZE = 8192
+
+DEFAULT_RULES = [
+    "gstatic.com", "doubleclick.net", "googlesyndication.com",
+    "metrike.com.br", "dtrafficquality.google",
+]
+
+
+def fingerprint(domain):
+    # 0 é reservado para slot vazio
+    h = int.from_bytes(hashlib.blake2b(domain.encode("utf-8"), digest_size=8).digest(), "little")
+    return h or 1
+
+
+def normalize_host(host):
+    host = host.strip().lower().rstrip(".")
+    if host.startswith("*."):
+        host = host[2:]
+    return host
+
+
+def parse_line(line):
+    # Retorna (dominio, excecao) ou None
+    line = line.strip()
+    if not line or line[0] in "!#[":
+        return None
+    if "##" in line or "#@#" in line or "#?#" in line:
+        return None
+
+    exception = False
+    if line.startswith("@@"):
+        exception = True
+        line = line[2:]
+
+    if line.startswith("||"):
+        rule = line[2:]
+        options = ""
+        if "$" in rule:
+            rule, options = rule.split("$", 1)
+        # Só regras de domínio inteiro; opções por tipo de recurso ficam de fora
+        if options and any(opt not in ("important", "all", "document", "third-party", "3p") for opt in options.split(",")):
+            return None
+        if rule.endswith("^"):
+            rule = rule[:-1]
+        elif rule.endswith("^|"):
+            rule = rule[:-2]
+        if not rule or any(c in rule for c in "/*^|:?=&"):
+            return None
+        return normalize_host(rule), exception
+
+    if exception:
+        return None
+
+    # Arquivo hosts: "0.0.0.0 dominio" ou só "dominio"
+    if "#" in line:
+        line = line.split("#", 1)[0].strip()
+    parts = line.split()
+    if not parts:
+        return None
+    if parts[0] in HOSTS_PREFIXES:
+        if len(parts) < 2:
+            return None
+        host = parts[1]
+    elif len(parts) == 1:
+        host = parts[0]
+    else:
+        return None
+    host = normalize_host(host)
+    if host in ("localhost", "localhost.localdomain", "local", "broadcasthost", "0.0.0.0") or "." not in host:
+        return None
+    if any(c in host for c in "/*^|:?=&$@"):
+        return None
+    return host, False
+
+
+def parse_lines(lines):
+    blocked, allowed = set(), set()
+    for line in lines:
+        rule = parse_line(line)
+        if rule is None:
+            continue
+        host, exception = rule
+        (allowed if exception else blocked).add(host)
+    return blocked, allowed
+
+
+def list_sources(folder):
+    if not os.path.isdir(folder):
+        return []
+    return sorted(
+        os.path.join(folder, name) for name in os.listdir(folder)
+        if name.endswith(SOURCE_EXTS)
+    )
+
+
+def sources_digest(sources, extra=()):
+    h = hashlib.sha256()
+    for rule in extra:
+        h.update(rule.encode("utf-8") + b"\n")
+    for path in sources:
+        st = os.stat(path)
+        h.update(f"{os.path.basename(path)}:{st.st_size}:{st.st_mtime_ns}\n".encode("utf-8"))
+    return h.digest()
+
+
+def build_table(domains):
+    slots = 1
+    while slots < max(16, len(domains) * 2):
+        slots <<= 1
+    mask = slots - 1
+    table = [0] * slots
+    for domain in domains:
+        fp = fingerprint(domain)
+        i = fp & mask
+        while table[i] and table[i] != fp:
+            i = (i + 1) & mask
+        table[i] = fp
+    return slots, struct.pack(f"<{slots}Q", *table)
+
+
+def compile_rules(blocked, allowed, out_path, digest=b"\0" * 32):
+    block_slots, block_data = build_table(blocked)
+    allow_slots, allow_data = build_table(allowed)
+    tmp = out_path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(HEADER.pack(MAGIC, digest, len(blocked), block_slots, len(allowed), allow_slots))
+        f.write(block_data)
+        f.write(allow_data)
+    os.replace(tmp, out_path)
+
+
+# ---------------- Blocklist ----------------
+class Blocklist:
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "rb")
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.digest, self.count, block_slots, self.allow_count, allow_slots = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"Blocklist inválida: {path}")
+        self._view = memoryview(self._mm)
+        start = HEADER.size
+        self._block = self._view[start:start + block_slots * 8].cast("Q")
+        start += block_slots * 8
+        self._allow = self._view[start:start + allow_slots * 8].cast("Q")
+        self._block_mask = block_slots - 1
+        self._allow_mask = allow_slots - 1
+        self.match = functools.lru_cache(maxsize=LOOKUP_CACHE_SIZE)(self._match)
+
+    @classmethod
+    def load(cls, folder, extra_rules=DEFAULT_RULES):
+        # Recompila só quando as listas do usuário mudaram
+        os.makedirs(folder, exist_ok=True)
+        sources = list_sources(folder)
+        digest = sources_digest(sources, extra_rules)
+        out_path = os.path.join(folder, COMPILED_FILE)
+        if os.path.exists(out_path):
+            try:
+                blocklist = cls(out_path)
+                if blocklist.digest == digest:
+                    return blocklist
+                blocklist.close()
+            except (ValueError, OSError, struct.error):
+                pass
+        blocked, allowed = parse_lines(extra_rules)
+        for source in sources:
+            with open(source, "r", encoding="utf-8", errors="ignore") as f:
+                b, a = parse_lines(f)
+            blocked |= b
+            allowed |= a
+        compile_rules(blocked, allowed, out_path, digest)
+        return cls(out_path)
+
+    def _contains(self, table, mask, fp):
+        i = fp & mask
+        while True:
+            value = table[i]
+            if value == fp:
+                return True
+            if not value:
+                return False
+            i = (i + 1) & mask
+
+    def _match(self, host):
+        # Retorna o sufixo bloqueado mais curto que casou, ou None
+        host = normalize_host(host)
+        if not host:
+            return None
+        matched = None
+        pos = len(host)
+        while pos > 0:
+            pos = host.rfind(".", 0, pos)
+            suffix = host[pos + 1:]
+            fp = fingerprint(suffix)
+            if self.allow_count and self._contains(self._allow, self._allow_mask, fp):
+                return None
+            if matched is None and self._contains(self._block, self._block_mask, fp):
+                matched = suffix
+                if not self.allow_count:
+                    return matched
+            if pos < 0:
+                break
+        return matched
+
+    def is_blocked(self, host):
+        return self.match(host) is not None
+
+    def close(self):
+        self.match = self._match
+        for view in (getattr(self, "_block", None), getattr(self, "_allow", None), getattr(self, "_view", None)):
+            if view is not None:
+                view.release()
+        self._block = self._allow = self._view = None
+        self._mm.close()
+        self._file.close()
@@ -0,0 +1,409 @@
+import os, sys, json, time, asyncio, threading, http.client
+from urllib.parse import urlsplit
+
+BROWSER_PATH = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+sys.path.append(BROWSER_PATH)
+
+from browser.api.memory import parse_size
+from browser.api.proxy_cache import (
+    ProxyCache, header, cache_key, request_cacheable, freshness, validators, DEFAULT_MAX_SIZE,
+)
+
+DEFAULT_PORT = 3129
+DEFAULT_FOLDER = os.path.join("~", ".cache", "pac22", "proxy")
+HEADER_LIMIT = 64 * 1024
+READ_CHUNK = 64 * 1024
+UPSTREAM_TIMEOUT = 30
+STATS_PATH = "/stats"
+STATS_KEYS = ("hits", "misses", "revalidated", "collapsed", "bytes_saved", "uncached", "tunnels", "cache_bytes")
+PROBE_TIMEOUT = 1.0
+
+HOP_BY_HOP = {
+    "connection", "keep-alive", "proxy-connection", "proxy-authenticate", "proxy-authorization",
+    "te", "trailer", "transfer-encoding", "upgrade",
+}
+
+
+def proxy_settings(config):
+    # Seção "proxy" do config.json; a pasta padrão fica fora do perfil (compartilhada)
+    section = (config or {}).get("proxy", {})
+    return {
+        "enabled": bool(section.get("enabled", False)),
+        "port": int(section.get("port", DEFAULT_PORT)),
+        "folder": os.path.expanduser(section.get("folder") or DEFAULT_FOLDER),
+        "max_size": parse_size(section.get("max_size", DEFAULT_MAX_SIZE)),
+    }
+
+
+def probe_proxy(port, host="127.0.0.1", timeout=PROBE_TIMEOUT):
+    # A porta é mesmo um CachingProxy (de outra instância)? GET /stats tem que
+    # devolver os contadores em JSON; qualquer outra coisa não é reaproveitada
+    try:
+        conn = http.client.HTTPConnection(host, port, timeout=timeout)
+        try:
+            conn.request("GET", STATS_PATH)
+            response = conn.getresponse()
+            if response.status != 200:
+                return False
+            stats = json.loads(response.read(HEADER_LIMIT))
+        finally:
+            conn.close()
+    except (OSError, ValueError, http.client.HTTPException):
+        return False
+    return isinstance(stats, dict) and all(isinstance(stats.get(key), int) for key in STATS_KEYS)
+
+
+def end_to_end(headers):
+    return [(k, v) for k, v in headers if k.lower() not in HOP_BY_HOP and k.lower() != "content-length"]
+
+
+async def read_head(reader):
+    # (linha inicial, [(nome, valor)]) ou None se a conexão fechou entre mensagens
+    try:
+        data = await reader.readuntil(b"\r\n\r\n")
+    except asyncio.IncompleteReadError as e:
+        if not e.partial.strip():
+            return None
+        raise
+    lines = data.decode("latin-1").split("\r\n")
+    headers = []
+    for line in lines[1:]:
+        if not line:
+            continue
+        name, sep, value = line.partition(":")
+        if not sep:
+            raise ValueError("cabeçalho inválido: " + line)
+        headers.append((name.strip(), value.strip()))
+    return lines[0], headers
+
+
+def body_framing(headers):
+    # ("chunked" | "length" | "close", tamanho)
+    if "chunked" in header(headers, "transfer-encoding").lower():
+        return "chunked", None
+    length = header(headers, "content-length")
+    if length:
+        return "length", int(length)
+    return "close", None
+
+
+async def iter_body(reader, framing, length):
+    # Corpo já sem a codificação chunked, em pedaços
+    if framing == "length":
+        remaining = length
+        while remaining > 0:
+            data = await reader.read(min(READ_CHUNK, remaining))
+            if not data:
+                raise asyncio.IncompleteReadError(b"", remaining)
+            remaining -= len(data)
+            yield data
+    elif framing == "chunked":
+        while True:
+            size = int((await reader.readuntil(b"\r\n")).split(b";")[0].strip(), 16)
+            if size == 0:
+                # Trailers até a linha vazia
+                while (await reader.readuntil(b"\r\n")) != b"\r\n":
+                    pass
+                return
+            yield await reader.readexactly(size)
+            await reader.readexactly(2)
+    else:
+        while True:
+            data = await reader.read(READ_CHUNK)
+            if not data:
+                return
+            yield data
+
+
+def encode_head(start, headers):
+    lines = [start] + [f"{k}: {v}" for k, v in headers]
+    return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+
+# ---------------- CachingProxy ----------------
+# Proxy HTTP de encaminhamento (asyncio) com cache em disco compartilhado entre
+# perfis e execuções. GETs cacheáveis saem do ProxyCache enquanto válidos (vencidos
+# são revalidados com ETag/Last-Modified); pedidos iguais simultâneos esperam o
+# primeiro em vez de irem todos à origem. HTTPS passa por CONNECT como túnel, sem
+# cache (o conteúdo é cifrado). GET /stats no próprio proxy devolve os contadores.
+class CachingProxy:
+    def __init__(self, folder, max_size=DEFAULT_MAX_SIZE):
+        self.folder = folder
+        self.max_size = max_size
+        self.cache = None
+        self.server = None
+        self.loop = None
+        self.port = None
+        self.inflight = {}
+        self.counters = {"hits": 0, "misses": 0, "revalidated": 0, "collapsed": 0, "bytes_saved": 0, "uncached": 0, "tunnels": 0}
+
+    def stats(self):
+        stats = dict(self.counters)
+        stats["cache_bytes"] = self.cache.total if self.cache is not None else 0
+        return stats
+
+    # --- Servidor ---
+    async def start(self, host="127.0.0.1", port=0):
+        os.makedirs(self.folder, exist_ok=True)
+        self.cache = ProxyCache(self.folder, self.max_size)
+        self.loop = asyncio.get_running_loop()
+        self.server = await asyncio.start_server(self.handle_client, host, port, limit=HEADER_LIMIT)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self.port
+
+    async def stop(self):
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        if self.cache is not None:
+            self.cache.close()
+
+    def start_in_thread(self, host="127.0.0.1", port=0):
+        # Loop próprio numa thread daemon; devolve a porta (OSError se não abriu)
+        started = threading.Event()
+        result = {}
+
+        def run():
+            loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(loop)
+            try:
+                result["port"] = loop.run_until_complete(self.start(host, port))
+            except OSError as e:
+                result["error"] = e
+                started.set()
+                return
+            started.set()
+            loop.run_forever()
+
+        threading.Thread(target=run, name="caching-proxy", daemon=True).start()
+        started.wait()
+        if "error" in result:
+            raise result["error"]
+        return result["port"]
+
+    def shutdown(self):
+        if self.loop is not None and self.loop.is_running():
+            asyncio.run_coroutine_threadsafe(self.stop(), self.loop).result(5)
+            self.loop.call_soon_threadsafe(self.loop.stop)
+
+    # --- Conexão do cliente ---
+    async def handle_client(self, reader, writer):
+        try:
+            while True:
+                head = await read_head(reader)
+                if head is None:
+                    break
+                start, headers = head
+                method, target, version = start.split(" ", 2)
+                if method == "CONNECT":
+                    await self.tunnel(target, reader, writer)
+                    break
+                if not await self.handle_request(method, target, version, headers, reader, writer):
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.LimitOverrunError, ValueError, OSError):
+            pass
+        finally:
+            writer.close()
+
+    async def handle_request(self, method, target, version, headers, reader, writer):
+        connection = (header(headers, "proxy-connection") or header(headers, "connection")).lower()
+        keep_alive = version == "HTTP/1.1" and "close" not in connection
+        framing, length = body_framing(headers)
+        body = b""
+        if framing != "close":
+            body = b"".join([chunk async for chunk in iter_body(reader, framing, length)])
+
+        if not target.startswith("http://"):
+            if target == STATS_PATH:
+                await self.send(writer, 200, "OK", [("Content-Type", "application/json")], json.dumps(self.stats()).encode())
+            else:
+                await self.send(writer, 400, "Bad Request", [], b"proxy: URL absoluta esperada\n")
+            return keep_alive
+
+        if not request_cacheable(method, headers):
+            self.counters["uncached"] += 1
+            return await self.forward(method, target, headers, body, writer, keep_alive)
+
+        key = cache_key(target, headers)
+        waited = False
+        while True:
+            entry = self.cache.lookup(key)
+            if entry is not None and entry["expires"] > time.time():
+                self.counters["hits"] += 1
+                self.counters["bytes_saved"] += entry["size"]
+                return await self.serve(entry, writer, keep_alive, method)
+            pending = self.inflight.get(key)
+            if pending is None or waited:
+                break
+            # Mesmo recurso já a caminho: espera e tenta de novo pelo cache
+            self.counters["collapsed"] += 1
+            await asyncio.shield(pending)
+            waited = True
+
+        done = self.loop.create_future()
+        self.inflight[key] = done
+        try:
+            return await self.forward(method, target, headers, body, writer, keep_alive, key=key, entry=entry)
+        finally:
+            if self.inflight.get(key) is done:
+                del self.inflight[key]
+            done.set_result(None)
+
+    async def send(self, writer, status, reason, headers, body, keep_alive=True):
+        headers = headers + [("Content-Length", str(len(body)))]
+        if not keep_alive:
+            headers.append(("Connection", "close"))
+        writer.write(encode_head(f"HTTP/1.1 {status} {reason}", headers) + body)
+        await writer.drain()
+
+    async def serve(self, entry, writer, keep_alive, method="GET", extra=()):
+        headers = entry["headers"] + list(extra) + [("Content-Length", str(entry["size"])), ("X-Cache", "HIT")]
+        if not keep_alive:
+            headers.append(("Connection", "close"))
+        writer.write(encode_head(f"HTTP/1.1 {entry['status']} {entry['reason']}", headers))
+        if method != "HEAD":
+            with open(entry["path"], "rb") as f:
+                while True:
+                    data = f.read(READ_CHUNK)
+                    if not data:
+                        break
+                    writer.write(data)
+                    await writer.drain()
+        await writer.drain()
+        return keep_alive
+
+    # --- Origem ---
+    async def forward(self, method, url, headers, body, writer, keep_alive, key=None, entry=None):
+        parts = urlsplit(url)
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+        upstream_headers = end_to_end(headers)
+        if entry is not None:
+            upstream_headers = [h for h in upstream_headers if not h[0].lower().startswith("if-")]
+            upstream_headers += validators(entry["headers"])
+        if body or method in ("POST", "PUT", "PATCH"):
+            upstream_headers.append(("Content-Length", str(len(body))))
+        upstream_headers.append(("Connection", "close"))
+
+        try:
+            up_reader, up_writer = await asyncio.wait_for(
+                asyncio.open_connection(parts.hostname, parts.port or 80, limit=HEADER_LIMIT), UPSTREAM_TIMEOUT
+            )
+        except OSError as e:
+            await self.send(writer, 502, "Bad Gateway", [("Content-Type", "text/plain")], f"proxy: {e}\n".encode(), keep_alive)
+            return keep_alive
+        try:
+            up_writer.write(encode_head(f"{method} {path} HTTP/1.1", upstream_headers) + body)
+            await up_writer.drain()
+            head = await asyncio.wait_for(read_head(up_reader), UPSTREAM_TIMEOUT)
+            if head is None:
+                raise ConnectionError("origem fechou sem resposta")
+            start, response_headers = head
+            _, status, *reason = start.split(" ", 2)
+            status = int(status)
+            reason = reason[0] if reason else ""
+
+            if status == 304 and entry is not None:
+                # Continua válido: atualiza a validade e serve do cache
+                # Set-Cookie do 304 vai só para quem pediu, não para o cache
+                merged = dict((k.lower(), (k, v)) for k, v in entry["headers"])
+                merged.update((k.lower(), (k, v)) for k, v in end_to_end(response_headers) if k.lower() != "set-cookie")
+                fresh = list(merged.values())
+                self.cache.refresh(key, fresh, freshness(entry["status"], fresh) or time.time())
+                entry["headers"] = fresh
+                self.counters["revalidated"] += 1
+                self.counters["hits"] += 1
+                self.counters["bytes_saved"] += entry["size"]
+                cookies = [(k, v) for k, v in response_headers if k.lower() == "set-cookie"]
+                return await self.serve(entry, writer, keep_alive, method, cookies)
+
+            if key is not None:
+                self.counters["misses"] += 1
+            expires = freshness(status, response_headers) if key is not None else None
+            return await self.relay(method, url, status, reason, response_headers, up_reader, writer, keep_alive, key, expires)
+        finally:
+            up_writer.close()
+
+    async def relay(self, method, url, status, reason, headers, up_reader, writer, keep_alive, key, expires):
+        framing, length = body_framing(headers)
+        no_body = method == "HEAD" or status in (204, 304) or 100 <= status < 200
+        out_headers = end_to_end(headers)
+        if no_body:
+            if framing == "length":
+                out_headers.append(("Content-Length", str(length)))
+        elif framing == "length":
+            out_headers.append(("Content-Length", str(length)))
+        elif keep_alive:
+            out_headers.append(("Transfer-Encoding", "chunked"))
+            framing = "rechunk" if framing == "close" else framing
+        else:
+            keep_alive = False
+        if not keep_alive:
+            out_headers.append(("Connection", "close"))
+        writer.write(encode_head(f"HTTP/1.1 {status} {reason}", out_headers))
+        if no_body:
+            await writer.drain()
+            return keep_alive
+
+        chunked = ("Transfer-Encoding", "chunked") in out_headers
+        blob = self.cache.writer() if expires is not None else None
+        try:
+            source = iter_body(up_reader, "close" if framing == "rechunk" else framing, length)
+            async for data in source:
+                if blob is not None and not blob.write(data):
+                    blob = None
+                writer.write(b"%x\r\n%s\r\n" % (len(data), data) if chunked else data)
+                await writer.drain()
+            if chunked:
+                writer.write(b"0\r\n\r\n")
+                await writer.drain()
+        except BaseException:
+            if blob is not None:
+                blob.discard()
+            raise
+        if blob is not None:
+            blob.close()
+            self.cache.store(key, url, status, reason, end_to_end(headers), blob, expires)
+        return keep_alive
+
+    # --- HTTPS ---
+    async def tunnel(self, target, reader, writer):
+        host, _, port = target.rpartition(":")
+        up_reader, up_writer = await asyncio.wait_for(
+            asyncio.open_connection(host.strip("[]"), int(port or 443)), UPSTREAM_TIMEOUT
+        )
+        self.counters["tunnels"] += 1
+        writer.write(b"HTTP/1.1 200 Connection Established\r\n\r\n")
+        await writer.drain()
+
+        async def pipe(src, dst):
+            try:
+                while True:
+                    data = await src.read(READ_CHUNK)
+                    if not data:
+                        break
+                    dst.write(data)
+                    await dst.drain()
+            except (ConnectionError, OSError):
+                pass
+            finally:
+                dst.close()
+
+        await asyncio.gather(pipe(reader, up_writer), pipe(up_reader, writer))
+
+
+if __name__ == "__main__":
+    # Proxy avulso: python3 browser/api/caching_proxy.py [porta] [pasta]
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_PORT
+    folder = os.path.expanduser(sys.argv[2] if len(sys.argv) > 2 else DEFAULT_FOLDER)
+    proxy = CachingProxy(folder)
+
+    async def main():
+        print(f"Proxy em 127.0.0.1:{await proxy.start(port=port)}, cache em {folder}")
+        await proxy.server.serve_forever()
+
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
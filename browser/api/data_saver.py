@@ -0,0 +1,84 @@
+import os, sys
+
+BROWSER_PATH = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+sys.path.append(BROWSER_PATH)
+
+from browser.api.memory import parse_size
+from browser.api.domains import registrable_domain
+
+KINDS = ("image", "media", "font", "sub_frame")
+# allow: sempre passa. budget: passa enquanto houver orçamento na página.
+# third_party: bloqueia de terceiros; do próprio site conta no orçamento. block: sempre bloqueia.
+ALLOW, BUDGET, THIRD_PARTY, BLOCK = "allow", "budget", "third_party", "block"
+MODES = (ALLOW, BUDGET, THIRD_PARTY, BLOCK)
+DEFAULT_RULES = {"image": BUDGET, "media": THIRD_PARTY, "font": THIRD_PARTY, "sub_frame": THIRD_PARTY}
+# O interceptor não vê o tamanho das respostas: cada pedido conta pelo tamanho típico do tipo
+DEFAULT_ESTIMATES = {"image": 40 * 1024, "media": 1024 ** 2, "font": 30 * 1024, "sub_frame": 150 * 1024}
+DEFAULT_PAGE_BUDGET = 1024 ** 2
+
+
+def data_saver_settings(config):
+    # Seção "data_saver" do config.json com valores padrão e tamanhos já em bytes
+    section = (config or {}).get("data_saver", {})
+    rules = dict(DEFAULT_RULES)
+    for kind, mode in section.get("rules", {}).items():
+        if kind in KINDS and mode in MODES:
+            rules[kind] = mode
+    estimates = dict(DEFAULT_ESTIMATES)
+    for kind, size in section.get("estimates", {}).items():
+        if kind in KINDS:
+            estimates[kind] = parse_size(size)
+    return {
+        "enabled": bool(section.get("enabled", False)),
+        "save_data_header": bool(section.get("save_data_header", True)),
+        "page_budget": parse_size(section.get("page_budget", DEFAULT_PAGE_BUDGET)),
+        "rules": rules,
+        "estimates": estimates,
+    }
+
+
+def is_third_party(host, first_party_host):
+    # Sem primeira parte conhecida (pedido do próprio navegador) não é terceiro
+    if not host or not first_party_host:
+        return False
+    return registrable_domain(host) != registrable_domain(first_party_host)
+
+
+# ---------------- PageDataSaver ----------------
+# Contas de uma página: orçamento gasto, pedidos bloqueados e bytes evitados
+# (estimados). Zera a cada navegação no frame principal; allow_all é o "carregar
+# tudo nesta página", que vale até a página mudar.
+class PageDataSaver:
+    def __init__(self, settings):
+        self.settings = settings
+        self.reset()
+
+    def reset(self, allow_all=False):
+        self.allow_all = allow_all
+        self.spent = 0
+        self.blocked = 0
+        self.avoided = 0
+        self.blocked_kinds = dict.fromkeys(KINDS, 0)
+
+    def check(self, kind, third_party):
+        # None libera; senão o motivo do bloqueio
+        mode = self.settings["rules"].get(kind, ALLOW)
+        if self.allow_all or mode == ALLOW:
+            return None
+        cost = self.settings["estimates"][kind]
+        budget = self.settings["page_budget"]
+        if mode == BLOCK or (mode == THIRD_PARTY and third_party):
+            reason = mode
+        elif budget and self.spent + cost > budget:
+            reason = BUDGET
+        else:
+            self.spent += cost
+            return None
+        self.blocked += 1
+        self.avoided += cost
+        self.blocked_kinds[kind] += 1
+        return reason
+
+    def summary(self):
+        return {"blocked": self.blocked, "avoided": self.avoided, "spent": self.spent,
+                "allow_all": self.allow_all, "kinds": dict(self.blocked_kinds)}
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+# Domínio registrável (eTLD+1) a partir de um snapshot local da Public Suffix List.
+# O .dat é compilado para uma trie de rótulos (da direita para a esquerda) em
+# resources/public_suffix_list.json; nenhum acesso à rede, nem cache fora do repo.
+#
+# Recompilar depois de atualizar o .dat:
+#   python3 browser/api/domains.py
+import os, sys, json, hashlib, ipaddress
+from functools import lru_cache
+
+BROWSER_PATH = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+sys.path.append(BROWSER_PATH)
+
+RESOURCES = os.path.join(BROWSER_PATH, "resources")
+PSL_SOURCE = os.path.join(RESOURCES, "public_suffix_list.dat")
+PSL_COMPILED = os.path.join(RESOURCES, "public_suffix_list.json")
+
+# Flags por nó da trie (chave FLAGS)
+RULE = 1
+EXCEPTION = 2
+PRIVATE = 4
+FLAGS = "$"
+WILDCARD = "*"
+CACHE_SIZE = 8192
+
+
+def source_digest(path):
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def parse_rules(path):
+    private = False
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line.startswith("// ===BEGIN PRIVATE DOMAINS==="):
+                private = True
+            if not line or line.startswith("//"):
+                continue
+            rule = line.split()[0].lower()
+            yield rule, private
+
+
+def idna_labels(rule):
+    # Regras vêm em Unicode; o Qt entrega hosts em punycode (xn--)
+    labels = rule.split(".")
+    try:
+        encoded = [label if label in (WILDCARD, "") else label.encode("idna").decode("ascii") for label in labels]
+    except UnicodeError:
+        return None
+    return encoded if encoded != labels else None
+
+
+def compile_psl(source=PSL_SOURCE):
+    trie = {}
+    for rule, private in parse_rules(source):
+        flags = PRIVATE if private else 0
+        if rule.startswith("!"):
+            rule, flags = rule[1:], flags | EXCEPTION
+        else:
+            flags |= RULE
+        variants = [rule.split(".")]
+        encoded = idna_labels(rule)
+        if encoded:
+            variants.append(encoded)
+        for labels in variants:
+            node = trie
+            for label in reversed(labels):
+                node = node.setdefault(label, {})
+            node[FLAGS] = node.get(FLAGS, 0) | flags
+    return {"source": source_digest(source), "trie": trie}
+
+
+def save_compiled(compiled, path=PSL_COMPILED):
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(compiled, f, separators=(",", ":"), ensure_ascii=False, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def load_trie(source=PSL_SOURCE, compiled_path=PSL_COMPILED):
+    # Usa o compilado se bate com o .dat; senão compila em memória
+    digest = source_digest(source)
+    try:
+        with open(compiled_path, "r", encoding="utf-8") as f:
+            compiled = json.load(f)
+        if compiled.get("source") == digest:
+            return compiled["trie"]
+    except (OSError, ValueError):
+        pass
+    compiled = compile_psl(source)
+    try:
+        save_compiled(compiled, compiled_path)
+    except OSError:
+        pass
+    return compiled["trie"]
+
+
+_trie = None
+
+
+def trie():
+    global _trie
+    if _trie is None:
+        _trie = load_trie()
+    return _trie
+
+
+def is_ip(host):
+    # Nomes terminam em letra (TLD); só tenta o parse caro quando pode ser IP
+    if ":" not in host and not host[-1:].isdigit():
+        return False
+    try:
+        ipaddress.ip_address(host.strip("[]"))
+        return True
+    except ValueError:
+        return False
+
+
+def suffix_length(labels, private=True):
+    # Quantos rótulos (da direita) formam o sufixo público; regra implícita "*" = 1
+    node = trie()
+    length = 1
+    for depth, label in enumerate(reversed(labels), 1):
+        wildcard = node.get(WILDCARD)
+        child = node.get(label)
+        if child is not None:
+            flags = child.get(FLAGS, 0)
+            if flags and (private or not flags & PRIVATE):
+                if flags & EXCEPTION:
+                    return depth - 1
+                if flags & RULE:
+                    length = depth
+        if wildcard is not None:
+            flags = wildcard.get(FLAGS, 0)
+            if flags & RULE and (private or not flags & PRIVATE):
+                length = depth
+        if child is None:
+            break
+        node = child
+    return length
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def public_suffix(host, private=True):
+    host = host.strip().rstrip(".").lower()
+    if not host or is_ip(host):
+        return ""
+    labels = host.split(".")
+    return ".".join(labels[-suffix_length(labels, private):])
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def registrable_domain(host, private=True):
+    # eTLD+1. IP, host de um rótulo só (localhost) ou o próprio sufixo: devolve o host
+    host = host.strip().rstrip(".").lower()
+    if not host or is_ip(host) or "." not in host:
+        return host
+    labels = host.split(".")
+    length = suffix_length(labels, private)
+    if length >= len(labels):
+        return host
+    return ".".join(labels[-(length + 1):])
+
+
+if __name__ == "__main__":
+    compiled = compile_psl()
+    save_compiled(compiled)
+    print(f"{PSL_COMPILED}: {len(compiled['trie'])} TLDs, {os.path.getsize(PSL_COMPILED)} bytes")
@@ -0,0 +1,99 @@
+import os, sys, json, time, threading
+
+BROWSER_PATH = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+sys.path.append(BROWSER_PATH)
+
+QUEUE_FILE = "downloads.json"
+
+# Estados persistidos
+QUEUED = "queued"
+ACTIVE = "active"
+PAUSED = "paused"
+COMPLETED = "completed"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+PENDING_STATES = (QUEUED, ACTIVE, PAUSED)
+
+
+def unique_path(folder, filename, taken=()):
+    # taken: caminhos de downloads pendentes que ainda não existem no disco
+    base, ext = os.path.splitext(filename or "download")
+    path = os.path.join(folder, base + ext)
+    n = 1
+    while os.path.exists(path) or path in taken:
+        path = os.path.join(folder, f"{base} ({n}){ext}")
+        n += 1
+    return path
+
+
+# ---------------- DownloadQueue ----------------
+class DownloadQueue:
+    def __init__(self, folder):
+        self.path = os.path.join(folder, QUEUE_FILE)
+        self.lock = threading.Lock()
+        self.entries = []
+        self.next_id = 1
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, "r") as f:
+                    self.entries = json.load(f)
+            except (OSError, ValueError):
+                self.entries = []
+        if self.entries:
+            self.next_id = max(e["id"] for e in self.entries) + 1
+
+    def add(self, url, path, mime="", total=0):
+        with self.lock:
+            entry = {
+                "id": self.next_id,
+                "url": url,
+                "path": path,
+                "mime": mime,
+                "state": QUEUED,
+                "received": 0,
+                "total": total,
+                "created": time.time(),
+                "error": "",
+            }
+            self.next_id += 1
+            self.entries.append(entry)
+        self.save()
+        return entry
+
+    def get(self, entry_id):
+        for entry in self.entries:
+            if entry["id"] == entry_id:
+                return entry
+        return None
+
+    def pending(self):
+        return [e for e in self.entries if e["state"] in PENDING_STATES]
+
+    def pending_paths(self):
+        return {e["path"] for e in self.entries if e["state"] in PENDING_STATES}
+
+    def find_pending(self, url):
+        for entry in self.entries:
+            if entry["url"] == url and entry["state"] in PENDING_STATES:
+                return entry
+        return None
+
+    def update(self, entry, save=True, **fields):
+        with self.lock:
+            entry.update(fields)
+        if save:
+            self.save()
+
+    def remove_finished(self):
+        with self.lock:
+            self.entries = [e for e in self.entries if e["state"] in PENDING_STATES]
+        self.save()
+
+    def save(self):
+        with self.lock:
+            data = json.dumps(self.entries, indent=2)
+        tmp = self.path + ".tmp"
+        with open(tmp, "w") as f:
+            f.write(data)
+        os.replace(tmp, self.path)
@@ -0,0 +1,188 @@
+import os, sys, json, time, queue, atexit, logging, traceback
+from collections import deque
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+BROWSER_PATH = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+sys.path.append(BROWSER_PATH)
+
+# ---------------- Log estruturado ----------------
+# Loggers "pac22.<categoria>" (nav, console, download, session, history, app).
+# Cada registro vira um dict (ts, level, cat, msg + campos extras):
+# - buffer circular em memória (ring), sempre ligado, barato;
+# - arquivo JSON-lines com rotação em <perfil>/logs/pac22.log e stderr (só
+#   avisos), gravados por uma thread (QueueListener), nunca na thread da GUI;
+# - mensagens de console das páginas passam por um limite de taxa por página.
+# Seção "logging" do config.json: level, categories {categoria: level}, max_size,
+# backups, ring_size, console_rate, console_burst.
+ROOT = "pac22"
+LOG_FOLDER = "logs"
+LOG_FILE = "pac22.log"
+CRASH_PREFIX = "crash-"
+DEFAULT_LEVEL = "INFO"
+DEFAULT_CATEGORIES = {"nav": "INFO", "console": "WARNING"}
+DEFAULT_MAX_SIZE = 1024 * 1024
+DEFAULT_BACKUPS = 3
+DEFAULT_RING_SIZE = 2000
+DEFAULT_CONSOLE_RATE = 10
+DEFAULT_CONSOLE_BURST = 50
+STDERR_LEVEL = logging.WARNING
+MAX_BUCKETS = 1024
+
+
+def get_logger(category):
+    return logging.getLogger(f"{ROOT}.{category}")
+
+
+def fields(**values):
+    # log.info("...", extra=fields(url=..., tipo=...))
+    return {"fields": values}
+
+
+def record_entry(record):
+    entry = {"ts": round(record.created, 3), "level": record.levelname,
+             "cat": record.name.split(".", 1)[-1], "msg": record.getMessage()}
+    entry.update(getattr(record, "fields", None) or {})
+    if record.exc_info:
+        entry["exc"] = "".join(traceback.format_exception(*record.exc_info))
+    suppressed = getattr(record, "suppressed", 0)
+    if suppressed:
+        entry["suppressed"] = suppressed
+    return entry
+
+
+def log_settings(config):
+    config = (config or {}).get("logging", {})
+    categories = dict(DEFAULT_CATEGORIES)
+    categories.update(config.get("categories", {}))
+    return {
+        "level": str(config.get("level", DEFAULT_LEVEL)).upper(),
+        "categories": {k: str(v).upper() for k, v in categories.items()},
+        "max_size": int(config.get("max_size", DEFAULT_MAX_SIZE)),
+        "backups": int(config.get("backups", DEFAULT_BACKUPS)),
+        "ring_size": int(config.get("ring_size", DEFAULT_RING_SIZE)),
+        "console_rate": float(config.get("console_rate", DEFAULT_CONSOLE_RATE)),
+        "console_burst": int(config.get("console_burst", DEFAULT_CONSOLE_BURST)),
+    }
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        return json.dumps(record_entry(record), ensure_ascii=False, default=str)
+
+
+class StderrFormatter(logging.Formatter):
+    def format(self, record):
+        entry = record_entry(record)
+        extra = " ".join(f"{k}={v}" for k, v in entry.items() if k not in ("ts", "level", "cat", "msg"))
+        return f"[{entry['level']}] {entry['cat']}: {entry['msg']}" + (f" ({extra})" if extra else "")
+
+
+# ---------------- RingHandler ----------------
+# Últimos N registros em memória (deque com maxlen: o mais antigo sai sozinho)
+class RingHandler(logging.Handler):
+    def __init__(self, size=DEFAULT_RING_SIZE):
+        super().__init__()
+        self.entries = deque(maxlen=size)
+
+    def emit(self, record):
+        self.entries.append(record_entry(record))
+
+    def records(self, level=None, category=None):
+        minimum = logging.getLevelName(level) if isinstance(level, str) else (level or 0)
+        return [e for e in list(self.entries)
+                if logging.getLevelName(e["level"]) >= minimum and (category is None or e["cat"] == category)]
+
+    def dump(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            for entry in list(self.entries):
+                f.write(json.dumps(entry, ensure_ascii=False, default=str) + "\n")
+        return path
+
+
+# ---------------- RateLimitFilter ----------------
+# Token bucket por chave (record.rate_key, ex.: a página): até "burst" de uma vez,
+# depois "rate" por segundo. O próximo registro que passa leva quantos foram
+# descartados em "suppressed".
+class RateLimitFilter(logging.Filter):
+    def __init__(self, rate=DEFAULT_CONSOLE_RATE, burst=DEFAULT_CONSOLE_BURST):
+        super().__init__()
+        self.rate = rate
+        self.burst = burst
+        self.buckets = {}
+
+    def filter(self, record, now=None):
+        key = getattr(record, "rate_key", None)
+        if key is None:
+            return True
+        now = time.monotonic() if now is None else now
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            if len(self.buckets) >= MAX_BUCKETS:
+                self.buckets.clear()
+            bucket = self.buckets[key] = [self.burst, now, 0]
+        tokens = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+        bucket[1] = now
+        if tokens < 1:
+            bucket[0] = tokens
+            bucket[2] += 1
+            return False
+        bucket[0] = tokens - 1
+        if bucket[2]:
+            record.suppressed, bucket[2] = bucket[2], 0
+        return True
+
+
+# ---------------- EventLog ----------------
+class EventLog:
+    def __init__(self, folder, config=None):
+        settings = log_settings(config)
+        self.folder = os.path.join(folder, LOG_FOLDER)
+        os.makedirs(self.folder, exist_ok=True)
+        self.root = logging.getLogger(ROOT)
+        self.root.setLevel(settings["level"])
+        self.root.propagate = False
+        for category, level in settings["categories"].items():
+            get_logger(category).setLevel(level)
+
+        self.ring = RingHandler(settings["ring_size"])
+        file_handler = RotatingFileHandler(os.path.join(self.folder, LOG_FILE), maxBytes=settings["max_size"],
+                                           backupCount=settings["backups"], encoding="utf-8")
+        file_handler.setFormatter(JsonFormatter())
+        stderr_handler = logging.StreamHandler(sys.stderr)
+        stderr_handler.setLevel(STDERR_LEVEL)
+        stderr_handler.setFormatter(StderrFormatter())
+        self.queue = queue.SimpleQueue()
+        self.listener = QueueListener(self.queue, file_handler, stderr_handler, respect_handler_level=True)
+        self.queue_handler = QueueHandler(self.queue)
+        self.root.addHandler(self.ring)
+        self.root.addHandler(self.queue_handler)
+        self.listener.start()
+
+        self.console_filter = RateLimitFilter(settings["console_rate"], settings["console_burst"])
+        get_logger("console").addFilter(self.console_filter)
+
+        # Exceção não tratada (inclusive em slots do Qt): registra e salva o ring
+        self.previous_hook = sys.excepthook
+        sys.excepthook = self.excepthook
+        atexit.register(self.close)
+
+    def excepthook(self, kind, value, tb):
+        get_logger("app").error("exceção não tratada", exc_info=(kind, value, tb))
+        try:
+            self.ring.dump(os.path.join(self.folder, f"{CRASH_PREFIX}{int(time.time())}.jsonl"))
+        except OSError:
+            pass
+        # O hook padrão só imprimiria de novo o que o stderr do log já mostrou
+        if self.previous_hook is not sys.__excepthook__:
+            self.previous_hook(kind, value, tb)
+
+    def close(self):
+        if self.listener is None:
+            return
+        self.root.removeHandler(self.queue_handler)
+        self.root.removeHandler(self.ring)
+        get_logger("console").removeFilter(self.console_filter)
+        self.listener.stop()
+        self.listener = None
+        if sys.excepthook == self.excepthook:
+            sys.excepthook = self.previous_hook
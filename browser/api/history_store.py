@@ -0,0 +1,363 @@
+import os, sys, json, time, queue, sqlite3, threading
+from datetime import datetime, timedelta
+from urllib.parse import urlsplit, urlunsplit
+
+BROWSER_PATH = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+sys.path.append(BROWSER_PATH)
+
+from browser.api.event_log import get_logger, fields
+
+HISTORY_DB = "history.sqlite"
+LEGACY_HISTORY_FILE = "history.json"
+BATCH_SIZE = 500
+FLUSH_INTERVAL = 0.2
+MATCH_SCAN = 5000
+
+log = get_logger("history")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS urls (
+    id INTEGER PRIMARY KEY,
+    url TEXT NOT NULL UNIQUE,
+    display_url TEXT NOT NULL,
+    host TEXT NOT NULL DEFAULT '',
+    title TEXT NOT NULL DEFAULT '',
+    visit_count INTEGER NOT NULL DEFAULT 0,
+    first_visit REAL NOT NULL,
+    last_visit REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS urls_last_visit ON urls(last_visit);
+CREATE TABLE IF NOT EXISTS visits (
+    id INTEGER PRIMARY KEY,
+    url_id INTEGER NOT NULL REFERENCES urls(id) ON DELETE CASCADE,
+    ts REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS visits_url ON visits(url_id);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+# Índice de trigramas (FTS5) sobre URL e título, mantido por triggers
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS urls_fts USING fts5(
+    display_url, title, content='urls', content_rowid='id', tokenize='trigram'
+);
+CREATE TRIGGER IF NOT EXISTS urls_fts_insert AFTER INSERT ON urls BEGIN
+    INSERT INTO urls_fts(rowid, display_url, title) VALUES (new.id, new.display_url, new.title);
+END;
+CREATE TRIGGER IF NOT EXISTS urls_fts_delete AFTER DELETE ON urls BEGIN
+    INSERT INTO urls_fts(urls_fts, rowid, display_url, title) VALUES ('delete', old.id, old.display_url, old.title);
+END;
+CREATE TRIGGER IF NOT EXISTS urls_fts_update AFTER UPDATE OF display_url, title ON urls BEGIN
+    INSERT INTO urls_fts(urls_fts, rowid, display_url, title) VALUES ('delete', old.id, old.display_url, old.title);
+    INSERT INTO urls_fts(rowid, display_url, title) VALUES (new.id, new.display_url, new.title);
+END;
+"""
+
+# Frecency em SQL (mesmos pesos de browser.api.suggestions.frecency)
+FRECENCY_SQL = """
+visit_count * CASE
+    WHEN last_visit > :now - 4 * 86400 THEN 100
+    WHEN last_visit > :now - 14 * 86400 THEN 70
+    WHEN last_visit > :now - 31 * 86400 THEN 50
+    WHEN last_visit > :now - 90 * 86400 THEN 30
+    ELSE 10
+END
+"""
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+GROUP_DOMAIN = "domain"
+GROUP_DAY = "day"
+DAY_FORMAT = "%Y-%m-%d"
+
+
+def normalize_url(url):
+    # Chave de deduplicação: esquema/host minúsculos, sem porta padrão nem fragmento
+    url = url.strip()
+    try:
+        parts = urlsplit(url)
+    except ValueError:
+        return url
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if not host:
+        return url
+    netloc = host
+    try:
+        port = parts.port
+    except ValueError:
+        port = None
+    if port and DEFAULT_PORTS.get(scheme) != port:
+        netloc += f":{port}"
+    if parts.username:
+        netloc = parts.username + "@" + netloc
+    return urlunsplit((scheme, netloc, parts.path or "/", parts.query, ""))
+
+
+def url_host(url):
+    try:
+        return (urlsplit(url).hostname or "").lower()
+    except ValueError:
+        return ""
+
+
+def like_pattern(text):
+    return "%" + text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+
+
+def day_range(day):
+    start = datetime.strptime(day, DAY_FORMAT)
+    return start.timestamp(), (start + timedelta(days=1)).timestamp()
+
+
+def connect(path):
+    conn = sqlite3.connect(path, timeout=10)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA foreign_keys=ON")
+    return conn
+
+
+# ---------------- HistoryStore ----------------
+# Histórico em SQLite (WAL). Leituras usam a conexão da thread da GUI; gravações
+# vão para uma fila e uma thread própria grava em lotes numa transação só.
+class HistoryStore:
+    def __init__(self, folder):
+        self.path = os.path.join(folder, HISTORY_DB)
+        self.legacy_path = os.path.join(folder, LEGACY_HISTORY_FILE)
+        self.conn = connect(self.path)
+        self.conn.executescript(SCHEMA)
+        self.migrate_schema()
+        self.conn.commit()
+        self.fts = self.init_fts()
+        self.migrate_legacy()
+
+        self.listeners = []
+        self.pending = queue.Queue()
+        self.writer = threading.Thread(target=self.write_loop, name="history-writer", daemon=True)
+        self.writer.start()
+
+    def init_fts(self):
+        # SQLite sem FTS5/trigram (< 3.34): busca cai para LIKE
+        try:
+            exists = self.conn.execute("SELECT 1 FROM sqlite_master WHERE name='urls_fts'").fetchone()
+            self.conn.executescript(FTS_SCHEMA)
+            if not exists:
+                self.conn.execute("INSERT INTO urls_fts(urls_fts) VALUES('rebuild')")
+            self.conn.commit()
+            return True
+        except sqlite3.OperationalError:
+            self.conn.rollback()
+            return False
+
+    def migrate_schema(self):
+        # Bancos anteriores à coluna host (agrupamento por domínio)
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(urls)")}
+        if "host" not in columns:
+            self.conn.create_function("url_host", 1, url_host)
+            self.conn.execute("ALTER TABLE urls ADD COLUMN host TEXT NOT NULL DEFAULT ''")
+            self.conn.execute("UPDATE urls SET host = url_host(url)")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS urls_host ON urls(host, last_visit)")
+
+    # --- Migração do history.json ---
+    def migrate_legacy(self):
+        done = self.conn.execute("SELECT value FROM meta WHERE key='legacy_migrated'").fetchone()
+        if done or not os.path.exists(self.legacy_path):
+            return
+        try:
+            with open(self.legacy_path, "r") as f:
+                urls = json.load(f)
+        except (OSError, ValueError):
+            urls = []
+        # Sem data no arquivo antigo: mantém a ordem com timestamps crescentes
+        base = os.path.getmtime(self.legacy_path) - len(urls)
+        with self.conn:
+            for i, url in enumerate(u for u in urls if isinstance(u, str) and u):
+                self.apply_visit(self.conn, normalize_url(url), url, base + i)
+            self.conn.execute("INSERT OR REPLACE INTO meta(key, value) VALUES('legacy_migrated', ?)", (str(time.time()),))
+        os.replace(self.legacy_path, self.legacy_path + ".migrated")
+
+    # --- Gravação ---
+    def add_visit(self, url, ts=None):
+        if not url:
+            return
+        ts = ts or time.time()
+        key = normalize_url(url)
+        self.pending.put(("visit", key, url, ts))
+        for listener in self.listeners:
+            listener("visit", key, url, ts)
+
+    def set_title(self, url, title):
+        if not url or not title:
+            return
+        key = normalize_url(url)
+        self.pending.put(("title", key, title))
+        for listener in self.listeners:
+            listener("title", key, url, title)
+
+    def delete(self, urls):
+        keys = [normalize_url(u) for u in urls]
+        if keys:
+            self.pending.put(("delete", keys))
+            for listener in self.listeners:
+                listener("delete", keys, None, None)
+
+    def apply_visit(self, conn, key, url, ts):
+        conn.execute(
+            "INSERT INTO urls(url, display_url, host, visit_count, first_visit, last_visit) VALUES(?, ?, ?, 1, ?, ?) "
+            "ON CONFLICT(url) DO UPDATE SET visit_count=visit_count+1, last_visit=excluded.last_visit, display_url=excluded.display_url",
+            (key, url, url_host(key), ts, ts),
+        )
+        conn.execute("INSERT INTO visits(url_id, ts) SELECT id, ? FROM urls WHERE url=?", (ts, key))
+
+    def apply(self, conn, item):
+        kind = item[0]
+        if kind == "visit":
+            self.apply_visit(conn, item[1], item[2], item[3])
+        elif kind == "title":
+            conn.execute("UPDATE urls SET title=? WHERE url=?", (item[2], item[1]))
+        elif kind == "delete":
+            conn.executemany("DELETE FROM urls WHERE url=?", [(k,) for k in item[1]])
+
+    def write_loop(self):
+        conn = connect(self.path)
+        while True:
+            item = self.pending.get()
+            if item is None:
+                self.pending.task_done()
+                break
+            batch = [item]
+            deadline = time.monotonic() + FLUSH_INTERVAL
+            stop = False
+            while len(batch) < BATCH_SIZE:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    item = self.pending.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    self.pending.task_done()
+                    break
+                batch.append(item)
+            try:
+                with conn:
+                    for item in batch:
+                        self.apply(conn, item)
+            except sqlite3.Error as e:
+                log.error("erro gravando histórico", extra=fields(error=str(e)))
+            for _ in batch:
+                self.pending.task_done()
+            if stop:
+                break
+        conn.close()
+
+    def flush(self):
+        self.pending.join()
+
+    def close(self):
+        if self.writer.is_alive():
+            self.pending.put(None)
+            self.writer.join()
+        self.conn.close()
+
+    # --- Leitura ---
+    def filter_clause(self, text, group=None, key=None):
+        # WHERE para o filtro de texto (trigramas com 3+ caracteres, senão LIKE) e o grupo
+        clauses, params = [], {}
+        if text:
+            if self.fts and len(text) >= 3:
+                clauses.append("id IN (SELECT rowid FROM urls_fts WHERE urls_fts MATCH :query)")
+                params["query"] = '"' + text.replace('"', '""') + '"'
+            else:
+                clauses.append("(display_url LIKE :pattern ESCAPE '\\' OR title LIKE :pattern ESCAPE '\\')")
+                params["pattern"] = like_pattern(text)
+        if group == GROUP_DOMAIN:
+            clauses.append("host = :key")
+            params["key"] = key
+        elif group == GROUP_DAY:
+            clauses.append("last_visit >= :start AND last_visit < :end")
+            params["start"], params["end"] = day_range(key)
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def count(self, text="", group=None, key=None):
+        where, params = self.filter_clause(text, group, key)
+        return self.conn.execute("SELECT COUNT(*) FROM urls" + where, params).fetchone()[0]
+
+    def page(self, offset, limit, text="", group=None, key=None):
+        where, params = self.filter_clause(text, group, key)
+        params.update(offset=offset, limit=limit)
+        return self.conn.execute(
+            "SELECT display_url, title, visit_count, last_visit, url FROM urls" + where +
+            " ORDER BY last_visit DESC LIMIT :limit OFFSET :offset",
+            params,
+        ).fetchall()
+
+    def groups(self, group, text=""):
+        # [(chave, quantidade)], grupos mais recentes primeiro
+        where, params = self.filter_clause(text)
+        if group == GROUP_DOMAIN:
+            sql = "SELECT host, COUNT(*) FROM urls" + where + " GROUP BY host ORDER BY MAX(last_visit) DESC"
+        else:
+            sql = ("SELECT date(last_visit, 'unixepoch', 'localtime') AS day, COUNT(*) FROM urls" + where +
+                   " GROUP BY day ORDER BY day DESC")
+        return self.conn.execute(sql, params).fetchall()
+
+    def group_urls(self, group, key, text=""):
+        where, params = self.filter_clause(text, group, key)
+        return [row[0] for row in self.conn.execute("SELECT url FROM urls" + where, params)]
+
+    def recent(self, limit=100, offset=0):
+        return self.conn.execute(
+            "SELECT display_url, title, visit_count, last_visit FROM urls ORDER BY last_visit DESC LIMIT ? OFFSET ?",
+            (limit, offset),
+        ).fetchall()
+
+    def entries(self):
+        return self.conn.execute("SELECT display_url, title, visit_count, last_visit, url FROM urls").fetchall()
+
+    def top(self, limit, now=None, conn=None):
+        # Entradas mais relevantes primeiro; conn: conexão própria de outra thread
+        return (conn or self.conn).execute(
+            f"SELECT display_url, title, visit_count, last_visit, url FROM urls ORDER BY {FRECENCY_SQL} DESC LIMIT :limit",
+            {"now": now or time.time(), "limit": limit},
+        ).fetchall()
+
+    def match(self, text, limit=200, now=None, scan=MATCH_SCAN, conn=None):
+        # Busca por substring via índice de trigramas (consulta com 3+ caracteres).
+        # Ordena por frecency no máximo "scan" candidatos.
+        if len(text) < 3:
+            return None
+        conn = conn or self.conn
+        if not self.fts:
+            return conn.execute(
+                f"SELECT display_url, title, visit_count, last_visit, url FROM urls "
+                f"WHERE display_url LIKE :pattern ESCAPE '\\' OR title LIKE :pattern ESCAPE '\\' "
+                f"ORDER BY {FRECENCY_SQL} DESC LIMIT :limit",
+                {"pattern": like_pattern(text), "now": now or time.time(), "limit": limit},
+            ).fetchall()
+        return conn.execute(
+            f"SELECT display_url, title, visit_count, last_visit, url FROM urls WHERE id IN ("
+            f"SELECT rowid FROM urls_fts WHERE urls_fts MATCH :query LIMIT :scan"
+            f") ORDER BY {FRECENCY_SQL} DESC LIMIT :limit",
+            {"query": '"' + text.replace('"', '""') + '"', "now": now or time.time(), "limit": limit, "scan": scan},
+        ).fetchall()
+
+    def search(self, text, limit=50):
+        pattern = like_pattern(text)
+        return [row[0] for row in self.conn.execute(
+            "SELECT display_url FROM urls WHERE display_url LIKE ? ESCAPE '\\' OR title LIKE ? ESCAPE '\\' "
+            "ORDER BY visit_count DESC, last_visit DESC LIMIT ?",
+            (pattern, pattern, limit),
+        )]
+
+    def visits(self, url):
+        return [row[0] for row in self.conn.execute(
+            "SELECT v.ts FROM visits v JOIN urls u ON u.id = v.url_id WHERE u.url=? ORDER BY v.ts",
+            (normalize_url(url),),
+        )]
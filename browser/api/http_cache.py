@@ -0,0 +1,58 @@
+import os, sys
+from urllib.parse import urlsplit
+
+BROWSER_PATH = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+sys.path.append(BROWSER_PATH)
+
+from browser.api.memory import parse_size
+from browser.api.event_log import get_logger, fields
+
+CACHE_FOLDER = "cache"
+CACHE_TYPES = ("disk", "memory", "none")
+DEFAULT_MAX_SIZE = 512 * 1024 ** 2
+# setHttpCacheMaximumSize recebe int de 32 bits
+QT_MAX_SIZE = 2 ** 31 - 1
+DEFAULT_WARM_DELAY = 15
+# Quantas entradas do histórico olhar por origem pedida (várias URLs por site)
+WARM_SCAN_FACTOR = 20
+
+log = get_logger("cache")
+
+
+def cache_settings(config):
+    # Seção "cache" do config.json com valores padrão e tamanhos já em bytes
+    section = (config or {}).get("cache", {})
+    cache_type = str(section.get("type", "disk")).lower()
+    if cache_type not in CACHE_TYPES:
+        cache_type = "disk"
+    max_size = parse_size(section.get("max_size", DEFAULT_MAX_SIZE))
+    if max_size > QT_MAX_SIZE:
+        log.warning("cache.max_size acima do limite do Qt", extra=fields(max_size=max_size, used=QT_MAX_SIZE))
+        max_size = QT_MAX_SIZE
+    return {
+        "type": cache_type,
+        "max_size": max_size,
+        "warm_top": max(0, int(section.get("warm_top", 0))),
+        "warm_delay": float(section.get("warm_delay_seconds", DEFAULT_WARM_DELAY)),
+    }
+
+
+def origin(url):
+    parts = urlsplit(url)
+    if parts.scheme not in ("http", "https") or not parts.hostname:
+        return None
+    return f"{parts.scheme}://{parts.netloc}/"
+
+
+def top_origins(urls, limit):
+    # Origens distintas na ordem de relevância das URLs
+    origins = []
+    seen = set()
+    for url in urls:
+        value = origin(url)
+        if value and value not in seen:
+            seen.add(value)
+            origins.append(value)
+            if len(origins) >= limit:
+                break
+    return origins
@@ -0,0 +1,91 @@
+import os, sys, time
+
+BROWSER_PATH = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+sys.path.append(BROWSER_PATH)
+
+from browser.api.domains import registrable_domain
+
+DEFAULT_FREEZE_AFTER = 300
+
+try:
+    CLOCK_TICKS = os.sysconf("SC_CLK_TCK")
+except (AttributeError, ValueError, OSError):
+    CLOCK_TICKS = 100
+
+
+def process_cpu_time(pid):
+    # utime + stime de /proc/<pid>/stat em segundos; None se não der para ler
+    if not pid:
+        return None
+    try:
+        with open(f"/proc/{pid}/stat", "r") as f:
+            data = f.read()
+    except OSError:
+        return None
+    # O nome do processo pode ter espaços: campos contam a partir do último ")"
+    fields = data[data.rfind(")") + 2:].split()
+    try:
+        return (int(fields[11]) + int(fields[12])) / CLOCK_TICKS
+    except (IndexError, ValueError):
+        return None
+
+
+def domain_allowed(host, allow):
+    # allow: conjunto de domínios registráveis (ou hosts) que nunca congelam
+    if not host or not allow:
+        return False
+    return host in allow or registrable_domain(host) in allow
+
+
+# ---------------- CpuSavings ----------------
+# Estima a CPU que os renderers deixaram de gastar: a taxa medida enquanto a aba
+# estava ativa vezes o tempo congelada, menos o que o processo gastou de fato.
+# Renderers compartilhados entre abas são contados pela aba que congelou.
+class CpuSavings:
+    def __init__(self):
+        self.samples = {}
+        self.frozen = {}
+        self.saved = 0.0
+
+    def sample(self, pid, now=None):
+        cpu = process_cpu_time(pid)
+        if cpu is None:
+            return
+        now = now or time.monotonic()
+        previous = self.samples.get(pid)
+        # Abas no mesmo renderer: a primeira da rodada já mediu, as outras não zeram a taxa
+        if previous is not None and now <= previous[0]:
+            return
+        rate = 0.0
+        if previous is not None:
+            rate = max(0.0, (cpu - previous[1]) / (now - previous[0]))
+        self.samples[pid] = (now, cpu, rate)
+
+    def freeze(self, key, pid, now=None):
+        cpu = process_cpu_time(pid)
+        if cpu is None:
+            return
+        rate = self.samples.get(pid, (0, 0, 0.0))[2]
+        self.frozen[key] = (pid, now or time.monotonic(), cpu, rate)
+
+    def pending(self, key, now=None):
+        pid, started, cpu, rate = self.frozen[key]
+        used = (process_cpu_time(pid) or cpu) - cpu
+        return max(0.0, rate * ((now or time.monotonic()) - started) - used)
+
+    def thaw(self, key, now=None):
+        if key in self.frozen:
+            self.saved += self.pending(key, now)
+            del self.frozen[key]
+
+    def forget(self, pid):
+        self.samples.pop(pid, None)
+
+    def prune(self, pids):
+        # Renderers que não pertencem mais a nenhuma aba (pid pode ser reaproveitado)
+        for pid in self.samples.keys() - pids:
+            del self.samples[pid]
+
+    def total(self, now=None):
+        now = now or time.monotonic()
+        return self.saved + sum(self.pending(key, now) for key in self.frozen)
@@ -0,0 +1,53 @@
+import os, sys, json, socket, tempfile
+
+BROWSER_PATH = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+sys.path.append(BROWSER_PATH)
+
+# Só biblioteca padrão aqui: roda antes de qualquer import do Qt numa segunda execução
+FORWARD_TIMEOUT = 2.0
+
+
+def instance_name():
+    # Caminho do socket local (QLocalServer aceita caminho absoluto como nome)
+    folder = os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+    user = os.getuid() if hasattr(os, "getuid") else os.environ.get("USERNAME", "user")
+    return os.path.join(folder, f"pac22-browser-{user}.sock")
+
+
+def encode_message(message):
+    return (json.dumps(message) + "\n").encode("utf-8")
+
+
+def decode_message(data):
+    return json.loads(data.decode("utf-8"))
+
+
+def forward_to_running(message, name=None, timeout=FORWARD_TIMEOUT):
+    # True se uma instância aberta recebeu a mensagem; False se não há nenhuma
+    name = name or instance_name()
+    if not hasattr(socket, "AF_UNIX"):
+        return forward_qt(message, name, timeout)
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    client.settimeout(timeout)
+    try:
+        client.connect(name)
+        client.sendall(encode_message(message))
+        return client.makefile("rb").readline().strip() == b"ok"
+    except OSError:
+        return False
+    finally:
+        client.close()
+
+
+def forward_qt(message, name, timeout):
+    # Sem AF_UNIX (Windows): QLocalSocket fala com o named pipe do QLocalServer
+    from PySide6.QtNetwork import QLocalSocket
+    client = QLocalSocket()
+    client.connectToServer(name)
+    if not client.waitForConnected(int(timeout * 1000)):
+        return False
+    client.write(encode_message(message))
+    client.waitForBytesWritten(int(timeout * 1000))
+    ok = client.waitForReadyRead(int(timeout * 1000)) and bytes(client.readLine()).strip() == b"ok"
+    client.disconnectFromServer()
+    return ok
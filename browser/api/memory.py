@@ -0,0 +1,55 @@
+import os, sys, re
+
+BROWSER_PATH = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+sys.path.append(BROWSER_PATH)
+
+UNITS = {"": 1, "B": 1, "K": 1024, "KB": 1024, "M": 1024 ** 2, "MB": 1024 ** 2, "G": 1024 ** 3, "GB": 1024 ** 3}
+SIZE_RE = re.compile(r"^\s*([0-9]+(?:\.[0-9]+)?)\s*([A-Za-z]*)\s*$")
+
+try:
+    PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+except (AttributeError, ValueError, OSError):
+    PAGE_SIZE = 4096
+
+
+def parse_size(value):
+    # "2GB", "512 MB", "1.5G", 2147483648 -> bytes; inválido ou vazio -> 0 (sem limite)
+    if isinstance(value, (int, float)):
+        return int(value)
+    match = SIZE_RE.match(str(value or ""))
+    if not match or match.group(2).upper() not in UNITS:
+        return 0
+    return int(float(match.group(1)) * UNITS[match.group(2).upper()])
+
+
+def process_rss(pid):
+    # RSS em bytes via /proc/<pid>/statm; 0 se o processo não existe (ou não é Linux)
+    if not pid:
+        return 0
+    try:
+        with open(f"/proc/{pid}/statm", "r") as f:
+            return int(f.read().split()[1]) * PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+def choose_victims(tabs, budget):
+    # tabs: [(chave, pid, rss, último uso, protegida)]. Abas do mesmo renderer dividem
+    # o RSS; descarta as menos usadas até o total estimado caber no orçamento.
+    rss_by_pid, shares = {}, {}
+    for key, pid, rss, last_used, protected in tabs:
+        if pid:
+            rss_by_pid[pid] = rss
+            shares[pid] = shares.get(pid, 0) + 1
+    total = sum(rss_by_pid.values())
+    if not budget or total <= budget:
+        return [], total
+    victims = []
+    for key, pid, rss, last_used, protected in sorted(tabs, key=lambda t: t[3]):
+        if total <= budget:
+            break
+        if protected or not pid:
+            continue
+        victims.append(key)
+        total -= rss_by_pid[pid] / shares[pid]
+    return victims, total
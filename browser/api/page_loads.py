@@ -0,0 +1,116 @@
+import os, sys, time, heapq, itertools
+
+BROWSER_PATH = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+sys.path.append(BROWSER_PATH)
+
+# Prioridades: menor carrega antes. FOREGROUND (aba visível) não espera vaga.
+FOREGROUND = 0
+BACKGROUND = 1
+
+DEFAULT_MAX_CONCURRENT = 4
+DEFAULT_TIMEOUT = 30
+
+
+def normalize_url(url):
+    url = url.strip()
+    if not url or url.startswith("#"):
+        return None
+    if "://" not in url and not url.startswith(("about:", "data:", "file:")):
+        url = "https://" + url
+    return url
+
+
+def launch_targets(args, cwd=""):
+    # Argumentos de linha de comando: .txt = lista de URLs, outro arquivo local =
+    # file://, o resto é URL. Devolve (urls, listas)
+    urls, lists = [], []
+    for arg in args:
+        path = os.path.join(cwd, os.path.expanduser(arg))
+        if os.path.isfile(path):
+            if path.endswith(".txt"):
+                lists.append(path)
+            else:
+                urls.append("file://" + os.path.abspath(path))
+        else:
+            url = normalize_url(arg)
+            if url:
+                urls.append(url)
+    return urls, lists
+
+
+def read_url_file(path):
+    # Uma URL por linha; linhas vazias e comentários (#) são ignorados
+    urls = []
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        for line in f:
+            url = normalize_url(line)
+            if url:
+                urls.append(url)
+    return urls
+
+
+# ---------------- LoadQueue ----------------
+# Fila de carregamentos de páginas com teto de concorrência. Cada chave (aba) tem
+# no máximo uma entrada; mudar a prioridade invalida a entrada antiga no heap.
+# Um carregamento ocupa a vaga até done() ou até passar do timeout (expired()).
+class LoadQueue:
+    def __init__(self, max_concurrent=DEFAULT_MAX_CONCURRENT):
+        self.max_concurrent = max(1, int(max_concurrent))
+        self.heap = []
+        self.queued = {}
+        self.running = {}
+        self.counter = itertools.count()
+
+    def push(self, key, url, priority=BACKGROUND):
+        self.running.pop(key, None)
+        entry = [priority, next(self.counter), key, url]
+        old = self.queued.get(key)
+        if old is not None:
+            old[2] = None
+        self.queued[key] = entry
+        heapq.heappush(self.heap, entry)
+
+    def promote(self, key, priority=FOREGROUND):
+        entry = self.queued.get(key)
+        if entry is not None and priority < entry[0]:
+            self.push(key, entry[3], priority)
+
+    def remove(self, key):
+        self.running.pop(key, None)
+        entry = self.queued.pop(key, None)
+        if entry is not None:
+            entry[2] = None
+
+    def done(self, key):
+        return self.running.pop(key, None) is not None
+
+    def is_queued(self, key):
+        return key in self.queued
+
+    def pending(self):
+        return len(self.queued)
+
+    def ready(self, now=None):
+        # [(chave, url)] que podem começar agora; passam a contar como em execução
+        now = time.monotonic() if now is None else now
+        started = []
+        while self.heap:
+            priority, _, key, url = self.heap[0]
+            if key is None:
+                heapq.heappop(self.heap)
+                continue
+            if priority != FOREGROUND and len(self.running) >= self.max_concurrent:
+                break
+            heapq.heappop(self.heap)
+            del self.queued[key]
+            self.running[key] = now
+            started.append((key, url))
+        return started
+
+    def expired(self, timeout, now=None):
+        # Libera as vagas presas em páginas que não terminam de carregar
+        now = time.monotonic() if now is None else now
+        keys = [key for key, started in self.running.items() if now - started >= timeout]
+        for key in keys:
+            del self.running[key]
+        return keys
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+# Métricas de carregamento de páginas (loadStarted -> loadFinished + Navigation /
+# Paint Timing) guardadas por origem em <perfil>/metrics.sqlite.
+#
+# Relatório p50/p95/p99 por domínio e regressões da última execução do navegador
+# contra as anteriores (sai com status 1 se houver regressão):
+#   python3 browser/api/page_metrics.py [pasta do perfil] [métrica]
+import os, sys, math, time, sqlite3
+
+BROWSER_PATH = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+sys.path.append(BROWSER_PATH)
+
+METRICS_DB = "metrics.sqlite"
+# wall: loadStarted -> loadFinished medido no Qt; o resto vem do documento (ms)
+METRICS = ("wall", "ttfb", "dcl", "load", "fcp", "lcp")
+DEFAULT_METRIC = "load"
+DEFAULT_FOLDER = "~/.pac22_user"
+DEFAULT_RETENTION_DAYS = 30
+PERCENTILES = (50, 95, 99)
+# Regressão: p50 ou p95 da última execução X% acima das BASELINE_RUNS anteriores
+REGRESSION_THRESHOLD = 0.2
+MIN_SAMPLES = 5
+BASELINE_RUNS = 5
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS navigations (
+    id INTEGER PRIMARY KEY,
+    run INTEGER NOT NULL,
+    ts REAL NOT NULL,
+    origin TEXT NOT NULL,
+    domain TEXT NOT NULL,
+    kind TEXT NOT NULL DEFAULT '',
+    ok INTEGER NOT NULL,
+    wall INTEGER,
+    ttfb INTEGER,
+    dcl INTEGER,
+    load INTEGER,
+    fcp INTEGER,
+    lcp INTEGER,
+    bytes INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS navigations_run ON navigations(run);
+CREATE INDEX IF NOT EXISTS navigations_ts ON navigations(ts);
+"""
+
+COLUMNS = ("run", "ts", "origin", "domain", "kind", "ok") + METRICS + ("bytes",)
+
+
+def percentile(values, p):
+    # Nearest-rank sobre valores já ordenados
+    if not values:
+        return None
+    rank = max(1, math.ceil(p / 100 * len(values)))
+    return values[rank - 1]
+
+
+def summarize(rows, metric=DEFAULT_METRIC):
+    # {domínio: {"n": amostras, "p50": ..., "p95": ..., "p99": ...}} só de cargas ok
+    values = {}
+    for row in rows:
+        value = row.get(metric)
+        if row.get("ok") and value is not None:
+            values.setdefault(row["domain"], []).append(value)
+    summary = {}
+    for domain, samples in values.items():
+        samples.sort()
+        stats = {"n": len(samples)}
+        for p in PERCENTILES:
+            stats[f"p{p}"] = percentile(samples, p)
+        summary[domain] = stats
+    return summary
+
+
+def regressions(current, baseline, threshold=REGRESSION_THRESHOLD, min_samples=MIN_SAMPLES):
+    # [(domínio, percentil, antes, depois)] onde o valor subiu mais que threshold
+    found = []
+    for domain, now in current.items():
+        before = baseline.get(domain)
+        if before is None or now["n"] < min_samples or before["n"] < min_samples:
+            continue
+        for key in ("p50", "p95"):
+            if before[key] and now[key] > before[key] * (1 + threshold):
+                found.append((domain, key, before[key], now[key]))
+    return found
+
+
+# ---------------- MetricsStore ----------------
+# Uma linha compacta por navegação (ms inteiros). As linhas ficam em memória e são
+# gravadas em lote por flush(); o que passa de retention_days é apagado ao abrir.
+class MetricsStore:
+    def __init__(self, folder, run=None, retention_days=DEFAULT_RETENTION_DAYS):
+        self.path = os.path.join(folder, METRICS_DB)
+        # Execução atual do navegador (início em segundos); None = só leitura
+        self.run = run
+        self.pending = []
+        self.conn = sqlite3.connect(self.path, timeout=10)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        if retention_days:
+            self.conn.execute("DELETE FROM navigations WHERE ts < ?", (time.time() - retention_days * 86400,))
+        self.conn.commit()
+
+    def add(self, origin, domain, ok, timings, kind="", ts=None):
+        row = {"run": self.run or 0, "ts": time.time() if ts is None else ts,
+               "origin": origin, "domain": domain or origin, "kind": kind or "", "ok": 1 if ok else 0,
+               "bytes": int(timings.get("bytes") or 0)}
+        for metric in METRICS:
+            value = timings.get(metric)
+            row[metric] = None if value is None else int(round(value))
+        self.pending.append(row)
+        return row
+
+    def flush(self):
+        if not self.pending:
+            return 0
+        rows, self.pending = self.pending, []
+        placeholders = ", ".join("?" for _ in COLUMNS)
+        with self.conn:
+            self.conn.executemany(
+                f"INSERT INTO navigations ({', '.join(COLUMNS)}) VALUES ({placeholders})",
+                [tuple(row[c] for c in COLUMNS) for row in rows])
+        return len(rows)
+
+    def runs(self):
+        return [r[0] for r in self.conn.execute("SELECT DISTINCT run FROM navigations ORDER BY run")]
+
+    def rows(self, runs=None):
+        sql = f"SELECT {', '.join(COLUMNS)} FROM navigations"
+        args = ()
+        if runs is not None:
+            runs = list(runs)
+            if not runs:
+                return []
+            sql += f" WHERE run IN ({', '.join('?' for _ in runs)})"
+            args = tuple(runs)
+        return [dict(zip(COLUMNS, r)) for r in self.conn.execute(sql, args)]
+
+    def close(self):
+        self.flush()
+        self.conn.close()
+
+
+def format_ms(value):
+    return "-" if value is None else f"{value} ms"
+
+
+def report(folder, metric=DEFAULT_METRIC, out=sys.stdout):
+    # Imprime a tabela por domínio e devolve as regressões encontradas
+    store = MetricsStore(folder, retention_days=0)
+    try:
+        runs = store.runs()
+        summary = summarize(store.rows(), metric)
+        found = []
+        if len(runs) > 1:
+            current = summarize(store.rows(runs[-1:]), metric)
+            baseline = summarize(store.rows(runs[-1 - BASELINE_RUNS:-1]), metric)
+            found = regressions(current, baseline)
+    finally:
+        store.close()
+
+    print(f"{metric}: {sum(s['n'] for s in summary.values())} navegações, {len(runs)} execuções", file=out)
+    print(f"{'domínio':<32} {'n':>6} " + " ".join(f"{'p' + str(p):>10}" for p in PERCENTILES), file=out)
+    for domain, stats in sorted(summary.items(), key=lambda item: -item[1]["n"]):
+        print(f"{domain[:32]:<32} {stats['n']:>6} " + " ".join(f"{format_ms(stats['p' + str(p)]):>10}" for p in PERCENTILES), file=out)
+    for domain, key, before, after in found:
+        print(f"REGRESSÃO {domain}: {key} {before} ms -> {after} ms (+{(after / before - 1) * 100:.0f}%)", file=out)
+    return found
+
+
+if __name__ == "__main__":
+    folder = os.path.expanduser(sys.argv[1] if len(sys.argv) > 1 else DEFAULT_FOLDER)
+    metric = sys.argv[2] if len(sys.argv) > 2 else DEFAULT_METRIC
+    if metric not in METRICS:
+        print(f"Métrica desconhecida: {metric} (use {', '.join(METRICS)})")
+        sys.exit(2)
+    if not os.path.exists(os.path.join(folder, METRICS_DB)):
+        print(f"Sem métricas em {folder}")
+        sys.exit(0)
+    sys.exit(1 if report(folder, metric) else 0)
@@ -1,12 +1,15 @@
-import tldextract, sys, uuid, json, os, importlib
+import sys, uuid, json, os, importlib
 
 BROWSER_PATH = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
 sys.path.append( BROWSER_PATH );
 
+from browser.api.trace_events import traced
+
 class ProjectHelper():
     def __init__(self):
         self.lista = None;
         pass;
+    @traced()
     def list(self):
         if self.lista == None:
             self.lista = [];
@@ -0,0 +1,266 @@
+import os, sys, json, time, sqlite3, hashlib, tempfile
+from email.utils import parsedate_to_datetime
+
+BROWSER_PATH = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+sys.path.append(BROWSER_PATH)
+
+INDEX_DB = "index.sqlite"
+BLOBS_FOLDER = "blobs"
+DEFAULT_MAX_SIZE = 2 * 1024 ** 3
+# Objetos maiores que isso passam direto, sem cache
+MAX_OBJECT_SIZE = 64 * 1024 ** 2
+# Sem max-age/Expires: 10% da idade desde Last-Modified, até 1 dia
+HEURISTIC_FRACTION = 0.1
+HEURISTIC_MAX = 86400
+EVICT_BATCH = 64
+
+CACHEABLE_STATUS = (200, 203, 301, 410)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    sha TEXT NOT NULL,
+    status INTEGER NOT NULL,
+    reason TEXT NOT NULL,
+    headers TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    stored REAL NOT NULL,
+    expires REAL NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_lru ON entries(last_access);
+CREATE INDEX IF NOT EXISTS entries_sha ON entries(sha);
+"""
+
+
+def header(headers, name, default=""):
+    # headers: [(nome, valor)] na ordem recebida; nomes comparados sem caixa
+    name = name.lower()
+    for key, value in headers:
+        if key.lower() == name:
+            return value
+    return default
+
+
+def parse_cache_control(value):
+    directives = {}
+    for part in value.split(","):
+        name, _, arg = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = arg.strip().strip('"')
+    return directives
+
+
+def parse_date(value):
+    try:
+        return parsedate_to_datetime(value).timestamp() if value else None
+    except (TypeError, ValueError, IndexError, OverflowError):
+        return None
+
+
+def cache_key(url, request_headers):
+    # Accept-Encoding entra na chave: é o único Vary que guardamos
+    return url + "\n" + header(request_headers, "accept-encoding")
+
+
+def request_cacheable(method, request_headers):
+    # Com Cookie a resposta pode ser do usuário: o cache é compartilhado entre perfis
+    if method != "GET":
+        return False
+    if header(request_headers, "authorization") or header(request_headers, "range") or header(request_headers, "cookie"):
+        return False
+    return "no-store" not in parse_cache_control(header(request_headers, "cache-control"))
+
+
+def freshness(status, headers, now=None):
+    # Validade absoluta (timestamp) da resposta; None se não pode ser guardada
+    if status not in CACHEABLE_STATUS:
+        return None
+    # Set-Cookie nunca é guardado: seria repetido para outro perfil num hit
+    if header(headers, "set-cookie"):
+        return None
+    directives = parse_cache_control(header(headers, "cache-control"))
+    if "no-store" in directives or "private" in directives:
+        return None
+    vary = {v.strip().lower() for v in header(headers, "vary").split(",") if v.strip()}
+    if vary - {"accept-encoding"}:
+        return None
+    now = time.time() if now is None else now
+    if "no-cache" in directives:
+        return now
+    age = 0
+    try:
+        age = max(0, int(header(headers, "age", "0")))
+    except ValueError:
+        pass
+    for name in ("s-maxage", "max-age"):
+        if name in directives:
+            try:
+                return now + max(0, int(directives[name]) - age)
+            except ValueError:
+                return now
+    date = parse_date(header(headers, "date")) or now
+    expires = header(headers, "expires")
+    if expires:
+        expires = parse_date(expires)
+        return now + max(0, expires - date) if expires else now
+    modified = parse_date(header(headers, "last-modified"))
+    if modified is not None and modified < date:
+        return now + min(HEURISTIC_MAX, (date - modified) * HEURISTIC_FRACTION)
+    return now
+
+
+def validators(headers):
+    # Cabeçalhos condicionais para revalidar uma entrada vencida
+    result = []
+    etag = header(headers, "etag")
+    if etag:
+        result.append(("If-None-Match", etag))
+    modified = header(headers, "last-modified")
+    if modified:
+        result.append(("If-Modified-Since", modified))
+    return result
+
+
+# ---------------- ProxyCache ----------------
+# Cache endereçado por conteúdo: o corpo vai para blobs/<sha256[:2]>/<sha256> (URLs
+# com o mesmo conteúdo dividem o arquivo) e o índice SQLite guarda cabeçalhos,
+# validade e último acesso. Acima de max_size, remove as entradas menos usadas
+# (LRU) e os blobs que ficaram sem referência.
+class ProxyCache:
+    def __init__(self, folder, max_size=DEFAULT_MAX_SIZE):
+        self.folder = folder
+        self.max_size = max_size or DEFAULT_MAX_SIZE
+        self.blobs = os.path.join(folder, BLOBS_FOLDER)
+        os.makedirs(self.blobs, exist_ok=True)
+        # Restos de corpos interrompidos numa execução anterior
+        for name in os.listdir(self.blobs):
+            if name.startswith(".part-"):
+                os.remove(os.path.join(self.blobs, name))
+        self.conn = sqlite3.connect(os.path.join(folder, INDEX_DB), timeout=10)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self.total = self.conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM (SELECT MAX(size) AS size FROM entries GROUP BY sha)"
+        ).fetchone()[0]
+
+    def blob_path(self, sha):
+        return os.path.join(self.blobs, sha[:2], sha)
+
+    def lookup(self, key, now=None):
+        row = self.conn.execute(
+            "SELECT url, sha, status, reason, headers, size, expires FROM entries WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        url, sha, status, reason, headers, size, expires = row
+        path = self.blob_path(sha)
+        headers = [tuple(h) for h in json.loads(headers)]
+        # Blob sumiu, ou entrada antiga guardada com Set-Cookie: descarta
+        if not os.path.exists(path) or header(headers, "set-cookie"):
+            self.remove(key)
+            return None
+        with self.conn:
+            self.conn.execute("UPDATE entries SET last_access = ? WHERE key = ?", (time.time() if now is None else now, key))
+        return {
+            "key": key, "url": url, "sha": sha, "status": status, "reason": reason,
+            "headers": headers, "size": size, "expires": expires, "path": path,
+        }
+
+    def writer(self):
+        return BlobWriter(self.blobs)
+
+    def store(self, key, url, status, reason, headers, blob, expires, now=None):
+        # blob: BlobWriter já fechado; o arquivo temporário vira o blob definitivo
+        now = time.time() if now is None else now
+        path = self.blob_path(blob.sha)
+        if os.path.exists(path):
+            os.remove(blob.path)
+        else:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            os.replace(blob.path, path)
+            self.total += blob.size
+        old = self.conn.execute("SELECT sha, size FROM entries WHERE key = ?", (key,)).fetchone()
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO entries (key, url, sha, status, reason, headers, size, stored, expires, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, url, blob.sha, status, reason, json.dumps(headers), blob.size, now, expires, now),
+            )
+        if old is not None and old[0] != blob.sha:
+            self.release(*old)
+        self.evict()
+
+    def refresh(self, key, headers, expires):
+        # 304: mantém o corpo, atualiza cabeçalhos e validade
+        with self.conn:
+            self.conn.execute(
+                "UPDATE entries SET headers = ?, expires = ? WHERE key = ?", (json.dumps(headers), expires, key)
+            )
+
+    def remove(self, key):
+        old = self.conn.execute("SELECT sha, size FROM entries WHERE key = ?", (key,)).fetchone()
+        if old is None:
+            return
+        with self.conn:
+            self.conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+        self.release(*old)
+
+    def release(self, sha, size):
+        if self.conn.execute("SELECT 1 FROM entries WHERE sha = ? LIMIT 1", (sha,)).fetchone():
+            return
+        try:
+            os.remove(self.blob_path(sha))
+            self.total -= size
+        except FileNotFoundError:
+            pass
+
+    def evict(self):
+        while self.total > self.max_size:
+            rows = self.conn.execute(
+                "SELECT key FROM entries ORDER BY last_access LIMIT ?", (EVICT_BATCH,)
+            ).fetchall()
+            if not rows:
+                self.total = 0
+                return
+            for (key,) in rows:
+                self.remove(key)
+                if self.total <= self.max_size:
+                    return
+
+    def close(self):
+        self.conn.close()
+
+
+# ---------------- BlobWriter ----------------
+# Corpo sendo recebido: grava num temporário da pasta de blobs calculando o sha256
+class BlobWriter:
+    def __init__(self, folder):
+        fd, self.path = tempfile.mkstemp(prefix=".part-", dir=folder)
+        self.file = os.fdopen(fd, "wb")
+        self.hash = hashlib.sha256()
+        self.size = 0
+        self.sha = None
+
+    def write(self, data):
+        self.size += len(data)
+        if self.size > MAX_OBJECT_SIZE:
+            self.discard()
+            return False
+        self.file.write(data)
+        self.hash.update(data)
+        return True
+
+    def close(self):
+        self.file.close()
+        self.sha = self.hash.hexdigest()
+
+    def discard(self):
+        if not self.file.closed:
+            self.file.close()
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+# Cliente da API de automação (JSON-RPC 2.0, uma mensagem JSON por linha, no
+# socket local do navegador; "rpc": {"enabled": true} no config.json). Só
+# biblioteca padrão: dá para copiar este arquivo para qualquer script.
+#
+#   from browser.api.rpc_client import RpcClient
+#   with RpcClient() as rpc:
+#       tab = rpc.call("tabs.open", url="https://example.com")
+#       rpc.call("tab.wait_load", id=tab["id"])
+#       print(rpc.call("tab.text", id=tab["id"]))
+#
+# Linha de comando: python3 browser/api/rpc_client.py tabs.list
+#                   python3 browser/api/rpc_client.py tab.eval '{"script": "document.title"}'
+import os, sys, json, socket, tempfile, itertools
+
+BROWSER_PATH = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+sys.path.append(BROWSER_PATH)
+
+DEFAULT_TIMEOUT = 60.0
+
+# Códigos de erro JSON-RPC (padrão) e da aplicação
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+INTERNAL_ERROR = -32603
+TAB_NOT_FOUND = -32001
+TIMEOUT = -32002
+
+
+def rpc_name():
+    folder = os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+    user = os.getuid() if hasattr(os, "getuid") else os.environ.get("USERNAME", "user")
+    return os.path.join(folder, f"pac22-rpc-{user}.sock")
+
+
+class RpcError(Exception):
+    def __init__(self, code, message, data=None):
+        super().__init__(f"{message} ({code})")
+        self.code = code
+        self.message = message
+        self.data = data
+
+    def to_json(self):
+        error = {"code": self.code, "message": self.message}
+        if self.data is not None:
+            error["data"] = self.data
+        return error
+
+
+def request(method, params=None, request_id=None):
+    message = {"jsonrpc": "2.0", "method": method}
+    if params:
+        message["params"] = params
+    if request_id is not None:
+        message["id"] = request_id
+    return message
+
+
+def unwrap(response):
+    # Resultado da resposta, ou a RpcError correspondente (sem levantar)
+    error = response.get("error")
+    if error is not None:
+        return RpcError(error.get("code", INTERNAL_ERROR), error.get("message", ""), error.get("data"))
+    return response.get("result")
+
+
+# ---------------- RpcClient ----------------
+# call(): uma ida e volta. pipeline(): todas as chamadas numa escrita só, respostas
+# lidas depois (o servidor processa tudo o que chegou numa passada do event loop).
+# batch(): mesmo efeito num único array JSON-RPC, com uma resposta só.
+class RpcClient:
+    def __init__(self, path=None, timeout=DEFAULT_TIMEOUT):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(timeout)
+        self.sock.connect(path or rpc_name())
+        self.reader = self.sock.makefile("rb")
+        self.ids = itertools.count(1)
+        # Respostas que chegaram fora de ordem (métodos assíncronos)
+        self.responses = {}
+
+    def send(self, messages):
+        self.sock.sendall(b"".join((json.dumps(m) + "\n").encode("utf-8") for m in messages))
+
+    def receive(self):
+        line = self.reader.readline()
+        if not line:
+            raise ConnectionError("navegador fechou a conexão da API")
+        return json.loads(line)
+
+    def wait(self, request_id):
+        while request_id not in self.responses:
+            response = self.receive()
+            self.responses[response.get("id")] = response
+        return self.responses.pop(request_id)
+
+    def call(self, method, **params):
+        request_id = next(self.ids)
+        self.send([request(method, params, request_id)])
+        result = unwrap(self.wait(request_id))
+        if isinstance(result, RpcError):
+            raise result
+        return result
+
+    def notify(self, method, **params):
+        self.send([request(method, params)])
+
+    def pipeline(self, calls):
+        # [(método, {params})] -> resultados na mesma ordem; erros vêm como RpcError
+        ids = [next(self.ids) for _ in calls]
+        self.send([request(method, params, i) for i, (method, params) in zip(ids, calls)])
+        return [unwrap(self.wait(i)) for i in ids]
+
+    def batch(self, calls):
+        ids = [next(self.ids) for _ in calls]
+        self.sock.sendall((json.dumps([request(method, params, i) for i, (method, params) in zip(ids, calls)]) + "\n").encode("utf-8"))
+        responses = self.receive()
+        if isinstance(responses, dict):
+            # Erro do lote inteiro (JSON inválido, lote vazio)
+            raise unwrap(responses)
+        by_id = {r.get("id"): r for r in responses}
+        return [unwrap(by_id[i]) if i in by_id else RpcError(INTERNAL_ERROR, "sem resposta") for i in ids]
+
+    def close(self):
+        self.reader.close()
+        self.sock.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("uso: rpc_client.py MÉTODO ['{\"param\": valor}']")
+        sys.exit(2)
+    params = json.loads(sys.argv[2]) if len(sys.argv) > 2 else {}
+    try:
+        with RpcClient() as rpc:
+            print(json.dumps(rpc.call(sys.argv[1], **params), indent=2, ensure_ascii=False))
+    except RpcError as e:
+        print("Erro:", e)
+        sys.exit(1)
+    except OSError as e:
+        print("Navegador não encontrado (API ligada no config.json?):", e)
+        sys.exit(1)
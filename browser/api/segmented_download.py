@@ -0,0 +1,310 @@
+import os, sys, json, time, hashlib, threading
+from concurrent.futures import ThreadPoolExecutor
+
+BROWSER_PATH = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+sys.path.append(BROWSER_PATH)
+
+DEFAULT_SEGMENTS = 4
+CHUNK_SIZE = 256 * 1024
+MIN_SEGMENT_SIZE = 4 * 1024 * 1024
+JOURNAL_INTERVAL = 1.0
+MAX_RETRIES = 5
+TIMEOUT = 30
+PART_SUFFIX = ".part"
+JOURNAL_SUFFIX = ".part.json"
+
+
+class DownloadCancelled(Exception):
+    pass
+
+
+def make_session(connections=DEFAULT_SEGMENTS, user_agent=None):
+    # Sessão keep-alive compartilhada; um pool de conexões por host.
+    # requests só é importado aqui (fora do caminho de inicialização do navegador)
+    import requests
+    from requests.adapters import HTTPAdapter
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=connections, pool_maxsize=connections)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    if user_agent:
+        session.headers["User-Agent"] = user_agent
+    return session
+
+
+def split_ranges(size, segments, min_segment_size=MIN_SEGMENT_SIZE):
+    segments = max(1, min(segments, size // max(1, min_segment_size) or 1))
+    step = size // segments
+    ranges = []
+    start = 0
+    for i in range(segments):
+        end = size - 1 if i == segments - 1 else start + step - 1
+        ranges.append([start, end, start])
+        start = end + 1
+    return ranges
+
+
+if hasattr(os, "pwrite"):
+    def write_at(fd, data, offset, lock):
+        view = memoryview(data)
+        while view:
+            written = os.pwrite(fd, view, offset)
+            view = view[written:]
+            offset += written
+
+    def read_at(fd, size, offset, lock):
+        return os.pread(fd, size, offset)
+else:
+    # Windows não tem pwrite/pread; serializa seek+write
+    def write_at(fd, data, offset, lock):
+        with lock:
+            os.lseek(fd, offset, os.SEEK_SET)
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view):]
+
+    def read_at(fd, size, offset, lock):
+        with lock:
+            os.lseek(fd, offset, os.SEEK_SET)
+            return os.read(fd, size)
+
+
+def preallocate(fd, size):
+    if hasattr(os, "posix_fallocate"):
+        try:
+            os.posix_fallocate(fd, 0, size)
+            return
+        except OSError:
+            pass
+    os.ftruncate(fd, size)
+
+
+# ---------------- SegmentedDownload ----------------
+# Baixa um arquivo em N segmentos HTTP Range para <path>.part (pré-alocado, escrita
+# posicional), mantendo um journal <path>.part.json para retomar de onde parou.
+# O SHA-256 é calculado em ordem enquanto os bytes chegam: o segmento que contém a
+# "fronteira" do hash é consumido direto da memória; os demais são relidos do
+# arquivo (page cache) quando a fronteira chega neles.
+class SegmentedDownload:
+    def __init__(self, url, path, segments=DEFAULT_SEGMENTS, session=None, headers=None,
+                 cookies=None, progress=None, min_segment_size=MIN_SEGMENT_SIZE, throttle=None):
+        self.url = url
+        self.path = path
+        self.part_path = path + PART_SUFFIX
+        self.journal_path = path + JOURNAL_SUFFIX
+        self.segments = max(1, segments)
+        self.session = session or make_session(self.segments)
+        self.headers = dict(headers or {})
+        self.cookies = cookies
+        self.progress = progress
+        self.min_segment_size = min_segment_size
+        self.throttle = throttle
+
+        self.lock = threading.Lock()
+        self.io_lock = threading.Lock()
+        self.journal_lock = threading.Lock()
+        self.cancel_event = threading.Event()
+        self.size = 0
+        self.etag = ""
+        self.last_modified = ""
+        self.ranges = []
+        self.hasher = hashlib.sha256()
+        self.hash_pos = 0
+        self.fd = None
+        self.last_journal = 0
+
+    # --- Metadados ---
+    def probe(self):
+        headers = dict(self.headers, Range="bytes=0-0")
+        with self.session.get(self.url, headers=headers, cookies=self.cookies, stream=True, timeout=TIMEOUT) as r:
+            r.raise_for_status()
+            self.etag = r.headers.get("ETag", "")
+            self.last_modified = r.headers.get("Last-Modified", "")
+            content_range = r.headers.get("Content-Range", "")
+            if r.status_code == 206 and "/" in content_range and not content_range.endswith("/*"):
+                self.size = int(content_range.rsplit("/", 1)[1])
+                return True
+            self.size = int(r.headers.get("Content-Length") or 0)
+            return False
+
+    def received(self):
+        return sum(pos - start for start, end, pos in self.ranges)
+
+    # --- Journal ---
+    def load_journal(self):
+        if not (os.path.exists(self.journal_path) and os.path.exists(self.part_path)):
+            return False
+        try:
+            with open(self.journal_path, "r") as f:
+                journal = json.load(f)
+        except (OSError, ValueError):
+            return False
+        # Arquivo mudou no servidor: começa de novo
+        if journal.get("url") != self.url or journal.get("size") != self.size:
+            return False
+        if journal.get("etag", "") != self.etag or journal.get("last_modified", "") != self.last_modified:
+            return False
+        self.ranges = journal["ranges"]
+        return True
+
+    def save_journal(self, force=False):
+        if not force and time.monotonic() - self.last_journal < JOURNAL_INTERVAL:
+            return
+        with self.journal_lock:
+            self.last_journal = time.monotonic()
+            with self.lock:
+                data = json.dumps({
+                    "url": self.url,
+                    "size": self.size,
+                    "etag": self.etag,
+                    "last_modified": self.last_modified,
+                    "ranges": [list(r) for r in self.ranges],
+                })
+            tmp = self.journal_path + ".tmp"
+            with open(tmp, "w") as f:
+                f.write(data)
+            os.replace(tmp, self.journal_path)
+
+    # --- Hash em ordem ---
+    def advance_hash(self, data=None, offset=None):
+        with self.lock:
+            if data is not None and offset == self.hash_pos:
+                self.hasher.update(data)
+                self.hash_pos += len(data)
+            while self.hash_pos < self.size:
+                available = 0
+                for start, end, pos in self.ranges:
+                    if start <= self.hash_pos <= end:
+                        available = pos - self.hash_pos
+                        break
+                if available <= 0:
+                    break
+                while available > 0:
+                    block = read_at(self.fd, min(available, CHUNK_SIZE * 4), self.hash_pos, self.io_lock)
+                    if not block:
+                        return
+                    self.hasher.update(block)
+                    self.hash_pos += len(block)
+                    available -= len(block)
+
+    # --- Transferência ---
+    def fetch_segment(self, index):
+        import requests
+        retries = 0
+        while True:
+            start, end, pos = self.ranges[index]
+            if pos > end:
+                return
+            headers = dict(self.headers, Range=f"bytes={pos}-{end}")
+            if self.etag:
+                headers["If-Range"] = self.etag
+            try:
+                with self.session.get(self.url, headers=headers, cookies=self.cookies, stream=True, timeout=TIMEOUT) as r:
+                    if r.status_code != 206:
+                        raise IOError(f"Servidor ignorou Range (HTTP {r.status_code})")
+                    for chunk in r.iter_content(chunk_size=CHUNK_SIZE):
+                        if self.cancel_event.is_set():
+                            raise DownloadCancelled()
+                        if not chunk:
+                            continue
+                        chunk = chunk[:end + 1 - pos]
+                        if self.throttle is not None:
+                            self.throttle(len(chunk))
+                        write_at(self.fd, chunk, pos, self.io_lock)
+                        with self.lock:
+                            self.ranges[index][2] = pos + len(chunk)
+                        self.advance_hash(chunk, pos)
+                        pos += len(chunk)
+                        self.report()
+                        if pos > end:
+                            return
+                if pos <= end:
+                    raise IOError("Conexão encerrada antes do fim do segmento")
+            except DownloadCancelled:
+                raise
+            except (requests.RequestException, IOError):
+                retries += 1
+                if retries > MAX_RETRIES or self.cancel_event.is_set():
+                    raise
+                time.sleep(min(2 ** retries * 0.25, 5))
+
+    def fetch_single(self):
+        # Servidor sem Range: um fluxo só, sem retomada
+        self.ranges = [[0, max(0, self.size - 1), 0]]
+        with self.session.get(self.url, headers=self.headers, cookies=self.cookies, stream=True, timeout=TIMEOUT) as r:
+            r.raise_for_status()
+            pos = 0
+            for chunk in r.iter_content(chunk_size=CHUNK_SIZE):
+                if self.cancel_event.is_set():
+                    raise DownloadCancelled()
+                if not chunk:
+                    continue
+                if self.throttle is not None:
+                    self.throttle(len(chunk))
+                write_at(self.fd, chunk, pos, self.io_lock)
+                self.hasher.update(chunk)
+                pos += len(chunk)
+                self.ranges[0][2] = pos
+                self.hash_pos = pos
+                self.report()
+        self.size = pos
+
+    def report(self):
+        if self.progress is not None:
+            self.progress(self.received(), self.size)
+        self.save_journal()
+
+    def run(self):
+        started = time.monotonic()
+        ranged = self.probe()
+        resumed = ranged and self.size > 0 and self.load_journal()
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+
+        if resumed:
+            self.fd = os.open(self.part_path, os.O_RDWR | getattr(os, "O_BINARY", 0))
+        else:
+            self.fd = os.open(self.part_path, os.O_RDWR | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0), 0o644)
+        try:
+            if not ranged or self.size <= 0:
+                self.fetch_single()
+            else:
+                if not resumed:
+                    preallocate(self.fd, self.size)
+                    self.ranges = split_ranges(self.size, self.segments, self.min_segment_size)
+                    self.save_journal(force=True)
+                # Rehash do prefixo já baixado na execução anterior
+                self.advance_hash()
+                pending = [i for i, (start, end, pos) in enumerate(self.ranges) if pos <= end]
+                if pending:
+                    with ThreadPoolExecutor(max_workers=len(pending)) as pool:
+                        futures = [pool.submit(self.fetch_segment, i) for i in pending]
+                        try:
+                            for future in futures:
+                                future.result()
+                        except BaseException:
+                            self.cancel_event.set()
+                            raise
+                self.advance_hash()
+                if self.hash_pos != self.size:
+                    raise IOError("Hash incompleto: segmentos faltando")
+        except BaseException:
+            if self.ranges and self.size > 0 and ranged:
+                self.save_journal(force=True)
+            raise
+        finally:
+            os.close(self.fd)
+            self.fd = None
+
+        os.replace(self.part_path, self.path)
+        if os.path.exists(self.journal_path):
+            os.unlink(self.journal_path)
+        return {
+            "path": self.path,
+            "size": self.size,
+            "sha256": self.hasher.hexdigest(),
+            "resumed": bool(resumed),
+            "elapsed": time.monotonic() - started,
+        }
+
+    def cancel(self):
+        self.cancel_event.set()
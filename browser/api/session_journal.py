@@ -0,0 +1,161 @@
+import os, sys, json, time, queue, threading
+
+BROWSER_PATH = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+sys.path.append(BROWSER_PATH)
+
+from browser.api.event_log import get_logger, fields
+
+SESSION_FILE = "session.json"
+JOURNAL_FILE = "session.journal"
+# Operações no journal antes de reescrever o snapshot
+COMPACT_EVERY = 500
+FLUSH_INTERVAL = 0.2
+
+log = get_logger("session")
+
+
+def empty_session():
+    return {"tabs": {}, "order": [], "current": None}
+
+
+def apply(session, op):
+    kind = op.get("op")
+    tab_id = op.get("id")
+    if kind == "open":
+        session["tabs"][tab_id] = op["state"]
+        if tab_id not in session["order"]:
+            index = op.get("index", len(session["order"]))
+            session["order"].insert(max(0, min(index, len(session["order"]))), tab_id)
+    elif kind == "update" and tab_id in session["tabs"]:
+        session["tabs"][tab_id] = op["state"]
+    elif kind == "close":
+        session["tabs"].pop(tab_id, None)
+        if tab_id in session["order"]:
+            session["order"].remove(tab_id)
+        if session["current"] == tab_id:
+            session["current"] = None
+    elif kind == "order":
+        known = [i for i in op["ids"] if i in session["tabs"]]
+        session["order"] = known + [i for i in session["order"] if i not in known]
+    elif kind == "select":
+        session["current"] = tab_id
+
+
+# ---------------- SessionJournal ----------------
+# Sessão em <profile>/session.json (snapshot) + session.journal (uma operação JSON
+# por linha, só acrescentada). A GUI só enfileira; uma thread grava em lotes com
+# fsync e de tempos em tempos reescreve o snapshot e zera o journal. Na leitura, o
+# journal é reaplicado sobre o snapshot; uma última linha cortada (queda) é ignorada.
+class SessionJournal:
+    def __init__(self, folder):
+        self.path = os.path.join(folder, SESSION_FILE)
+        self.journal_path = os.path.join(folder, JOURNAL_FILE)
+        self.session = self.read()
+        self.ops = 0
+        self.pending = queue.Queue()
+        self.writer = threading.Thread(target=self.write_loop, name="session-writer", daemon=True)
+        self.writer.start()
+
+    # --- Leitura ---
+    def read(self):
+        session = empty_session()
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+            session.update({k: data[k] for k in session if k in data})
+        except (OSError, ValueError):
+            pass
+        try:
+            with open(self.journal_path, "rb+") as f:
+                valid = 0
+                for line in f:
+                    try:
+                        apply(session, json.loads(line))
+                    except (ValueError, KeyError, TypeError):
+                        break
+                    valid += len(line)
+                # Descarta o resto cortado para as próximas linhas não colarem nele
+                f.truncate(valid)
+        except OSError:
+            pass
+        return session
+
+    def load(self):
+        # [(id, estado)] na ordem das abas, id da aba selecionada
+        session = self.session
+        return [(i, session["tabs"][i]) for i in session["order"] if i in session["tabs"]], session["current"]
+
+    # --- Gravação (thread da GUI) ---
+    def open(self, tab_id, state, index=None):
+        op = {"op": "open", "id": tab_id, "state": state}
+        if index is not None:
+            op["index"] = index
+        self.pending.put(op)
+
+    def update(self, tab_id, state):
+        self.pending.put({"op": "update", "id": tab_id, "state": state})
+
+    def close_tab(self, tab_id):
+        self.pending.put({"op": "close", "id": tab_id})
+
+    def order(self, ids):
+        self.pending.put({"op": "order", "ids": list(ids)})
+
+    def select(self, tab_id):
+        self.pending.put({"op": "select", "id": tab_id})
+
+    # --- Thread de gravação ---
+    def write_loop(self):
+        journal = open(self.journal_path, "a")
+        while True:
+            item = self.pending.get()
+            batch = [item]
+            deadline = time.monotonic() + FLUSH_INTERVAL
+            while item is not None:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    item = self.pending.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                batch.append(item)
+            stop = batch[-1] is None
+            ops = [op for op in batch if op is not None]
+            try:
+                for op in ops:
+                    apply(self.session, op)
+                    journal.write(json.dumps(op, separators=(",", ":")) + "\n")
+                journal.flush()
+                os.fsync(journal.fileno())
+                self.ops += len(ops)
+                if self.ops >= COMPACT_EVERY or stop:
+                    journal.close()
+                    self.compact()
+                    journal = open(self.journal_path, "a")
+            except OSError as e:
+                log.error("erro gravando sessão", extra=fields(error=str(e)))
+            for _ in batch:
+                self.pending.task_done()
+            if stop:
+                break
+        journal.close()
+
+    def compact(self):
+        tmp = self.path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(self.session, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+        # Só zera o journal depois que o snapshot está no disco
+        open(self.journal_path, "w").close()
+        self.ops = 0
+
+    def flush(self):
+        self.pending.join()
+
+    def close(self):
+        if self.writer.is_alive():
+            self.pending.put(None)
+            self.writer.join()
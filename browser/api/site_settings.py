@@ -0,0 +1,140 @@
+import os, sys, json
+
+BROWSER_PATH = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+sys.path.append(BROWSER_PATH)
+
+from browser.api.domains import registrable_domain
+from browser.api.event_log import get_logger, fields
+
+SITE_SETTINGS_FILE = "site_settings.json"
+# Hosts já resolvidos guardados; acima disso o cache recomeça
+RESOLVED_LIMIT = 4096
+NO_OVERRIDES = {}
+
+log = get_logger("sites")
+
+
+def normalize_host(host):
+    return (host or "").strip().rstrip(".").lower()
+
+
+def clean_overrides(values):
+    # Só atributos com valor booleano ("JavascriptEnabled": false)
+    if not isinstance(values, dict):
+        return {}
+    return {str(name): value for name, value in values.items() if isinstance(value, bool)}
+
+
+# ---------------- SiteSettings ----------------
+# Atributos do QWebEngineSettings por site, em <perfil>/site_settings.json:
+#   {"example.com": {"JavascriptEnabled": false, "WebGLEnabled": false},
+#    "docs.example.com": {"JavascriptEnabled": true}}
+# A chave costuma ser o domínio registrável (vale para todos os subdomínios); um
+# subdomínio herda o do domínio e sobrescreve. A tabela já sai mesclada do
+# arquivo, e a resolução host -> overrides fica em cache: navegar custa um lookup.
+class SiteSettings:
+    def __init__(self, path=None, sites=None):
+        self.path = path
+        self.sites = {}
+        for key, values in (sites or {}).items():
+            key, values = normalize_host(key), clean_overrides(values)
+            if key and values:
+                self.sites[key] = values
+        self.compile()
+
+    @classmethod
+    def load(cls, folder):
+        path = os.path.join(folder, SITE_SETTINGS_FILE)
+        sites = {}
+        if os.path.exists(path):
+            try:
+                with open(path, "r") as f:
+                    sites = json.load(f)
+                if not isinstance(sites, dict):
+                    raise ValueError("esperado um objeto")
+            except (OSError, ValueError) as e:
+                log.warning("configurações por site ignoradas", extra=fields(path=path, error=str(e)))
+                sites = {}
+        return cls(path, sites)
+
+    def compile(self):
+        # Tabela final: domínio registrável ou subdomínio -> overrides já mesclados.
+        # Do mais curto para o mais longo, cada entrada herda da mais próxima acima
+        table = {}
+        for key in sorted(self.sites, key=lambda k: k.count(".")):
+            parent = self.parent_entry(table, key)
+            table[key] = (table[parent] if parent is not None else NO_OVERRIDES) | self.sites[key]
+        self.table = table
+        self.subdomains = any(registrable_domain(key) != key for key in table)
+        self.resolved = {}
+
+    def parent_entry(self, table, key):
+        domain = registrable_domain(key)
+        labels = key.split(".")
+        for i in range(1, len(labels)):
+            candidate = ".".join(labels[i:])
+            if candidate in table:
+                return candidate
+            if candidate == domain:
+                break
+        return None
+
+    def resolve(self, host):
+        # Mesmo objeto para hosts com o mesmo resultado: a página compara por identidade
+        if not self.table:
+            return NO_OVERRIDES
+        overrides = self.resolved.get(host)
+        if overrides is not None:
+            return overrides
+        key = normalize_host(host)
+        domain = registrable_domain(key)
+        overrides = NO_OVERRIDES
+        if self.subdomains:
+            labels = key.split(".")
+            for i in range(len(labels)):
+                candidate = ".".join(labels[i:])
+                if candidate in self.table:
+                    overrides = self.table[candidate]
+                    break
+                if candidate == domain:
+                    break
+        else:
+            overrides = self.table.get(domain, NO_OVERRIDES)
+        if len(self.resolved) >= RESOLVED_LIMIT:
+            self.resolved.clear()
+        self.resolved[host] = overrides
+        return overrides
+
+    # --- Edição (API de automação) ---
+    def get(self, key):
+        return dict(self.sites.get(normalize_host(key), {}))
+
+    def set(self, key, values):
+        key = normalize_host(key)
+        merged = self.sites.get(key, {}) | clean_overrides(values)
+        # None remove o atributo do site
+        for name, value in values.items():
+            if value is None:
+                merged.pop(name, None)
+        if merged:
+            self.sites[key] = merged
+        else:
+            self.sites.pop(key, None)
+        self.compile()
+        self.save()
+        return dict(merged)
+
+    def clear(self, key):
+        removed = self.sites.pop(normalize_host(key), None) is not None
+        if removed:
+            self.compile()
+            self.save()
+        return removed
+
+    def save(self):
+        if self.path is None:
+            return
+        tmp = self.path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(self.sites, f, indent=2, sort_keys=True)
+        os.replace(tmp, self.path)
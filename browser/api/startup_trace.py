@@ -0,0 +1,49 @@
+import os, sys, time
+
+BROWSER_PATH = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+sys.path.append(BROWSER_PATH)
+
+from browser.api import trace_events
+
+# PAC22_STARTUP_TRACE=1 registra as fases da inicialização no log (categoria app) na primeira pintura
+TRACE_ENV = "PAC22_STARTUP_TRACE"
+
+# Marcas (nome, perf_counter); a origem é o import deste módulo (topo do app.py)
+ORIGIN = time.perf_counter()
+marks = []
+
+
+def mark(name):
+    marks.append((name, time.perf_counter()))
+    trace_events.instant("startup:" + name)
+
+
+def phases():
+    # [(fase, duração em s)]: cada marca fecha a fase iniciada na anterior
+    result = []
+    previous = ORIGIN
+    for name, stamp in marks:
+        result.append((name, stamp - previous))
+        previous = stamp
+    return result
+
+
+def elapsed(name=None):
+    # Tempo da origem até a marca (ou até a última)
+    for mark_name, stamp in reversed(marks):
+        if name is None or mark_name == name:
+            return stamp - ORIGIN
+    return None
+
+
+def enabled():
+    return os.environ.get(TRACE_ENV, "") not in ("", "0")
+
+
+def phases_ms():
+    # {fase: ms} para os campos do log estruturado, com o total
+    result = {name: round(seconds * 1000, 1) for name, seconds in phases()}
+    total = elapsed()
+    if total is not None:
+        result["total"] = round(total * 1000, 1)
+    return result
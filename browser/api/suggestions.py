@@ -0,0 +1,277 @@
+import os, sys, time, heapq, bisect, sqlite3, threading
+
+BROWSER_PATH = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+sys.path.append(BROWSER_PATH)
+
+from browser.api.history_store import normalize_url, connect
+
+DEFAULT_LIMIT = 10
+# Entradas mais relevantes mantidas em memória, já ordenadas por frecency
+HEAD_SIZE = 20000
+# Quantos candidatos são verificados antes de reordenar pela frecency atual
+SCAN_FACTOR = 3
+# Visitas acumuladas fora do head antes de recarregá-lo (em segundo plano)
+REFRESH_DIRTY = 500
+FTS_LIMIT = 200
+OPEN_TAB_BONUS = 1_000_000
+TITLE_CHARS = 120
+
+SCHEMES = ("https://", "http://")
+
+
+def frecency(visit_count, last_visit, now=None):
+    age = ((now or time.time()) - last_visit) / 86400
+    if age < 4:
+        weight = 100
+    elif age < 14:
+        weight = 70
+    elif age < 31:
+        weight = 50
+    elif age < 90:
+        weight = 30
+    else:
+        weight = 10
+    return max(1, visit_count) * weight
+
+
+def strip_scheme(text):
+    for scheme in SCHEMES:
+        if text.startswith(scheme):
+            return text[len(scheme):]
+    return text
+
+
+def search_text(url, title):
+    # Sem "\n": é o separador do texto do head (HeadIndex)
+    return (strip_scheme(url) + " " + (title or "")[:TITLE_CHARS]).lower().replace("\n", " ")
+
+
+# ---------------- HeadIndex ----------------
+# O head (ordenado por frecency) e o mesmo conteúdo num texto só, separado por
+# "\n": a busca por substring é um str.find em C que pula direto para a próxima
+# ocorrência, em vez de um "in" por item em Python.
+class HeadIndex:
+    def __init__(self, items=()):
+        self.items = list(items)
+        self.counts = {item[4]: item[2] for item in self.items}
+        self.offsets = []
+        position = 0
+        for item in self.items:
+            self.offsets.append(position)
+            position += len(item[0]) + 1
+        self.text = "\n".join(item[0] for item in self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+    def find(self, query, wanted):
+        if not query:
+            return self.items[:wanted]
+        matches = []
+        text, offsets, find = self.text, self.offsets, self.text.find
+        position = find(query)
+        while position != -1 and len(matches) < wanted:
+            index = bisect.bisect_right(offsets, position) - 1
+            matches.append(self.items[index])
+            if index + 1 >= len(offsets):
+                break
+            position = find(query, offsets[index + 1])
+        return matches
+
+
+# ---------------- SuggestionEngine ----------------
+# Duas camadas:
+#   - "head": as HEAD_SIZE entradas de maior frecency em memória, na ordem. Consultas
+#     comuns (curtas, domínios visitados) acham os K melhores nos primeiros itens.
+#   - índice de trigramas FTS5 do HistoryStore para o resto: consultas raras só
+#     tocam as linhas que contêm a substring.
+# O head é montado numa thread (conexão SQLite própria) na abertura e de novo quando
+# "dirty" passa de REFRESH_DIRTY; nenhuma tecla espera por ele. Visitas novas ficam
+# em "dirty" (consultadas por cima do head) até um head montado depois delas. Com
+# callback "deep", a consulta ao FTS também sai da tecla: suggest devolve o head e
+# outra thread entrega a lista completa. Se a consulta nova estende a anterior e o
+# resultado anterior era completo, só filtra.
+class SuggestionEngine:
+    def __init__(self, history_store=None):
+        self.store = history_store
+        self.index = HeadIndex()
+        # chave -> [url, título, visitas, última visita, seq]
+        self.dirty = {}
+        # chave -> seq da remoção
+        self.removed = {}
+        self.open_tabs = []
+        self.lock = threading.Lock()
+        self.loaded = False
+        self.building = False
+        self.seq = 0
+        self.last_query = None
+        self.last_matches = None
+        # Última consulta pendente para o FTS: (texto, consulta, limite, matches do head, callback)
+        self.deep_wanted = None
+        self.deep_event = threading.Event()
+        self.deep_thread = None
+        if history_store is not None:
+            history_store.listeners.append(self.on_history_event)
+
+    # --- Construção ---
+    def build(self, rows=None, conn=None):
+        with self.lock:
+            seq = self.seq
+        if rows is None:
+            # Visitas até seq já gravadas antes de ler
+            self.store.flush()
+            rows = self.store.top(HEAD_SIZE, conn=conn)
+        else:
+            now = time.time()
+            rows = heapq.nlargest(HEAD_SIZE, rows, key=lambda r: frecency(r[2], r[3], now))
+        index = HeadIndex(
+            (search_text(r[0], r[1]), r[0], r[2], r[3], r[4] if len(r) > 4 else normalize_url(r[0]))
+            for r in rows
+        )
+        with self.lock:
+            # Só o que chegou depois da leitura continua por cima do head
+            self.index = index
+            self.dirty = {k: v for k, v in self.dirty.items() if v[4] > seq}
+            self.removed = {k: v for k, v in self.removed.items() if v > seq}
+            self.last_query = self.last_matches = None
+            self.loaded = True
+            self.building = False
+
+    def build_async(self):
+        # Thread própria; a GUI segue usando o head anterior (ou só o FTS) até a troca
+        with self.lock:
+            if self.building or self.store is None:
+                return
+            self.building = True
+
+        def run():
+            conn = connect(self.store.path)
+            try:
+                self.build(conn=conn)
+            except Exception:
+                with self.lock:
+                    self.building = False
+                raise
+            finally:
+                conn.close()
+        threading.Thread(target=run, name="suggestions-build", daemon=True).start()
+
+    def on_history_event(self, kind, key, url, value):
+        with self.lock:
+            self.seq += 1
+            self.last_query = self.last_matches = None
+            if kind == "delete":
+                for k in key:
+                    self.removed[k] = self.seq
+                    self.dirty.pop(k, None)
+                return
+            record = self.dirty.get(key)
+            if record is None:
+                record = self.dirty[key] = [url, "", self.index.counts.get(key, 0), time.time(), self.seq]
+            if kind == "visit":
+                record[0] = url
+                record[2] += 1
+                record[3] = value
+            elif kind == "title":
+                record[1] = value
+            record[4] = self.seq
+            self.removed.pop(key, None)
+            refresh = self.loaded and len(self.dirty) > REFRESH_DIRTY
+        if refresh:
+            self.build_async()
+
+    def set_open_tabs(self, tabs):
+        self.open_tabs = [(url, search_text(url, title)) for url, title in tabs if url]
+
+    # --- Consulta ---
+    def suggest(self, text, limit=DEFAULT_LIMIT, deep=None):
+        # deep(text, sugestões): chamado de outra thread quando o FTS terminar
+        self.deep_wanted = None
+        query = strip_scheme(text.strip().lower()).replace("\n", " ")
+        if not query:
+            return []
+        # "h", "htt", "https:/"... casam com tudo: vale o head na ordem
+        if any(scheme.startswith(query) for scheme in SCHEMES):
+            query = ""
+        if self.store is not None and not self.loaded:
+            self.build_async()
+        now = time.time()
+        wanted = limit * SCAN_FACTOR
+        index = self.index
+
+        narrowing = self.last_matches is not None and self.last_query and self.last_query in query
+        if narrowing:
+            matches = [item for item in self.last_matches if query in item[0]][:wanted]
+        else:
+            matches = index.find(query, wanted)
+        complete = len(matches) < wanted
+
+        # Head não bastou (ou ainda não existe): vai para o índice de trigramas
+        if complete and not narrowing and self.store is not None and (len(index) >= HEAD_SIZE or not self.loaded):
+            if deep is not None and len(query) >= 3:
+                self.request_deep(text, query, limit, matches, deep)
+                complete = False
+            else:
+                matches, complete = self.merge_rows(matches, self.store.match(query, FTS_LIMIT, now))
+
+        self.last_query = query
+        self.last_matches = matches if complete else None
+        return self.rank(query, matches, limit, now)
+
+    def merge_rows(self, matches, rows):
+        # (matches + linhas do FTS sem repetir, resultado completo?)
+        if rows is None:
+            return matches, False
+        matches = list(matches)
+        seen = {m[4] for m in matches}
+        for url, title, visit_count, last_visit, key in rows:
+            if key not in seen:
+                matches.append((search_text(url, title), url, visit_count, last_visit, key))
+        return matches, len(rows) < FTS_LIMIT
+
+    def rank(self, query, matches, limit, now):
+        dirty, removed = self.dirty, self.removed
+        scored = {}
+        for text_, url, visit_count, last_visit, key in matches:
+            if key in dirty or key in removed:
+                continue
+            scored[url] = frecency(visit_count, last_visit, now)
+        for key, (url, title, visit_count, last_visit, seq) in list(dirty.items()):
+            if query in search_text(url, title):
+                scored[url] = frecency(visit_count, last_visit, now)
+        for url, tab_text in self.open_tabs:
+            if query in tab_text:
+                scored[url] = scored.get(url, 0) + OPEN_TAB_BONUS
+        return heapq.nlargest(limit, scored, key=scored.get)
+
+    # --- FTS fora da thread da GUI ---
+    def request_deep(self, text, query, limit, matches, callback):
+        # Só a consulta mais recente interessa: uma nova substitui a pendente
+        with self.lock:
+            self.deep_wanted = (text, query, limit, matches, callback)
+        if self.deep_thread is None:
+            self.deep_thread = threading.Thread(target=self.deep_loop, name="suggestions-fts", daemon=True)
+            self.deep_thread.start()
+        self.deep_event.set()
+
+    def deep_loop(self):
+        conn = connect(self.store.path)
+        while True:
+            self.deep_event.wait()
+            self.deep_event.clear()
+            with self.lock:
+                request, self.deep_wanted = self.deep_wanted, None
+            if request is None:
+                continue
+            text, query, limit, matches, callback = request
+            now = time.time()
+            try:
+                rows = self.store.match(query, FTS_LIMIT, now, conn=conn)
+                if self.deep_wanted is not None:
+                    # Já digitaram mais: a resposta desta consulta não serve
+                    continue
+                matches, complete = self.merge_rows(matches, rows)
+                callback(text, self.rank(query, matches, limit, now))
+            except (sqlite3.Error, RuntimeError):
+                # Banco ocupado, ou a aba que pediu já foi fechada
+                continue
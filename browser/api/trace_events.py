@@ -0,0 +1,169 @@
+import os, sys, json, time, atexit, tempfile, threading, itertools
+from contextlib import nullcontext
+from functools import wraps
+
+BROWSER_PATH = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+sys.path.append(BROWSER_PATH)
+
+# ---------------- Trace de eventos (Chrome/Perfetto) ----------------
+# PAC22_TRACE=1 (ou um caminho .json) liga o trace dos callbacks Python quentes.
+# Spans, contadores e marcas vão para um buffer circular pré-alocado; na saída do
+# processo vira um JSON no formato Trace Event, que abre no ui.perfetto.dev ou em
+# chrome://tracing. Desligado, @traced devolve a própria função e span() um
+# contexto vazio: nada é medido nem guardado.
+#
+#   PAC22_TRACE=/tmp/pac22.json python3 app.py
+TRACE_ENV = "PAC22_TRACE"
+TRACE_SIZE_ENV = "PAC22_TRACE_SIZE"
+DEFAULT_RING_SIZE = 65536
+
+
+def output_path(value):
+    if value in ("", "0"):
+        return None
+    if value == "1":
+        return os.path.join(tempfile.gettempdir(), f"pac22-trace-{os.getpid()}.json")
+    return os.path.expanduser(value)
+
+
+OUTPUT = output_path(os.environ.get(TRACE_ENV, ""))
+ENABLED = OUTPUT is not None
+NULL_SPAN = nullcontext()
+
+
+def now_us():
+    return time.perf_counter_ns() / 1000
+
+
+# ---------------- TraceRing ----------------
+# Sem lock: next() do itertools.count e a atribuição num slot da lista são
+# atômicos no CPython, então qualquer thread grava direto. Cheio, sobrescreve os
+# eventos mais antigos.
+class TraceRing:
+    def __init__(self, size=DEFAULT_RING_SIZE):
+        self.size = size
+        self.events = [None] * size
+        self.counter = itertools.count()
+
+    def push(self, event):
+        self.events[next(self.counter) % self.size] = event
+
+    def snapshot(self):
+        events = [e for e in list(self.events) if e is not None]
+        events.sort(key=lambda e: e[2])
+        return events
+
+    def dropped(self):
+        # Quantos eventos já foram sobrescritos (só no dump: consome um índice)
+        total = next(self.counter)
+        return max(0, total - self.size)
+
+
+ring = TraceRing(int(os.environ.get(TRACE_SIZE_ENV, DEFAULT_RING_SIZE))) if ENABLED else None
+
+
+# Evento: (ph, nome, ts µs, dur µs, tid, args)
+class Span:
+    __slots__ = ("name", "args", "start")
+
+    def __init__(self, name, args):
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        self.start = now_us()
+        return self
+
+    def __exit__(self, *exc):
+        end = now_us()
+        ring.push(("X", self.name, self.start, end - self.start, threading.get_ident(), self.args))
+        return False
+
+
+def span(name, **args):
+    if not ENABLED:
+        return NULL_SPAN
+    return Span(name, args or None)
+
+
+def traced(name=None):
+    # Decorador de funções/métodos: span com o __qualname__ (ou o nome dado)
+    def decorate(func):
+        if not ENABLED:
+            return func
+        label = name or func.__qualname__
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            start = now_us()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                ring.push(("X", label, start, now_us() - start, threading.get_ident(), None))
+        return wrapper
+    return decorate
+
+
+def begin(name, **args):
+    # Begin/end explícitos (mesma thread, aninhados)
+    if ENABLED:
+        ring.push(("B", name, now_us(), 0, threading.get_ident(), args or None))
+
+
+def end(name):
+    if ENABLED:
+        ring.push(("E", name, now_us(), 0, threading.get_ident(), None))
+
+
+def counter(name, **values):
+    if ENABLED:
+        ring.push(("C", name, now_us(), 0, threading.get_ident(), values))
+
+
+def instant(name, **args):
+    if ENABLED:
+        ring.push(("i", name, now_us(), 0, threading.get_ident(), args or None))
+
+
+def trace_json():
+    pid = os.getpid()
+    names = {t.ident: t.name for t in threading.enumerate()}
+    events = []
+    tids = set()
+    for ph, name, ts, dur, tid, args in ring.snapshot():
+        event = {"name": name, "ph": ph, "ts": ts, "pid": pid, "tid": tid}
+        if ph == "X":
+            event["dur"] = dur
+        elif ph == "i":
+            event["s"] = "t"
+        if args:
+            event["args"] = args
+        events.append(event)
+        tids.add(tid)
+    for tid in tids:
+        if tid in names:
+            events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": names[tid]}})
+    return {"traceEvents": events, "displayTimeUnit": "ms", "otherData": {"dropped": ring.dropped()}}
+
+
+def dump(path=None):
+    if not ENABLED:
+        return None
+    path = path or OUTPUT
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(trace_json(), f)
+    os.replace(tmp, path)
+    return path
+
+
+def dump_at_exit():
+    try:
+        path = dump()
+        print(f"Trace salvo em {path}", file=sys.stderr)
+    except OSError as e:
+        print(f"Erro ao salvar trace: {e}", file=sys.stderr)
+
+
+if ENABLED:
+    atexit.register(dump_at_exit)
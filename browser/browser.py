@@ -1,21 +1,42 @@
 #!/usr/bin/env python3
-import tldextract, sys, json, os, pathlib, requests
+import sys, json, os, time, uuid, pathlib
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QVBoxLayout, QHBoxLayout, QWidget,
     QLineEdit, QTabWidget, QListWidget, QPushButton, QTabBar, QStyle, QProxyStyle,
-    QLabel, QGroupBox, QRadioButton, QButtonGroup, QScrollArea
+    QLabel, QGroupBox, QRadioButton, QButtonGroup, QScrollArea, QFileDialog, QCheckBox
 )
 from PySide6.QtGui import QAction, QKeySequence, QShortcut
-from PySide6.QtCore import Qt, QEvent, QUrl, QTimer
+from PySide6.QtCore import Qt, QEvent, QUrl, QTimer, Signal
 from PySide6.QtWebEngineWidgets import QWebEngineView
-from browser.panel_myass import PanelMyass
+from PySide6.QtWebEngineCore import QWebEnginePage
+from browser.panel_downloads import PanelDownloads, format_size
+from browser.panel_navigation import PanelNavigation
+from browser.panel_invidious import PanelInvidious
+from browser.ui.download_manager import DownloadManager
+from browser.ui.memory_governor import MemoryGovernor
+from browser.ui.idle_scheduler import IdleScheduler
+from browser.ui.load_scheduler import LoadScheduler
+from browser.ui.lazy_panel import LazyPanel
+from browser.ui.cache_warmer import CacheWarmer
+from browser.ui.page_timing import PageTimingCollector
+from browser.ui.rpc_server import RpcServer
+from browser.ui.session_manager import SessionManager, capture_history, restore_history
 from browser.ui.custom_web_engine_page import CustomWebEnginePage
 from browser.ui.private_profile import PrivateProfile
+from browser.api import startup_trace
+from browser.api.trace_events import traced
+from browser.api.event_log import EventLog, get_logger, fields
+from browser.api.history_store import HistoryStore
+from browser.api.suggestions import SuggestionEngine
+from browser.api.domains import registrable_domain
+from browser.api.page_loads import FOREGROUND, BACKGROUND, normalize_url, read_url_file, launch_targets
 
 #Mozilla/5.0 (Macintosh; Intel Mac OS X 14_6) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.0.6 Safari/605.1.15
 
-HISTORY_FILE = "history.json"
 DEFAULT_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:131.0) Gecko/20100101 (KHTML, like Gecko) Firefox/131.0 Windows 10"
+SUGGEST_DELAY_MS = 30
+
+log = get_logger("app")
 
 BROWSER_PATH = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
 if BROWSER_PATH is None:
@@ -32,12 +53,23 @@ class NoFocusProxyStyle(QProxyStyle):
 
 # ---------------- BrowserTab ----------------
 class BrowserTab(QWidget):
-    def __init__(self, browser, url=None):
+    # Sugestões completas (FTS) vindas da thread do SuggestionEngine
+    deep_suggestions = Signal(str, object)
+
+    def __init__(self, browser, url=None, state=None, session_id=None):
         super().__init__()
         self.browser = browser
         self.user_agent = browser.user_agent
         self.profile = browser.profile
         self.user_typing = False
+        self.session_id = session_id or uuid.uuid4().hex
+        # Aba restaurada da sessão: o QWebEngineView só nasce quando ela é selecionada
+        self.pending_state = state
+        self.web_view = None
+        self.loading = False
+        self.last_active = time.monotonic()
+        self.discarded = False
+        self.saved_state = None
 
         self.layout = QVBoxLayout()
         self.layout.setContentsMargins(0, 0, 0, 0)
@@ -57,6 +89,17 @@ class BrowserTab(QWidget):
             """)
             btn.setCursor(Qt.PointingHandCursor)
 
+        # Economia de dados: pedidos bloqueados nesta página; clique carrega tudo
+        self.saver_button = QPushButton()
+        self.saver_button.setFixedHeight(24)
+        self.saver_button.setStyleSheet("""
+            color: #e0b050; 
+            margin-top: -3px;
+            outline: none;
+        """)
+        self.saver_button.setCursor(Qt.PointingHandCursor)
+        self.saver_button.hide()
+
         # Barra de URL
         self.url_bar = QLineEdit()
         self.url_bar.setFixedHeight(24)
@@ -83,7 +126,7 @@ class BrowserTab(QWidget):
         # Layout horizontal só pros botões, à direita
         btn_layout = QHBoxLayout()
         btn_layout.setSpacing(2)
-        for btn in [self.back_button, self.forward_button, self.reload_button]:
+        for btn in [self.saver_button, self.back_button, self.forward_button, self.reload_button]:
             btn_layout.addWidget(btn)
 
         btn_widget = QWidget()
@@ -111,154 +154,133 @@ class BrowserTab(QWidget):
         self.history_list.itemClicked.connect(self.select_history_item)
         self.history_list.itemActivated.connect(self.select_history_item)
 
-        # WebView
-        self.web_view = QWebEngineView()
-        self.web_view.setPage(CustomWebEnginePage(self.profile, self))
-        self.web_view.page().profile().setHttpUserAgent(self.user_agent)
+        # Sugestões só depois de uma pausa curta na digitação
+        self.suggest_timer = QTimer(self)
+        self.suggest_timer.setSingleShot(True)
+        self.suggest_timer.setInterval(SUGGEST_DELAY_MS)
+        self.suggest_timer.timeout.connect(self.show_suggestions)
+        self.deep_suggestions.connect(self.show_deep_suggestions)
 
-        # Scrollbar dark
-        self.web_view.loadFinished.connect(self.apply_custom_scrollbar)
-        self.web_view.page().urlChanged.connect(self.update_url_bar)
-        self.web_view.titleChanged.connect(self.update_tab_title)
-        self.web_view.urlChanged.connect(self.update_tab_title)
-
-        self.layout.addWidget(self.web_view, 1)
         self.setLayout(self.layout)
 
-        # --- Conectar botões ---
-        self.back_button.clicked.connect(self.web_view.back)
-        self.forward_button.clicked.connect(self.web_view.forward)
-        self.reload_button.clicked.connect(self.web_view.reload)
-
         # Eventos globais
         self.url_bar.installEventFilter(self)
-        self.web_view.installEventFilter(self)
         self.installEventFilter(self)
 
+        if state is not None:
+            self.url_bar.setText(state.get("url", ""))
+            self.url_bar.setCursorPosition(0)
+            return
+        self.create_view()
         if url:
             self.url_bar.setText(url)
             self.load_url()
 
-    # --- Funções auxiliares ---
-    def apply_custom_scrollbar(self, ok):
-        if not ok: return
-        js = """
-        (function(){
-            if (document.getElementById('qt-custom-scrollbar')) return;
-            var style = document.createElement('style');
-            style.id = 'qt-custom-scrollbar';
-            style.innerHTML = `
-                body { background-color: #1e1e1e !important; color: #e0e0e0 !important; }
-                *::-webkit-scrollbar { width: 6px !important; height: 6px !important; }
-                *::-webkit-scrollbar-track { background: #2e2e2e !important; border-radius: 3px !important; }
-                *::-webkit-scrollbar-thumb { background: #555 !important; border-radius: 3px !important; }
-                *::-webkit-scrollbar-thumb:hover { background: #888 !important; }
-            `;
-            (document.head || document.documentElement).appendChild(style);
-        })();
-        """
-        self.web_view.page().runJavaScript(js)
+    def create_view(self):
+        # WebView
+        self.web_view = QWebEngineView()
+        self.web_view.setPage(CustomWebEnginePage(self.profile, self))
+        self.web_view.page().profile().setHttpUserAgent(self.user_agent)
 
-    def eventFilter(self, obj, event):
-        if event.type() == QEvent.MouseButtonPress:
-            if self.history_list.isVisible() and obj not in [self.url_bar, self.history_list]:
-                self.history_list.hide()
-        return super().eventFilter(obj, event)
+        # Downloads em segundo plano cedem banda enquanto a aba carrega
+        self.web_view.loadStarted.connect(lambda: self.set_loading(True))
+        self.web_view.loadFinished.connect(lambda ok: self.set_loading(False))
+        self.web_view.page().urlChanged.connect(self.update_url_bar)
+        self.web_view.titleChanged.connect(self.update_tab_title)
+        self.web_view.urlChanged.connect(self.update_tab_title)
 
-    def on_text_changed(self, text):
-        if self.user_typing:
-            self.show_suggestions()
-        else:
-            self.history_list.hide()
+        # Histórico: visita registrada quando a página termina de carregar
+        self.web_view.loadFinished.connect(self.record_visit)
+        self.web_view.titleChanged.connect(self.record_title)
 
-    def handle_keypress(self, event):
-        self.user_typing = True
-        if event.key() == Qt.Key_Down and self.history_list.isVisible():
-            self.history_list.setFocus()
-            self.history_list.setCurrentRow(0)
-        else:
-            QLineEdit.keyPressEvent(self.url_bar, event)
+        # Hibernação (MemoryGovernor): estado salvo para restaurar ao ativar a aba
+        self.web_view.loadFinished.connect(self.finish_restore)
 
-    def on_url_focus_in(self, event):
-        QLineEdit.focusInEvent(self.url_bar, event)
+        # Tempo de carregamento por navegação (seção "metrics" do config.json)
+        self.browser.page_timing.watch(self.web_view.page())
 
-    def on_url_focus_out(self, event):
-        self.user_typing = False
-        self.history_list.hide()
-        QLineEdit.focusOutEvent(self.url_bar, event)
+        # Contador da economia de dados (seção "data_saver")
+        data_saver = self.web_view.page().data_saver
+        if data_saver is not None:
+            data_saver.changed.connect(self.update_data_saver)
+            self.saver_button.clicked.connect(self.web_view.page().load_all)
 
-    def load_url(self):
-        url = self.url_bar.text().strip()
-        if not url: return
-        if not url.startswith("http"): url = "https://" + url
-        self.web_view.setUrl(QUrl(url))
-        self.web_view.setFocus()
-        self.history_list.hide()
-        if url not in self.browser.history:
-            self.browser.history.append(url)
-            self.browser.save()
-
-    def handle_enter_press(self):
-        self.load_url()
-        self.history_list.hide()
+        self.layout.addWidget(self.web_view, 1)
 
-    def update_url_bar(self, url):
-        if not isinstance(url, str): url = url.toString()
-        self.url_bar.setText(url)
-        self.url_bar.setCursorPosition(0)
+        # --- Conectar botões ---
+        self.back_button.clicked.connect(self.web_view.back)
+        self.forward_button.clicked.connect(self.web_view.forward)
+        self.reload_button.clicked.connect(self.web_view.reload)
 
-    def reposition_history_list(self):
-        if self.history_list.isVisible():
-            pos = self.url_bar.mapToParent(self.url_bar.rect().bottomLeft())
-            self.history_list.move(pos)
-            self.history_list.setFixedWidth(self.url_bar.width())
-            self.history_list.raise_()
+        self.web_view.installEventFilter(self)
+        self.browser.session.attach(self)
 
-    def show_suggestions(self):
-        text = self.url_bar.text().strip().lower()
-        if text:
-            suggestions = [url for url in self.browser.history if text in url.lower()]
-            if suggestions:
-                self.history_list.clear()
-                self.history_list.addItems(suggestions)
-                self.history_list.setFixedHeight(min(len(suggestions) * 20, 200))
-                self.reposition_history_list()
-                self.history_list.show()
-                return
-        self.history_list.hide()
+    def materialize(self):
+        # Primeira seleção de uma aba restaurada: cria a view e recupera o histórico
+        if self.web_view is not None:
+            return
+        state, self.pending_state = self.pending_state, None
+        self.create_view()
+        if not restore_history(self.web_view.page(), state) and state.get("url"):
+            self.web_view.setUrl(QUrl(state["url"]))
+
+    def session_state(self):
+        if self.web_view is None:
+            return self.pending_state
+        if self.web_view.page().history().count() == 0:
+            # Ainda na fila do LoadScheduler: só a URL pedida
+            return {"url": self.url_bar.text(), "title": ""}
+        return capture_history(self.web_view.page())
 
-    def select_history_item(self, item):
-        self.url_bar.setText(item.text())
-        self.load_url()
+    # --- Funções auxiliares ---
+    def record_visit(self, ok):
+        if ok and self.saved_state is None:
+            self.browser.history_store.add_visit(self.web_view.url().toString())
 
-    def update_tab_title(self, *args):
-        url = self.web_view.url().toString()
-        if url:
-            ext = tldextract.extract(url)
-            domain = ext.domain + "." + ext.suffix if ext.domain else url
-            index = self.browser.tabs.indexOf(self)
-            if index != -1 and index < self.browser.tabs.count() - 1:
-                self.browser.tabs.setTabText(index, domain)
+    def record_title(self, title):
+        self.browser.history_store.set_title(self.web_view.url().toString(), title)
 
-    # --- Funções ---
-    def apply_custom_scrollbar(self, ok):
-        if not ok: return
-        js = """
-        (function(){
-            if (document.getElementById('qt-custom-scrollbar')) return;
-            var style = document.createElement('style');
-            style.id = 'qt-custom-scrollbar';
-            style.innerHTML = `
-                body { background-color: #1e1e1e !important; color: #e0e0e0 !important; }
-                *::-webkit-scrollbar { width: 6px !important; height: 6px !important; }
-                *::-webkit-scrollbar-track { background: #2e2e2e !important; border-radius: 3px !important; }
-                *::-webkit-scrollbar-thumb { background: #555 !important; border-radius: 3px !important; }
-                *::-webkit-scrollbar-thumb:hover { background: #888 !important; }
-            `;
-            (document.head || document.documentElement).appendChild(style);
-        })();
-        """
-        self.web_view.page().runJavaScript(js)
+    def update_data_saver(self):
+        summary = self.web_view.page().data_saver.saver.summary()
+        if not summary["blocked"] or summary["allow_all"]:
+            self.saver_button.hide()
+            return
+        kinds = ", ".join(f"{kind}: {count}" for kind, count in summary["kinds"].items() if count)
+        self.saver_button.setText(f"⊘ {summary['blocked']}")
+        self.saver_button.setToolTip(f"Economia de dados: {summary['blocked']} pedidos bloqueados ({kinds}), "
+                                     f"~{format_size(summary['avoided'])} evitados.\nClique para carregar tudo nesta página.")
+        self.saver_button.show()
+
+    def set_loading(self, loading):
+        self.loading = loading
+        self.browser.update_foreground_load()
+
+    def discard(self):
+        page = self.web_view.page()
+        self.saved_state = {"url": page.url().toString(), "title": page.title(), "scroll": page.scrollPosition()}
+        page.setLifecycleState(QWebEnginePage.LifecycleState.Discarded)
+        self.discarded = True
+        index = self.browser.tabs.indexOf(self)
+        if index != -1:
+            self.browser.tabs.setTabToolTip(index, f"{self.saved_state['title']} (hibernada)")
+
+    def restore(self):
+        # Active recarrega a página; o scroll volta no loadFinished
+        if not self.discarded:
+            return
+        self.discarded = False
+        self.web_view.page().setLifecycleState(QWebEnginePage.LifecycleState.Active)
+        index = self.browser.tabs.indexOf(self)
+        if index != -1:
+            self.browser.tabs.setTabToolTip(index, self.saved_state["title"])
+
+    def finish_restore(self, ok):
+        if self.saved_state is None or self.discarded:
+            return
+        scroll = self.saved_state["scroll"]
+        self.saved_state = None
+        if ok and (scroll.x() or scroll.y()):
+            self.web_view.page().runJavaScript(f"window.scrollTo({scroll.x()}, {scroll.y()});")
 
     def eventFilter(self, obj, event):
         if event.type() == QEvent.MouseButtonPress:
@@ -268,8 +290,9 @@ class BrowserTab(QWidget):
 
     def on_text_changed(self, text):
         if self.user_typing:
-            self.show_suggestions()
+            self.suggest_timer.start()
         else:
+            self.suggest_timer.stop()
             self.history_list.hide()
 
     def handle_keypress(self, event):
@@ -292,12 +315,10 @@ class BrowserTab(QWidget):
         url = self.url_bar.text().strip()
         if not url: return
         if not url.startswith("http"): url = "https://" + url
+        self.browser.loads.cancel(self)
         self.web_view.setUrl(QUrl(url))
         self.web_view.setFocus()
         self.history_list.hide()
-        if url not in self.browser.history:
-            self.browser.history.append(url)
-            self.browser.save()
 
     def handle_enter_press(self):
         self.load_url()
@@ -315,28 +336,39 @@ class BrowserTab(QWidget):
             self.history_list.setFixedWidth(self.url_bar.width())
             self.history_list.raise_()
 
+    @traced()
     def show_suggestions(self):
         text = self.url_bar.text().strip().lower()
         if text:
-            suggestions = [url for url in self.browser.history if text in url.lower()]
+            self.browser.suggestions.set_open_tabs(self.browser.open_tabs())
+            # Head na hora; se faltar, o FTS responde depois por deep_suggestions
+            suggestions = self.browser.suggestions.suggest(text, deep=self.deep_suggestions.emit)
             if suggestions:
-                self.history_list.clear()
-                self.history_list.addItems(suggestions)
-                self.history_list.setFixedHeight(min(len(suggestions) * 20, 200))
-                self.reposition_history_list()
-                self.history_list.show()
+                self.fill_suggestions(suggestions)
                 return
         self.history_list.hide()
 
+    def show_deep_suggestions(self, text, suggestions):
+        # Resposta atrasada: só vale se o texto ainda é o mesmo
+        if suggestions and self.user_typing and text == self.url_bar.text().strip().lower():
+            self.fill_suggestions(suggestions)
+
+    def fill_suggestions(self, suggestions):
+        self.history_list.clear()
+        self.history_list.addItems(suggestions)
+        self.history_list.setFixedHeight(min(len(suggestions) * 20, 200))
+        self.reposition_history_list()
+        self.history_list.show()
+
     def select_history_item(self, item):
         self.url_bar.setText(item.text())
         self.load_url()
 
+    @traced()
     def update_tab_title(self, *args):
         url = self.web_view.url().toString()
         if url:
-            ext = tldextract.extract(url)
-            domain = ext.domain + "." + ext.suffix if ext.domain else url
+            domain = registrable_domain(self.web_view.url().host()) or url
             index = self.browser.tabs.indexOf(self)
             if index != -1 and index < self.browser.tabs.count() - 1:
                 self.browser.tabs.setTabText(index, domain)
@@ -388,6 +420,37 @@ class SettingsTab(QWidget):
         self.browser_buttons.buttons()[0].setChecked(True)
         layout.addWidget(group_browser)
 
+        group_resources = QGroupBox()
+        resources_layout = QVBoxLayout()
+        group_resources.setLayout(resources_layout)
+        resources_layout.addWidget(QLabel("<b>Recursos:</b>"))
+        self.resources_label = QLabel("Abas congeladas: 0")
+        resources_layout.addWidget(self.resources_label)
+        layout.addWidget(group_resources)
+
+        group_scripts = QGroupBox()
+        scripts_layout = QVBoxLayout()
+        group_scripts.setLayout(scripts_layout)
+        scripts_layout.addWidget(QLabel("<b>Scripts:</b>"))
+        scripts = self.browser.profile.user_scripts
+        for name in scripts.names():
+            check = QCheckBox(name)
+            check.setChecked(scripts.is_enabled(name))
+            check.toggled.connect(lambda on, n=name: scripts.set_enabled(n, on))
+            scripts_layout.addWidget(check)
+        layout.addWidget(group_scripts)
+
+        group_data_saver = QGroupBox()
+        data_saver_layout = QVBoxLayout()
+        group_data_saver.setLayout(data_saver_layout)
+        data_saver_layout.addWidget(QLabel("<b>Economia de dados:</b>"))
+        data_saver = self.browser.profile.data_saver
+        check = QCheckBox("Bloquear imagens, mídia, fontes e iframes pesados")
+        check.setChecked(data_saver["enabled"])
+        check.toggled.connect(lambda on: data_saver.update(enabled=on))
+        data_saver_layout.addWidget(check)
+        layout.addWidget(group_data_saver)
+
         layout.addStretch()
         main_layout = QVBoxLayout(self)
         main_layout.addWidget(scroll)
@@ -396,6 +459,17 @@ class SettingsTab(QWidget):
             for btn in btn_group.buttons():
                 btn.toggled.connect(self.update_user_agent)
 
+    def update_resources(self, report):
+        text = f"Abas congeladas: {report['frozen']}  |  CPU economizada: {report['cpu_saved']:.1f} s"
+        memory = getattr(self.browser, "memory", None)
+        if memory is not None and memory.budget:
+            text += f"  |  Renderers: {memory.last_total / 1024 ** 2:.0f} MB de {memory.budget / 1024 ** 2:.0f} MB"
+        proxy = getattr(self.browser, "proxy", None)
+        if proxy is not None:
+            stats = proxy.stats()
+            text += f"  |  Proxy: {stats['hits']} hits, {stats['misses']} misses, {stats['bytes_saved'] / 1024 ** 2:.0f} MB economizados"
+        self.resources_label.setText(text)
+
     def update_user_agent(self):
         pc = next((b.text() for b in self.pc_buttons.buttons() if b.isChecked()), "")
         browser = next((b.text() for b in self.browser_buttons.buttons() if b.isChecked()), "")
@@ -403,17 +477,21 @@ class SettingsTab(QWidget):
         self.browser.user_agent = ua
         for i in range(self.browser.tabs.count() - 1):
             tab = self.browser.tabs.widget(i)
-            if hasattr(tab, "web_view"):
+            if getattr(tab, "web_view", None) is not None:
                 tab.web_view.page().profile().setHttpUserAgent(ua)
 
 # ---------------- Browser ----------------
 class Browser(QMainWindow):
-    def __init__(self, path, user_agent=None):
+    def __init__(self, path, user_agent=None, proxy=None):
         super().__init__()
         self.path = path
+        # CachingProxy iniciado pelo app.py (só para mostrar os contadores)
+        self.proxy = proxy
+        # Instância pré-aquecida (app.py --prewarm): fechar a janela só esconde
+        self.keep_warm = False
+        self.spare_page = None
         self.user_agent = user_agent or DEFAULT_USER_AGENT
         self.config = {}
-        self.history = []
 
         config_path = os.path.join(self.path, "config.json")
         if os.path.exists(config_path):
@@ -422,12 +500,20 @@ class Browser(QMainWindow):
         else:
             self.config = {"default": {"url": "https://www.google.com"}}
 
+        # Log estruturado em <path>/logs (seção "logging"), gravado fora da thread da GUI
+        self.event_log = EventLog(self.path, self.config)
+
         self.profile = PrivateProfile(self.path, self.config)
+        self.downloads = DownloadManager(self.profile, self.config, self)
+        startup_trace.mark("profile")
 
-        history_path = os.path.join(self.profile.path, HISTORY_FILE)
-        if os.path.exists(history_path):
-            with open(history_path, "r") as f:
-                self.history = json.load(f)
+        # history.json antigo é migrado para o SQLite na primeira execução
+        self.history_store = HistoryStore(self.profile.path)
+        self.suggestions = SuggestionEngine(self.history_store)
+        # Head das sugestões montado numa thread, antes da primeira tecla
+        self.suggestions.build_async()
+        # Navigation/Paint Timing por origem em <profile>/metrics.sqlite
+        self.page_timing = PageTimingCollector(self.profile, self.config, self)
 
         self.setWindowTitle("Pac22 Browser")
         self.setStyle(NoFocusProxyStyle())
@@ -450,47 +536,20 @@ class Browser(QMainWindow):
         self.tab_principal.setTabPosition(QTabWidget.TabPosition.West)
         self.setCentralWidget(self.tab_principal)
 
-        # Outras abas
+        # Outras abas: construídas na primeira vez que aparecem (LazyPanel)
         self.tab_page_browser = QWidget()
-        self.tab_page_download = QWidget()
-        self.invidious_view = QWebEngineView()
-        self.invidious_loaded = False
-
-        # Botões flutuantes Invidious
-        self.btn_invidious_back = QPushButton("←", self.tab_page_download)
-        self.btn_invidious_reload = QPushButton("⟳", self.tab_page_download)
-        for btn in [self.btn_invidious_back, self.btn_invidious_reload]:
-            btn.setFixedSize(39, 39)
-            btn.setStyleSheet("""
-                background-color: #3a3a3a; 
-                color: #fff; 
-                border: 1px solid #555; 
-                border-radius: 5px;
-            """)
-        self.btn_invidious_back.clicked.connect(lambda: self.invidious_view.back())
-        self.btn_invidious_reload.clicked.connect(lambda: self.invidious_view.reload())
-
-        invidious_layout = QVBoxLayout()
-        invidious_layout.setContentsMargins(0, 0, 0, 0)
-        invidious_layout.setSpacing(0)
-        invidious_layout.addWidget(self.invidious_view)
-        self.tab_page_download.setLayout(invidious_layout)
-
-        self.tab_page_download.resizeEvent = self.update_invidious_buttons_position
-
-        self.tab_page_navigate = QWidget()
-        self.navigation_list = QListWidget()
-        nav_layout = QVBoxLayout()
-        nav_layout.addWidget(self.navigation_list)
-        self.tab_page_navigate.setLayout(nav_layout)
-        self.update_navigation_list()
-
-        self.tab_page_myass = PanelMyass(parent=self)
-        self.tab_page_settings = SettingsTab(self)
+        self.tab_page_download = LazyPanel(lambda: PanelInvidious(self.user_agent, self.profile.user_scripts))
+        # Histórico só é consultado quando a aba aparece
+        self.tab_page_navigate = LazyPanel(lambda: PanelNavigation(self.history_store, open_url=self.open_in_tab))
+        self.tab_page_downloads = LazyPanel(lambda: PanelDownloads(self.downloads))
+        self.tab_page_settings = LazyPanel(lambda: SettingsTab(self))
+        self.tab_page_settings.built.connect(lambda panel: panel.update_resources(self.last_resources) if self.last_resources else None)
+        self.last_resources = None
 
         self.tab_principal.addTab(self.tab_page_browser, "Browser")
         self.tab_principal.addTab(self.tab_page_download, "Invidious")
         self.tab_principal.addTab(self.tab_page_navigate, "Navigation")
+        self.tab_principal.addTab(self.tab_page_downloads, "Downloads")
         self.tab_principal.addTab(self.tab_page_settings, "Settings")
 
         # Abas do navegador interno
@@ -500,6 +559,26 @@ class Browser(QMainWindow):
         self.tabs.setTabPosition(QTabWidget.TabPosition.South)
         self.tabs.tabCloseRequested.connect(self.close_tab)
         self.tabs.currentChanged.connect(self.check_plus_tab)
+        self.tabs.currentChanged.connect(lambda index: self.update_foreground_load())
+
+        # Orçamento "ram" do config.json para os renderers das abas
+        self.memory = MemoryGovernor(self.tabs, self.config, self)
+        # Abas paradas em segundo plano congelam (seção "freeze" do config.json)
+        self.idle = IdleScheduler(self.tabs, self.config, self.downloads, self)
+        self.idle.reported.connect(self.update_resources)
+        # Aba selecionada até agora: ao sair dela, last_active marca o início da espera
+        self.active_tab = None
+        self.tabs.currentChanged.connect(self.activate_tab)
+        # Sessão (abas + histórico voltar/avançar) em <profile>/session.json + journal
+        self.session = SessionManager(self.tabs, self.profile.path, self)
+        # Carregamentos de abas novas com teto de concorrência (seção "loading")
+        self.loads = LoadScheduler(self.tabs, self.config, self)
+        # API de automação local (seção "rpc", desligada por padrão)
+        self.rpc = None
+        if self.config.get("rpc", {}).get("enabled", False):
+            self.rpc = RpcServer(self, parent=self)
+            if not self.rpc.listen():
+                log.warning("API de automação indisponível", extra=fields(error=self.rpc.server.errorString() or "socket em uso por outro navegador"))
 
         layout = QVBoxLayout()
         layout.setContentsMargins(0, 0, 0, 0)
@@ -507,59 +586,136 @@ class Browser(QMainWindow):
         layout.addWidget(self.tabs)
         self.tab_page_browser.setLayout(layout)
 
+        self.restore_session()
         self.add_plus_tab()
-        self.tab_principal.currentChanged.connect(self.lazy_load_tabs)
+        self.activate_tab(self.tabs.currentIndex())
         self.init_shortcuts()
+        QTimer.singleShot(0, self.downloads.restore)
+        # Aquece o cache em disco com as origens mais visitadas quando nada está carregando
+        self.cache_warmer = CacheWarmer(self.profile, self.history_store, self.profile.cache, busy=self.is_loading, parent=self)
+        self.cache_warmer.start()
+        # Primeira pintura da janela fecha o trace de inicialização
+        self.tab_principal.installEventFilter(self)
+        startup_trace.mark("window")
 
     # ---------------- Funções do Browser ----------------
-    def update_navigation_list(self):
-        self.navigation_list.clear()
-        for url in self.history:
-            self.navigation_list.addItem(url)
-
-    def lazy_load_tabs(self, index):
-        widget = self.tab_principal.widget(index)
-        if widget == self.tab_page_download and not self.invidious_loaded:
-            self.invidious_loaded = True
-            self.invidious_view.page().profile().setHttpUserAgent(self.user_agent)
-            self.invidious_view.setUrl(QUrl("https://inv.nadeko.net/feed/popular"))
-            self.invidious_view.loadFinished.connect(self.apply_custom_scrollbar_invidious)
-
-    def apply_custom_scrollbar_invidious(self, ok):
-        if ok:
-            js = """
-            (function(){
-                if (document.getElementById('qt-custom-scrollbar')) return;
-                var style = document.createElement('style');
-                style.id = 'qt-custom-scrollbar';
-                style.innerHTML = `
-                    body { background-color: #1e1e1e !important; color: #e0e0e0 !important; }
-                    *::-webkit-scrollbar { width: 6px !important; height: 6px !important; }
-                    *::-webkit-scrollbar-track { background: #2e2e2e !important; border-radius: 3px !important; }
-                    *::-webkit-scrollbar-thumb { background: #555 !important; border-radius: 3px !important; }
-                    *::-webkit-scrollbar-thumb:hover { background: #888 !important; }
-                `;
-                (document.head || document.documentElement).appendChild(style);
-            })();
-            """
-            self.invidious_view.page().runJavaScript(js)
-
-    def update_invidious_buttons_position(self, event):
-        margin = 10
-        w = self.tab_page_download.width()
-        h = self.tab_page_download.height()
-        self.btn_invidious_back.move(w - 2 * (39 + margin), h - 39 - margin)
-        self.btn_invidious_reload.move(w - (39 + margin), h - 39 - margin)
-        self.btn_invidious_back.raise_()
-        self.btn_invidious_reload.raise_()
-        event.accept()
-
-    def new_tab(self, url=None):
-        tab = BrowserTab(self, url or "https://www.google.com")
+    def update_resources(self, report):
+        self.last_resources = report
+        if self.tab_page_settings.widget is not None:
+            self.tab_page_settings.widget.update_resources(report)
+
+    def open_tabs(self):
+        tabs = []
+        for i in range(self.tabs.count()):
+            tab = self.tabs.widget(i)
+            if isinstance(tab, BrowserTab):
+                if tab.web_view is None:
+                    state = tab.pending_state or {}
+                    tabs.append((state.get("url", ""), state.get("title", "")))
+                else:
+                    tabs.append((tab.web_view.url().toString(), tab.web_view.title()))
+        return tabs
+
+    def restore_session(self):
+        # Abas voltam como placeholders leves; só a selecionada cria a view
+        entries, current = self.session.load()
+        if not entries:
+            return
+        self.session.restoring = True
+        current_index = 0
+        for tab_id, state in entries:
+            tab = BrowserTab(self, state=state, session_id=tab_id)
+            url = state.get("url", "")
+            index = self.tabs.addTab(tab, registrable_domain(QUrl(url).host()) or url or "New Tab")
+            self.tabs.setTabToolTip(index, state.get("title", ""))
+            if tab_id == current:
+                current_index = index
+        self.tabs.setCurrentIndex(current_index)
+        self.session.restoring = False
+
+    def activate_tab(self, index):
+        tab = self.tabs.widget(index)
+        # Congelar/hibernar conta o tempo em segundo plano, não desde a última ativação
+        if self.active_tab is not None and self.active_tab is not tab:
+            self.memory.touch(self.active_tab)
+        self.active_tab = tab
+        if isinstance(tab, BrowserTab) and not self.session.restoring:
+            tab.materialize()
+            self.loads.promote(tab)
+            self.session.selected(tab)
+            self.memory.touch(tab)
+            self.idle.thaw(tab)
+            tab.restore()
+
+    def is_loading(self):
+        if self.loads.queue.running or self.loads.queue.pending():
+            return True
+        return any(getattr(self.tabs.widget(i), "loading", False) for i in range(self.tabs.count()))
+
+    def update_foreground_load(self):
+        tab = self.tabs.currentWidget() if hasattr(self, "tabs") else None
+        self.downloads.scheduler.set_foreground_busy(bool(getattr(tab, "loading", False)))
+
+    def new_tab(self, url=None, background=False):
+        tab = BrowserTab(self)
         index = max(0, self.tabs.count() - 1)
         self.tabs.insertTab(index, tab, "New Tab")
-        self.tabs.setCurrentIndex(index)
-        tab.url_bar.setFocus()
+        self.loads.enqueue(tab, normalize_url(url or "") or "https://www.google.com", BACKGROUND if background else FOREGROUND)
+        self.session.track(tab)
+        if not background:
+            self.tabs.setCurrentIndex(index)
+            tab.url_bar.setFocus()
+        return tab
+
+    def open_urls(self, urls):
+        # Todas entram na fila; a primeira fica visível e carrega antes
+        tabs = [self.new_tab(url, background=True) for url in urls]
+        if tabs:
+            self.tabs.setCurrentWidget(tabs[0])
+            self.tab_principal.setCurrentWidget(self.tab_page_browser)
+
+    def open_urls_from_file(self, path=None):
+        if path is None:
+            path, _ = QFileDialog.getOpenFileName(self, "Abrir URLs", "", "Texto (*.txt);;Todos (*)")
+            if not path:
+                return
+        try:
+            urls = read_url_file(path)
+        except OSError as e:
+            log.warning("erro lendo lista de URLs", extra=fields(path=path, error=str(e)))
+            return
+        self.open_urls(urls)
+
+    def open_launch_args(self, args, cwd=""):
+        urls, lists = launch_targets(args, cwd)
+        if urls:
+            self.open_urls(urls)
+        for path in lists:
+            self.open_urls_from_file(path)
+
+    def handle_remote(self, message):
+        # Mensagem de outra execução do app.py (InstanceServer)
+        self.open_launch_args(message.get("args", []), message.get("cwd", ""))
+        if message.get("show", True):
+            self.present()
+
+    def present(self):
+        if self.isMinimized():
+            self.showNormal()
+        self.show()
+        self.raise_()
+        self.activateWindow()
+
+    def prewarm(self):
+        # Perfil já carregado + um renderer reserva aberto em about:blank
+        self.keep_warm = True
+        if self.spare_page is None:
+            self.spare_page = QWebEnginePage(self.profile, self)
+            self.spare_page.setUrl(QUrl("about:blank"))
+
+    def open_in_tab(self, url):
+        self.new_tab(url)
+        self.tab_principal.setCurrentWidget(self.tab_page_browser)
 
     def add_plus_tab(self):
         self.plus_tab = QWidget()
@@ -575,6 +731,11 @@ class Browser(QMainWindow):
         self.tabs.currentChanged.connect(self.check_plus_tab)
 
     def eventFilter(self, obj, event):
+        if obj is self.tab_principal and event.type() == QEvent.Paint:
+            self.tab_principal.removeEventFilter(self)
+            startup_trace.mark("first_paint")
+            if startup_trace.enabled():
+                log.info("fases da inicialização", extra=fields(**startup_trace.phases_ms()))
         if obj == self.tabs.tabBar():
             if event.type() == QEvent.MouseButtonRelease:
                 index = self.tabs.tabBar().tabAt(event.position().toPoint())
@@ -614,17 +775,38 @@ class Browser(QMainWindow):
         if from_index == plus_index or to_index == plus_index:
             QTimer.singleShot(0, lambda: self.tabs.tabBar().moveTab(self.tabs.indexOf(self.plus_tab), self.tabs.count() - 1))
         QTimer.singleShot(0, self.update_plus_tab_style)
+        self.session.moved()
 
     def check_plus_tab(self, index):
-        if self.tabs.widget(index) == self.plus_tab:
+        if self.tabs.widget(index) is getattr(self, "plus_tab", None):
             self.new_tab()
 
+    @traced()
     def save(self):
-        history_path = os.path.join(self.profile.path, HISTORY_FILE)
-        with open(history_path, "w") as f:
-            json.dump(self.history, f)
+        self.history_store.flush()
+
+    def closeEvent(self, event):
+        if self.keep_warm:
+            self.session.save_dirty()
+            self.page_timing.flush()
+            self.hide()
+            event.ignore()
+            return
+        self.shutdown()
+        super().closeEvent(event)
+
+    def shutdown(self):
+        # Encerramento comum a fechar a janela e Ctrl+Q
+        self.downloads.close()
+        self.session.close()
+        self.history_store.close()
+        self.page_timing.close()
+        if self.rpc is not None:
+            self.rpc.close()
+        self.event_log.close()
 
     def close_application(self):
+        self.shutdown()
         QApplication.quit()
         sys.exit(0)
 
@@ -633,12 +815,19 @@ class Browser(QMainWindow):
             return
         if index == self.tabs.currentIndex():
             self.tabs.setCurrentIndex(index - 1 if index > 0 else 0)
+        tab = self.tabs.widget(index)
         self.tabs.removeTab(index)
+        if isinstance(tab, BrowserTab):
+            self.idle.forget(tab)
+            self.loads.cancel(tab)
+            self.session.untrack(tab)
+            tab.deleteLater()
 
     def init_shortcuts(self):
         shortcuts = [
             ("Ctrl+Q", self.close_application),
             ("Ctrl+T", lambda: self.new_tab()),
+            ("Ctrl+O", lambda: self.open_urls_from_file()),
             ("Ctrl+W", lambda: self.close_tab(self.tabs.currentIndex())),
             ("Ctrl+N", self.showMinimized),
         ]
@@ -656,4 +845,6 @@ if __name__ == "__main__":
     app = QApplication(sys.argv)
     browser = Browser(os.getcwd())
     browser.show()
+    # browser.py lista.txt | URL...: abre pela fila de carregamento
+    browser.open_launch_args(sys.argv[1:], os.getcwd())
     sys.exit(app.exec())
@@ -1,7 +1,6 @@
-import os, sys, json, base64
-from PIL import Image, ImageFilter
+import os, sys, json, base64, threading
 from PySide6 import QtCore
-from PySide6.QtCore import Qt, QTimer, QSize
+from PySide6.QtCore import Qt, QSize, Signal
 from PySide6.QtWidgets import (
     QDialog, QStackedLayout, QWidget, QVBoxLayout,
     QLabel, QLineEdit, QPushButton, QApplication
@@ -10,16 +9,92 @@ from PySide6.QtGui import QPixmap, QMovie, QFont, QImage
 
 BROWSER_PATH = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
 BACKGROUND_IMAGE = os.path.join(BROWSER_PATH, "ilimg", "back.png")
+sys.path.append(BROWSER_PATH)
+
+from browser.api.backdrop import backdrop, load_backdrop, source_hash, BYTES_PER_PIXEL
+from browser.api.trace_events import traced
+from browser.api.event_log import get_logger, fields
+
+log = get_logger("app")
 
 CONFIG_DIR = os.path.expanduser("~/.pac22_user")
 CONFIG_FILE = os.path.join(CONFIG_DIR, "config.json")
-HISTORY_FILE = os.path.join(CONFIG_DIR, "history.json")
 DEFAULT_FOLDER = os.path.join(CONFIG_DIR, "default")
+BACKDROP_DIR = os.path.join(CONFIG_DIR, "backdrop")
 
 DEFAULT_CONFIG = {
     "username": "unknown",
     "ram": "2GB",
     "key": base64.urlsafe_b64encode(os.urandom(32)).decode("utf-8"),
+    "downloads": {
+        "folder": "~/Downloads",
+        "max_concurrent": 3,
+        "segments": 4,
+        "segment_threshold_mb": 32
+    },
+    "bandwidth": {
+        "global_kbps": 0,
+        "per_download_kbps": 0,
+        "default_priority": "normal",
+        "foreground_backoff": 0.2,
+        "foreground_cap_kbps": 512,
+        "priorities": {
+            "interactive": 8,
+            "normal": 4,
+            "bulk": 1
+        }
+    },
+    "freeze": {
+        "enabled": True,
+        "after_seconds": 300,
+        "allow_domains": []
+    },
+    "loading": {
+        "max_concurrent": 4,
+        "timeout_seconds": 30
+    },
+    "scripts": {
+        "dark_scrollbar": True
+    },
+    "cache": {
+        "type": "disk",
+        "max_size": "512MB",
+        "warm_top": 0,
+        "warm_delay_seconds": 15
+    },
+    "metrics": {
+        "enabled": True,
+        "retention_days": 30
+    },
+    "logging": {
+        "level": "INFO",
+        "categories": {"nav": "INFO", "console": "WARNING"},
+        "max_size": 1048576,
+        "backups": 3,
+        "ring_size": 2000,
+        "console_rate": 10,
+        "console_burst": 50
+    },
+    "rpc": {
+        "enabled": False
+    },
+    "data_saver": {
+        "enabled": False,
+        "save_data_header": True,
+        "page_budget": "1MB",
+        "rules": {
+            "image": "budget",
+            "media": "third_party",
+            "font": "third_party",
+            "sub_frame": "third_party"
+        }
+    },
+    "proxy": {
+        "enabled": False,
+        "port": 3129,
+        "folder": "",
+        "max_size": "2GB"
+    },
     "settings": {
         "JavascriptCanAccessClipboard": True,
         "AutoLoadImages": True,
@@ -68,9 +143,6 @@ def init_user_folder():
     if not os.path.exists(CONFIG_FILE):
         with open(CONFIG_FILE, "w") as f:
             json.dump(DEFAULT_CONFIG, f, indent=2)
-    if not os.path.exists(HISTORY_FILE):
-        with open(HISTORY_FILE, "w") as f:
-            json.dump([], f, indent=2)
 
 def load_config():
     with open(CONFIG_FILE, "r") as f:
@@ -80,14 +152,12 @@ def load_config():
         if k not in config:
             config[k] = v
             changed = True
-    if "settings" not in config:
-        config["settings"] = DEFAULT_CONFIG["settings"]
-        changed = True
-    else:
-        for k, v in DEFAULT_CONFIG["settings"].items():
-            if k not in config["settings"]:
-                config["settings"][k] = v
-                changed = True
+        elif isinstance(v, dict) and isinstance(config[k], dict):
+            # Seções ("settings", "downloads", ...) ganham as chaves novas
+            for sk, sv in v.items():
+                if sk not in config[k]:
+                    config[k][sk] = sv
+                    changed = True
     if changed:
         with open(CONFIG_FILE, "w") as f:
             json.dump(config, f, indent=2)
@@ -95,6 +165,11 @@ def load_config():
 
 # -------------------- Form Login --------------------
 class FormLogin(QDialog):
+    # Emitidos pelas threads de trabalho, entregues na thread da interface
+    backdrop_ready = Signal(object, int, int)
+    config_saved = Signal(str)
+    config_failed = Signal(str)
+
     def __init__(self):
         super().__init__()
         self.setFixedSize(800, 450)
@@ -105,6 +180,11 @@ class FormLogin(QDialog):
 
         # Background borrado
         self.background_label = QLabel(self)
+        self.background_size = None
+        self.background_data = None
+        self.backdrop_ready.connect(self.show_background)
+        self.config_saved.connect(self.on_config_saved)
+        self.config_failed.connect(self.on_config_failed)
         self.set_background()
 
         # Stack layout
@@ -137,19 +217,42 @@ class FormLogin(QDialog):
             QLineEdit { border: none; border-bottom: 2px solid #555; background: transparent; color: #fff; padding: 5px; text-align: center; }
         """)
 
+    @traced()
     def set_background(self):
-        img = Image.open(BACKGROUND_IMAGE).convert("RGBA")
-        img = img.resize((self.width(), self.height()), Image.Resampling.LANCZOS)
-        blurred = img.filter(ImageFilter.GaussianBlur(7))
-
-        data = blurred.tobytes("raw", "RGBA")
-        qimg = QImage(data, blurred.width, blurred.height, QImage.Format_RGBA8888)
-        pix = QPixmap.fromImage(qimg)
-
-        self.background_label.setPixmap(pix)
+        # Um fundo por tamanho: do cache em disco (~/.pac22_user/backdrop) ou
+        # renderizado numa thread, sem travar a janela
         self.background_label.setGeometry(self.rect())
         self.background_label.setScaledContents(True)
         self.background_label.lower()
+        size = (self.width(), self.height())
+        if size == self.background_size:
+            return
+        self.background_size = size
+        try:
+            data = load_backdrop(BACKDROP_DIR, source_hash(BACKGROUND_IMAGE), *size)
+        except OSError:
+            return
+        if data is not None:
+            self.show_background(data, *size)
+        else:
+            threading.Thread(target=self.render_background, args=size, daemon=True).start()
+
+    def render_background(self, width, height):
+        data = backdrop(BACKGROUND_IMAGE, width, height, BACKDROP_DIR)
+        try:
+            self.backdrop_ready.emit(data, width, height)
+        except RuntimeError:
+            # Login fechado antes de terminar
+            pass
+
+    def show_background(self, data, width, height):
+        if (width, height) != self.background_size:
+            return
+        # O QImage só aponta para os bytes BGRX (sem cópia nem conversão);
+        # background_data mantém o buffer vivo
+        self.background_data = data
+        qimg = QImage(data, width, height, width * BYTES_PER_PIXEL, QImage.Format_RGB32)
+        self.background_label.setPixmap(QPixmap.fromImage(qimg))
 
     def resizeEvent(self, event):
         super().resizeEvent(event)
@@ -252,23 +355,37 @@ class FormLogin(QDialog):
         if not username:
             return
         self.username = username
+        self.btn_create.setEnabled(False)
         self.stack.setCurrentWidget(self.page_loading)
-        QTimer.singleShot(1200, self.create_user_config)
+        # Config gravada numa thread; a tela de loading fica só o tempo real
+        threading.Thread(target=self.create_user_config, args=(username,)).start()
+
+    def create_user_config(self, username):
+        try:
+            config = load_config()
+            config["username"] = username
+            with open(CONFIG_FILE, "w") as f:
+                json.dump(config, f, indent=2)
+        except (OSError, ValueError) as e:
+            self.config_failed.emit(str(e))
+            return
+        self.config_saved.emit(username)
 
-    def create_user_config(self):
-        config = load_config()
-        config["username"] = self.username
-        with open(CONFIG_FILE, "w") as f:
-            json.dump(config, f, indent=2)
+    def on_config_saved(self, username):
         self.update_start_page()
         self.stack.setCurrentWidget(self.page_start)
 
+    def on_config_failed(self, error):
+        log.error("erro ao salvar config", extra=fields(error=error))
+        self.btn_create.setEnabled(True)
+        self.stack.setCurrentWidget(self.page_create)
+
     def update_start_page(self):
         self.label_user.setText(f"USER: {self.username}")
 
     def start_browser(self):
         self.start_clicked = True
-        print("Abrindo browser agora!")
+        log.info("abrindo browser")
         self.close()
 
     def closeEvent(self, event):
@@ -0,0 +1,139 @@
+import sys, os
+
+BROWSER_PATH = os.path.dirname(os.path.realpath(__file__))
+sys.path.append( BROWSER_PATH );
+
+from PySide6.QtWidgets import QVBoxLayout, QHBoxLayout, QWidget, QPushButton, QTableWidgetItem, QLabel
+from PySide6.QtGui import QDesktopServices
+from PySide6.QtCore import QUrl, QTimer
+
+from browser.ui.table import *
+
+STATE_LABELS = {
+    "queued": "Na fila",
+    "active": "Baixando",
+    "paused": "Pausado",
+    "completed": "Concluído",
+    "failed": "Falhou",
+    "cancelled": "Cancelado",
+}
+
+PRIORITY_CYCLE = ["interactive", "normal", "bulk"]
+RATES_INTERVAL_MS = 1000
+
+
+def format_size(size):
+    if size < 1024:
+        return f"{size} B"
+    for unit in ["KB", "MB", "GB"]:
+        size /= 1024
+        if size < 1024 or unit == "GB":
+            return f"{size:.1f} {unit}"
+
+
+def format_progress(entry):
+    received, total = entry.get("received", 0), entry.get("total", 0)
+    if total > 0:
+        return f"{received * 100 // total}%  {format_size(received)} / {format_size(total)}"
+    return format_size(received)
+
+
+# ---------------- PanelDownloads ----------------
+class PanelDownloads(QWidget):
+    def __init__(self, manager, parent=None):
+        super().__init__(parent)
+        self.manager = manager
+        self.rows = {}
+
+        self.table = Table.widget_tabela(self, ["arquivo", "status", "progresso", "prioridade", "taxa"])
+        self.rate_label = QLabel()
+        layout = QVBoxLayout()
+        layout.addWidget(self.table)
+        layout.addWidget(self.rate_label)
+
+        buttons = QHBoxLayout()
+        for text, func in [
+            ("Pausar", lambda: self.manager.pause(self.selected_id())),
+            ("Retomar", lambda: self.manager.resume(self.selected_id())),
+            ("Cancelar", lambda: self.manager.cancel(self.selected_id())),
+            ("Prioridade", self.cycle_priority),
+            ("Abrir pasta", self.open_folder),
+            ("Limpar concluídos", self.clear_finished),
+        ]:
+            btn = QPushButton(text)
+            btn.clicked.connect(func)
+            buttons.addWidget(btn)
+        layout.addLayout(buttons)
+        self.setLayout(layout)
+
+        for entry in self.manager.entries():
+            self.add_entry(entry)
+        self.manager.added.connect(self.add_entry)
+        self.manager.changed.connect(self.update_entry)
+
+        # Taxas ao vivo do escalonador de banda
+        self.rates_timer = QTimer(self)
+        self.rates_timer.setInterval(RATES_INTERVAL_MS)
+        self.rates_timer.timeout.connect(self.update_rates)
+        self.rates_timer.start()
+
+    def add_entry(self, entry):
+        if entry["id"] in self.rows:
+            return
+        self.rows[entry["id"]] = self.table.total_linhas
+        self.table.add([
+            os.path.basename(entry["path"]),
+            STATE_LABELS.get(entry["state"], entry["state"]),
+            format_progress(entry),
+            entry.get("priority", self.manager.default_priority),
+            "",
+        ], entry)
+
+    def update_entry(self, entry):
+        row = self.rows.get(entry["id"])
+        if row is None:
+            self.add_entry(entry)
+            return
+        status = STATE_LABELS.get(entry["state"], entry["state"])
+        if entry.get("error"):
+            status += f" ({entry['error']})"
+        self.table.setItem(row, 1, QTableWidgetItem(status))
+        self.table.setItem(row, 2, QTableWidgetItem(format_progress(entry)))
+        self.table.setItem(row, 3, QTableWidgetItem(entry.get("priority", self.manager.default_priority)))
+
+    def update_rates(self):
+        if not self.isVisible():
+            return
+        rates = self.manager.rates()
+        for entry_id, row in self.rows.items():
+            rate = rates["downloads"].get(entry_id)
+            self.table.setItem(row, 4, QTableWidgetItem(format_size(int(rate)) + "/s" if rate is not None else ""))
+        text = f"Total: {format_size(int(rates['total']))}/s"
+        if rates["foreground_busy"]:
+            text += "  (aba carregando: downloads em segundo plano reduzidos)"
+        self.rate_label.setText(text)
+
+    def cycle_priority(self):
+        entry_id = self.selected_id()
+        if entry_id is None:
+            return
+        entry = self.manager.queue.get(entry_id)
+        current = entry.get("priority", self.manager.default_priority)
+        index = PRIORITY_CYCLE.index(current) if current in PRIORITY_CYCLE else 0
+        self.manager.set_priority(entry_id, PRIORITY_CYCLE[(index + 1) % len(PRIORITY_CYCLE)])
+
+    def selected_id(self):
+        row = self.table.currentRow()
+        if row < 0 or row >= len(self.table.lista):
+            return None
+        return self.table.lista[row]["id"]
+
+    def open_folder(self):
+        QDesktopServices.openUrl(QUrl.fromLocalFile(self.manager.folder))
+
+    def clear_finished(self):
+        self.manager.clear_finished()
+        self.table.cleanList()
+        self.rows = {}
+        for entry in self.manager.entries():
+            self.add_entry(entry)
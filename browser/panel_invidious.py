@@ -0,0 +1,56 @@
+import sys, os
+
+BROWSER_PATH = os.path.dirname(os.path.realpath(__file__))
+sys.path.append( BROWSER_PATH );
+
+from PySide6.QtWidgets import QVBoxLayout, QWidget, QPushButton
+from PySide6.QtWebEngineWidgets import QWebEngineView
+from PySide6.QtCore import QUrl
+
+INVIDIOUS_URL = "https://inv.nadeko.net/feed/popular"
+BUTTON_SIZE = 39
+BUTTON_MARGIN = 10
+
+
+# ---------------- PanelInvidious ----------------
+# Aba "Invidious": QWebEngineView com botões flutuantes de voltar/recarregar.
+# Criada pelo LazyPanel na primeira vez que a aba aparece, já carregando o feed.
+class PanelInvidious(QWidget):
+    def __init__(self, user_agent, user_scripts=None, parent=None):
+        super().__init__(parent)
+        self.view = QWebEngineView()
+        profile = self.view.page().profile()
+        if user_scripts is not None:
+            user_scripts.attach(profile)
+        profile.setHttpUserAgent(user_agent)
+
+        layout = QVBoxLayout()
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(0)
+        layout.addWidget(self.view)
+        self.setLayout(layout)
+
+        # Botões flutuantes
+        self.btn_back = QPushButton("←", self)
+        self.btn_reload = QPushButton("⟳", self)
+        for btn in [self.btn_back, self.btn_reload]:
+            btn.setFixedSize(BUTTON_SIZE, BUTTON_SIZE)
+            btn.setStyleSheet("""
+                background-color: #3a3a3a;
+                color: #fff;
+                border: 1px solid #555;
+                border-radius: 5px;
+            """)
+        self.btn_back.clicked.connect(lambda: self.view.back())
+        self.btn_reload.clicked.connect(lambda: self.view.reload())
+
+        self.view.setUrl(QUrl(INVIDIOUS_URL))
+
+    def resizeEvent(self, event):
+        w = self.width()
+        h = self.height()
+        self.btn_back.move(w - 2 * (BUTTON_SIZE + BUTTON_MARGIN), h - BUTTON_SIZE - BUTTON_MARGIN)
+        self.btn_reload.move(w - (BUTTON_SIZE + BUTTON_MARGIN), h - BUTTON_SIZE - BUTTON_MARGIN)
+        self.btn_back.raise_()
+        self.btn_reload.raise_()
+        super().resizeEvent(event)
@@ -1,4 +1,4 @@
-import tldextract, sys, uuid, json, os, importlib, requests
+import sys, uuid, json, os, importlib
 
 BROWSER_PATH = os.path.dirname(os.path.realpath(__file__))
 sys.path.append( BROWSER_PATH );
@@ -8,6 +8,9 @@ from PySide6.QtGui import QAction
 from PySide6.QtCore import Qt, QSize
 
 from browser.ui.table import *
+from browser.api.event_log import get_logger, fields
+
+log = get_logger("app")
 
 class PanelMyass(QWidget):
     def __init__(self, parent=None):
@@ -43,6 +46,7 @@ class PanelMyass(QWidget):
     def send_server(self, envelope):
         try:
             self.config = json.loads( open(self.path_config, "r").read() );
+            import requests
             headers = {'User-Agent': 'Mozilla/5.0 (X11; Linux x86_64; rv:128.0) Gecko/20100101 Firefox/128.0'}
             page = requests.post(self.config["url"] + "service/works_list.php", timeout=30, headers=headers, json={ "device": "browser", "publick_key_name" : self.config["token"]});
             texto = ""
@@ -50,8 +54,7 @@ class PanelMyass(QWidget):
                 texto = page.text;
                 self.close();
             else:
-                print(page.text);
-                print("Satus request:", page.status_code);
+                log.warning("myass: resposta inesperada", extra=fields(status=page.status_code, body=page.text[:500]));
             texto = texto.replace(self.config["token"],"");
             return texto;
         except:
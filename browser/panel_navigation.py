@@ -0,0 +1,108 @@
+import sys, os
+
+BROWSER_PATH = os.path.dirname(os.path.realpath(__file__))
+sys.path.append( BROWSER_PATH );
+
+from PySide6.QtWidgets import QVBoxLayout, QHBoxLayout, QWidget, QPushButton, QLineEdit, QComboBox, QListView, QAbstractItemView, QLabel
+from PySide6.QtGui import QKeySequence, QShortcut
+from PySide6.QtCore import Qt, QTimer
+
+from browser.api.history_store import GROUP_DOMAIN, GROUP_DAY
+from browser.ui.history_model import HistoryModel, URL_ROLE
+
+FILTER_DELAY_MS = 150
+
+GROUPS = [
+    ("Sem agrupamento", None),
+    ("Por domínio", GROUP_DOMAIN),
+    ("Por dia", GROUP_DAY),
+]
+
+
+# ---------------- PanelNavigation ----------------
+# Aba Navigation: histórico numa QListView sobre o HistoryModel (páginas sob
+# demanda). Nada é consultado até a aba ser mostrada pela primeira vez.
+class PanelNavigation(QWidget):
+    def __init__(self, store, open_url=None, parent=None):
+        super().__init__(parent)
+        self.open_url = open_url
+        self.model = HistoryModel(store, self)
+
+        self.filter_edit = QLineEdit()
+        self.filter_edit.setPlaceholderText("Filtrar histórico...")
+        self.group_combo = QComboBox()
+        for text, group in GROUPS:
+            self.group_combo.addItem(text, group)
+
+        top = QHBoxLayout()
+        top.addWidget(self.filter_edit, 1)
+        top.addWidget(self.group_combo)
+
+        self.view = QListView()
+        self.view.setModel(self.model)
+        self.view.setUniformItemSizes(True)
+        self.view.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        self.view.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.view.doubleClicked.connect(self.open_index)
+
+        self.count_label = QLabel()
+        buttons = QHBoxLayout()
+        buttons.addWidget(self.count_label, 1)
+        for text, func in [
+            ("Abrir", self.open_selected),
+            ("Excluir selecionados", self.delete_selected),
+            ("Excluir grupo", self.delete_group),
+        ]:
+            btn = QPushButton(text)
+            btn.clicked.connect(func)
+            buttons.addWidget(btn)
+
+        layout = QVBoxLayout()
+        layout.addLayout(top)
+        layout.addWidget(self.view)
+        layout.addLayout(buttons)
+        self.setLayout(layout)
+
+        # Filtro incremental: consulta só depois de uma pausa na digitação
+        self.filter_timer = QTimer(self)
+        self.filter_timer.setSingleShot(True)
+        self.filter_timer.setInterval(FILTER_DELAY_MS)
+        self.filter_timer.timeout.connect(self.apply_filter)
+        self.filter_edit.textChanged.connect(lambda text: self.filter_timer.start())
+        self.group_combo.currentIndexChanged.connect(self.apply_group)
+        self.model.modelReset.connect(self.update_count)
+
+        shortcut = QShortcut(QKeySequence.Delete, self.view, activated=self.delete_selected)
+        shortcut.setContext(Qt.WidgetShortcut)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if not self.model.loaded or self.model.stale:
+            self.model.refresh()
+
+    def apply_filter(self):
+        self.model.set_filter(self.filter_edit.text())
+
+    def apply_group(self, index):
+        self.model.set_group(self.group_combo.itemData(index))
+
+    def update_count(self):
+        count = sum(count for key, count in self.model.groups)
+        self.count_label.setText(f"{count} entradas")
+
+    def open_index(self, index):
+        url = index.data(URL_ROLE)
+        if url and self.open_url is not None:
+            self.open_url(url)
+
+    def open_selected(self):
+        for index in self.view.selectionModel().selectedIndexes():
+            self.open_index(index)
+
+    def delete_selected(self):
+        self.model.delete(self.view.selectionModel().selectedIndexes())
+
+    def delete_group(self):
+        index = self.view.currentIndex()
+        if index.isValid() and self.model.group:
+            self.model.delete([self.model.header_index(index.row())])
@@ -0,0 +1,25 @@
+// Tema escuro: fundo + scrollbar fina. Roda em DocumentCreation, antes do
+// primeiro paint; se ainda não há <html>, espera ele aparecer.
+(function(){
+    if (document.getElementById('qt-custom-scrollbar')) return;
+    var style = document.createElement('style');
+    style.id = 'qt-custom-scrollbar';
+    style.textContent = `
+        body { background-color: #1e1e1e !important; color: #e0e0e0 !important; }
+        *::-webkit-scrollbar { width: 6px !important; height: 6px !important; }
+        *::-webkit-scrollbar-track { background: #2e2e2e !important; border-radius: 3px !important; }
+        *::-webkit-scrollbar-thumb { background: #555 !important; border-radius: 3px !important; }
+        *::-webkit-scrollbar-thumb:hover { background: #888 !important; }
+    `;
+    function attach() {
+        var root = document.head || document.documentElement;
+        if (!root) return false;
+        root.appendChild(style);
+        return true;
+    }
+    if (!attach()) {
+        new MutationObserver(function(mutations, observer) {
+            if (attach()) observer.disconnect();
+        }).observe(document, {childList: true, subtree: true});
+    }
+})();
@@ -0,0 +1,33 @@
+// Métricas de carregamento: Navigation Timing + Paint Timing do documento.
+// Roda em DocumentCreation (ApplicationWorld, só no frame principal); o Python lê
+// window.__pac22Timing() depois do loadFinished. Retorna null até o load terminar.
+(function(){
+    if (window.__pac22Timing) return;
+    var paints = {};
+    function observe(type) {
+        try {
+            new PerformanceObserver(function(list) {
+                list.getEntries().forEach(function(entry) {
+                    var name = type === 'paint' ? entry.name : type;
+                    paints[name] = entry.renderTime || entry.startTime;
+                });
+            }).observe({type: type, buffered: true});
+        } catch (e) {}
+    }
+    observe('paint');
+    observe('largest-contentful-paint');
+    function ms(value) { return value > 0 ? Math.round(value) : null; }
+    window.__pac22Timing = function() {
+        var nav = performance.getEntriesByType('navigation')[0];
+        if (!nav || !nav.loadEventEnd) return null;
+        return {
+            type: nav.type,
+            ttfb: ms(nav.responseStart),
+            dcl: ms(nav.domContentLoadedEventEnd),
+            load: ms(nav.loadEventEnd),
+            fcp: ms(paints['first-contentful-paint']),
+            lcp: ms(paints['largest-contentful-paint']),
+            bytes: nav.transferSize || 0
+        };
+    };
+})();
@@ -0,0 +1,221 @@
+import os, sys, time
+
+BROWSER_PATH = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+sys.path.append(BROWSER_PATH)
+
+from PySide6.QtCore import QObject, QTimer, QUrl, Signal
+from PySide6.QtWebEngineWidgets import QWebEngineView
+from PySide6.QtWebEngineCore import QWebEnginePage, QWebEngineLoadingInfo
+
+from browser.ui.custom_web_engine_page import CustomWebEnginePage
+from browser.api.batch_jobs import BatchQueue, output_stem, DEFAULT_CONCURRENCY, DEFAULT_TIMEOUT, DEFAULT_RETRIES
+
+DEFAULT_WIDTH = 1280
+DEFAULT_HEIGHT = 800
+# Espera depois do loadFinished (fontes, imagens tardias) antes de capturar
+DEFAULT_SETTLE_MS = 500
+FULL_PAGE_MAX_HEIGHT = 16384
+FULL_PAGE_DELAY_MS = 200
+PROGRESS_EVERY = 25
+
+IDLE, LOADING, CAPTURING = range(3)
+
+
+# ---------------- RenderSlot ----------------
+# Uma página (numa QWebEngineView fora da tela, para o screenshot) que processa
+# uma URL por vez: carrega, espera "settle" e grava txt/pdf/png na ordem pedida.
+# O timeout cobre a URL inteira; depois de um timeout ou de um renderer que caiu a
+# página é recriada, para nenhum callback atrasado cair no job seguinte.
+class RenderSlot(QObject):
+    finished = Signal(object, object)
+
+    def __init__(self, profile, options, parent=None):
+        super().__init__(parent)
+        self.profile = profile
+        self.options = options
+        self.view = QWebEngineView()
+        self.view.resize(options["width"], options["height"])
+        self.view.show()
+        self.page = None
+        self.new_page()
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(lambda: self.fail("timeout", recreate=True))
+        self.job = None
+        self.state = IDLE
+        self.generation = 0
+
+    def new_page(self):
+        if self.page is not None:
+            self.page.deleteLater()
+        self.page = CustomWebEnginePage(self.profile, self.view, interactive=False)
+        self.page.loadFinished.connect(self.on_load_finished)
+        self.page.loadingChanged.connect(self.on_loading_changed)
+        self.page.renderProcessTerminated.connect(lambda status, code: self.fail(f"renderer terminou ({code})", recreate=True))
+        self.view.setPage(self.page)
+
+    def start(self, job):
+        self.job = job
+        self.state = LOADING
+        self.generation += 1
+        self.error = None
+        self.status = None
+        self.files = {}
+        self.started = time.monotonic()
+        self.stem = os.path.join(self.options["out"], output_stem(job["index"], job["url"]))
+        self.timer.start(int(self.options["timeout"] * 1000))
+        self.page.setUrl(QUrl(job["url"]))
+
+    def on_loading_changed(self, info):
+        if info.status() != QWebEngineLoadingInfo.LoadStatus.LoadFailedStatus:
+            return
+        self.error = info.errorString() or f"erro {info.errorCode()}"
+        if info.errorDomain() == QWebEngineLoadingInfo.ErrorDomain.HttpStatusCodeDomain:
+            self.status = info.errorCode()
+
+    def on_load_finished(self, ok):
+        if self.state != LOADING:
+            return
+        if not ok:
+            self.fail(self.error or "falha no carregamento")
+            return
+        self.state = CAPTURING
+        generation = self.generation
+        QTimer.singleShot(self.options["settle_ms"], self, lambda: self.capture(generation))
+
+    def capture(self, generation):
+        if generation != self.generation or self.state != CAPTURING:
+            return
+        self.pending = list(self.options["outputs"])
+        self.next_output(generation)
+
+    def next_output(self, generation):
+        if generation != self.generation or self.state != CAPTURING:
+            return
+        if not self.pending:
+            self.complete()
+            return
+        kind = self.pending.pop(0)
+        if kind == "txt":
+            self.page.toPlainText(lambda text: self.save_output(generation, "txt", (text or "").encode("utf-8")))
+        elif kind == "pdf":
+            self.page.printToPdf(lambda data: self.save_output(generation, "pdf", bytes(data)))
+        elif kind == "png":
+            self.screenshot(generation)
+
+    def screenshot(self, generation):
+        if not self.options["full_page"]:
+            self.save_screenshot(generation)
+            return
+        # Página inteira: estica a view até a altura do conteúdo (com teto) e espera repintar
+        height = int(self.page.contentsSize().height())
+        height = max(self.options["height"], min(height, FULL_PAGE_MAX_HEIGHT))
+        self.view.resize(self.options["width"], height)
+        QTimer.singleShot(FULL_PAGE_DELAY_MS, self, lambda: self.save_screenshot(generation))
+
+    def save_screenshot(self, generation):
+        if generation != self.generation or self.state != CAPTURING:
+            return
+        path = self.stem + ".png"
+        saved = self.view.grab().save(path, "PNG")
+        self.view.resize(self.options["width"], self.options["height"])
+        if not saved:
+            self.fail("screenshot falhou")
+            return
+        self.files["png"] = path
+        self.next_output(generation)
+
+    def save_output(self, generation, kind, data):
+        if generation != self.generation or self.state != CAPTURING:
+            return
+        if not data:
+            self.fail(f"{kind} vazio")
+            return
+        path = f"{self.stem}.{kind}"
+        try:
+            with open(path, "wb") as f:
+                f.write(data)
+        except OSError as e:
+            self.fail(str(e))
+            return
+        self.files[kind] = path
+        self.next_output(generation)
+
+    def result(self, ok, error=None):
+        result = {"index": self.job["index"], "url": self.job["url"], "ok": ok, "attempts": self.job["attempts"],
+                  "elapsed_ms": round((time.monotonic() - self.started) * 1000), "final_url": self.page.url().toString()}
+        if ok:
+            result["title"] = self.page.title()
+            result["files"] = self.files
+        else:
+            result["error"] = error
+        if self.status is not None:
+            result["status"] = self.status
+        return result
+
+    def complete(self):
+        self.finish(self.result(True))
+
+    def fail(self, error, recreate=False):
+        if self.state == IDLE:
+            return
+        result = self.result(False, error)
+        if recreate:
+            self.new_page()
+        else:
+            self.page.triggerAction(QWebEnginePage.WebAction.Stop)
+        self.finish(result)
+
+    def finish(self, result):
+        job = self.job
+        self.timer.stop()
+        self.job = None
+        self.state = IDLE
+        self.generation += 1
+        self.finished.emit(job, result)
+
+
+# ---------------- BatchRenderer ----------------
+# N RenderSlots consumindo a BatchQueue; cada URL concluída vira uma linha no
+# ResultWriter. Falhas voltam para a fila até esgotar as tentativas.
+class BatchRenderer(QObject):
+    done = Signal(object)
+
+    def __init__(self, profile, urls, options, writer, skip=(), parent=None):
+        super().__init__(parent)
+        self.options = options
+        self.writer = writer
+        os.makedirs(options["out"], exist_ok=True)
+        self.queue = BatchQueue(urls, options.get("retries", DEFAULT_RETRIES), skip)
+        concurrency = max(1, min(options.get("concurrency", DEFAULT_CONCURRENCY), self.queue.total or 1))
+        self.slots = []
+        for _ in range(concurrency):
+            slot = RenderSlot(profile, options, self)
+            slot.finished.connect(lambda job, result, s=slot: self.on_finished(s, job, result))
+            self.slots.append(slot)
+
+    def start(self):
+        if self.queue.done():
+            QTimer.singleShot(0, lambda: self.done.emit(self.queue.summary()))
+            return
+        for slot in self.slots:
+            self.feed(slot)
+
+    def feed(self, slot):
+        job = self.queue.next()
+        if job is not None:
+            slot.start(job)
+
+    def on_finished(self, slot, job, result):
+        if not result["ok"] and self.queue.retry(job):
+            print(f"Tentando de novo ({job['attempts']}): {job['url']} - {result['error']}", file=sys.stderr)
+        else:
+            self.queue.finish(job, result["ok"])
+            self.writer.write(result)
+            completed = self.queue.succeeded + self.queue.failed
+            if completed % PROGRESS_EVERY == 0:
+                print(f"[{completed}/{self.queue.total}] {self.queue.throughput():.1f} páginas/min", file=sys.stderr)
+        # Próxima URL fora do callback do Chromium
+        QTimer.singleShot(0, self, lambda: self.feed(slot))
+        if self.queue.done():
+            self.done.emit(self.queue.summary())
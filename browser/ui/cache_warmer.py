@@ -0,0 +1,87 @@
+import os, sys
+
+BROWSER_PATH = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+sys.path.append(BROWSER_PATH)
+
+from PySide6.QtCore import QObject, QTimer, QUrl
+from PySide6.QtWebEngineCore import QWebEnginePage, QWebEngineSettings
+
+from browser.api.http_cache import top_origins, WARM_SCAN_FACTOR
+
+BUSY_RETRY_MS = 2000
+PAGE_TIMEOUT_MS = 15000
+
+
+# ---------------- CacheWarmer ----------------
+# Depois da inicialização, com o navegador parado, carrega numa página oculta (sem
+# JavaScript nem imagens) o documento principal das N origens de maior frecency,
+# uma por vez, para o cache em disco do perfil já estar quente na primeira visita.
+class CacheWarmer(QObject):
+    def __init__(self, profile, history_store, settings, busy=None, parent=None):
+        super().__init__(parent)
+        self.profile = profile
+        self.history_store = history_store
+        self.limit = settings["warm_top"]
+        self.delay_ms = int(settings["warm_delay"] * 1000)
+        self.enabled = self.limit > 0 and settings["type"] == "disk"
+        self.busy = busy or (lambda: False)
+        self.pending = []
+        self.page = None
+        self.warmed = 0
+        self.timeout = QTimer(self)
+        self.timeout.setSingleShot(True)
+        self.timeout.setInterval(PAGE_TIMEOUT_MS)
+        self.timeout.timeout.connect(self.expire)
+
+    def start(self):
+        if self.enabled:
+            QTimer.singleShot(self.delay_ms, self.begin)
+
+    def begin(self):
+        rows = self.history_store.top(self.limit * WARM_SCAN_FACTOR)
+        self.pending = top_origins((row[4] for row in rows), self.limit)
+        self.next()
+
+    def create_page(self):
+        page = QWebEnginePage(self.profile, self)
+        settings = page.settings()
+        settings.setAttribute(QWebEngineSettings.WebAttribute.JavascriptEnabled, False)
+        settings.setAttribute(QWebEngineSettings.WebAttribute.AutoLoadImages, False)
+        page.setAudioMuted(True)
+        page.loadFinished.connect(self.finished)
+        return page
+
+    def next(self):
+        self.timeout.stop()
+        if not self.pending:
+            self.stop()
+            return
+        if self.busy():
+            # Abas carregando têm prioridade: tenta de novo daqui a pouco
+            QTimer.singleShot(BUSY_RETRY_MS, self.next)
+            return
+        if self.page is None:
+            self.page = self.create_page()
+        self.timeout.start()
+        self.page.setUrl(QUrl(self.pending.pop(0)))
+
+    def finished(self, ok):
+        if ok:
+            self.warmed += 1
+        self.next()
+
+    def expire(self):
+        # Página que não termina: descarta sem esperar o loadFinished dela
+        self.drop_page()
+        self.next()
+
+    def drop_page(self):
+        if self.page is not None:
+            self.page.loadFinished.disconnect(self.finished)
+            self.page.deleteLater()
+            self.page = None
+
+    def stop(self):
+        self.pending = []
+        self.timeout.stop()
+        self.drop_page()
@@ -1,68 +1,89 @@
-import tldextract, sys, uuid, json, os, importlib
-import threading, requests
+import sys, uuid, json, os, importlib, logging
 
 BROWSER_PATH = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
 sys.path.append( BROWSER_PATH );
 
 from PySide6.QtWidgets import QLayout, QDialog, QVBoxLayout, QHBoxLayout, QWidget
-from PySide6.QtWebEngineCore import QWebEnginePage
+from PySide6.QtWebEngineCore import QWebEnginePage, QWebEngineSettings
+from browser.api.trace_events import traced
+from browser.api.site_settings import NO_OVERRIDES
+from browser.ui.data_saver import DataSaverInterceptor
+from browser.api.event_log import get_logger, fields
+
+log_nav = get_logger("nav");
+log_console = get_logger("console");
+ConsoleLevel = QWebEnginePage.JavaScriptConsoleMessageLevel;
+CONSOLE_LEVELS = {
+    ConsoleLevel.InfoMessageLevel: logging.INFO,
+    ConsoleLevel.WarningMessageLevel: logging.WARNING,
+    ConsoleLevel.ErrorMessageLevel: logging.ERROR,
+};
+# Nome usado no config.json/site_settings.json -> atributo do QWebEngineSettings
+WEB_ATTRIBUTES = {attribute.name: attribute for attribute in QWebEngineSettings.WebAttribute};
 
 class CustomWebEnginePage(QWebEnginePage):
-    def __init__(self, profile, parent):
+    def __init__(self, profile, parent, interactive=True):
         super().__init__(profile, parent);
-        self.bloqueios = [ "gstatic.com", "doubleclick.net", "googlesyndication.com", "metrike.com.br", "dtrafficquality.google", "metrike.com.br"];
-        self.download_ext = [".iso", ".zip", ".gz", ".png", ".jpg", ".json"];
+        self.blocklist = getattr(profile, "blocklist", None);
+        # Overrides por site (PrivateProfile.site_settings) aplicados nos settings da própria página
+        self.site_settings = getattr(profile, "site_settings", None);
+        self.site_overrides = NO_OVERRIDES;
+        # Economia de dados (seção "data_saver"): contas por página, então interceptor por página
+        self.data_saver = None;
+        if getattr(profile, "data_saver", None) is not None:
+            self.data_saver = DataSaverInterceptor(profile.data_saver, self);
+            self.setUrlRequestInterceptor(self.data_saver);
+        # Sem janela (batch.py): bloqueio nunca abre diálogo, só recusa
+        self.interactive = interactive;
         self.certificateError.connect( self.certificateError_signal );
         #self.navigationRequested.connect(self.on_navigate_signal);
         self.urlChanged.connect(self.urlChanged_signal);
     def urlChanged_signal(self, url):
-        pass;
+        # Navegação que não trocou de documento (download, recusada): volta ao site atual
+        self.apply_site_settings(url.host());
+    def load_all(self):
+        # "Carregar tudo nesta página": desliga a economia de dados e recarrega
+        if self.data_saver is not None:
+            self.data_saver.load_all();
+            self.triggerAction(QWebEnginePage.WebAction.Reload);
+    def apply_site_settings(self, host):
+        # Settings da página herdam do perfil; só mexe quando o resultado muda de site
+        overrides = self.site_settings.resolve(host) if self.site_settings is not None else NO_OVERRIDES;
+        if overrides is self.site_overrides:
+            return;
+        settings = self.settings();
+        for name in self.site_overrides:
+            if name not in overrides and name in WEB_ATTRIBUTES:
+                settings.resetAttribute(WEB_ATTRIBUTES[name]);
+        for name, value in overrides.items():
+            if name in WEB_ATTRIBUTES:
+                settings.setAttribute(WEB_ATTRIBUTES[name], value);
+        self.site_overrides = overrides;
+        log_nav.debug("configurações do site", extra=fields(host=host, overrides=overrides));
     def on_navigate_signal(self):
         pass;
     def certificateError_signal(self, qwebenginecertificateerror):
         pass;#<PySide6.QtWebEngineCore.QWebEngineCertificateError object at 0x7f07e0445c80>
     def javaScriptConsoleMessage(self, level, message, lineNumber, sourceId):
-        print(level, message, lineNumber, sourceId);
-        pass;
-    def download_file(self, url, path):
-        try:
-            headers = {'User-Agent': 'Mozilla/5.0 (X11; Linux x86_64; rv:128.0) Gecko/20100101 Firefox/128.0'}
-            response = requests.get(url, headers=headers)
-            totalbits = 0
-            if response.status_code == 200:
-                with open(path, 'wb') as f:
-                    for chunk in response.iter_content(chunk_size=4096):
-                        if chunk:
-                            totalbits += 4096
-                            print("Downloaded",totalbits*4096,"KB...")
-                            f.write(chunk)
-            return True;
-        except:
-            traceback.print_exc();
-        if os.path.exists(path):
-            os.unlink(path);
-        return False;
+        # Limite de taxa por página (event_log.RateLimitFilter) contra enxurradas de console
+        log_level = CONSOLE_LEVELS.get(level, logging.INFO);
+        if log_console.isEnabledFor(log_level):
+            log_console.log(log_level, message, extra={"rate_key": id(self), "fields": {"source": sourceId, "line": lineNumber}});
+    @traced()
     def acceptNavigationRequest(self, url,  _type, isMainFrame):
-        extensao_index = url.toString().rfind( "." );
-        extensao = None;
-        if extensao_index > 0:
-            extensao = url.toString()[extensao_index:];
-            arquivo = url.toString()[url.toString().rfind( "/" ) + 1:];
-            if extensao in self.download_ext:
-                path_file = os.path.join( os.path.expanduser("~/Downloads"), arquivo );
-                print(path_file, os.path.exists(path_file));
-                if not os.path.exists(path_file):
-                    t1 = threading.Thread(target=self.download_file, args=(url.toString(), path_file, ));
-                    t1.start();
-        for bloqueio in self.bloqueios:
-            if url.toString().find( bloqueio ) > 0:
-                if _type == QWebEnginePage.NavigationType.NavigationTypeTyped or _type == QWebEnginePage.NavigationType.NavigationTypeRedirect:
-                    dlg = QDialog()
-                    dlg.setWindowTitle(bloqueio)
-                    dlg.exec()
-                    break;
-                else:
-                    print("\033[91mBLOQUEIO:", _type, bloqueio, "\033[0m");
-                    return False;
-        print("\033[94mPERMITIR:", _type, url.toString()[:150], "\033[0m");
-        return super().acceptNavigationRequest(url, _type, isMainFrame)
+        bloqueio = self.blocklist.match(url.host()) if self.blocklist is not None else None;
+        if bloqueio is not None:
+            if self.interactive and (_type == QWebEnginePage.NavigationType.NavigationTypeTyped or _type == QWebEnginePage.NavigationType.NavigationTypeRedirect):
+                dlg = QDialog()
+                dlg.setWindowTitle(bloqueio)
+                dlg.exec()
+            else:
+                log_nav.info("navegação bloqueada", extra=fields(type=_type.name, rule=bloqueio, url=url.toString()[:150]));
+                return False;
+        if log_nav.isEnabledFor(logging.DEBUG):
+            log_nav.debug("navegação permitida", extra=fields(type=_type.name, url=url.toString()[:150]));
+        accepted = super().acceptNavigationRequest(url, _type, isMainFrame);
+        # Antes do novo documento existir, para JS/imagens/WebGL valerem já nele
+        if accepted and isMainFrame:
+            self.apply_site_settings(url.host());
+        return accepted
@@ -0,0 +1,73 @@
+import os, sys, logging
+
+BROWSER_PATH = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+sys.path.append(BROWSER_PATH)
+
+from PySide6.QtCore import QTimer, Signal
+from PySide6.QtWebEngineCore import QWebEngineUrlRequestInterceptor, QWebEngineUrlRequestInfo
+
+from browser.api.data_saver import PageDataSaver, is_third_party
+from browser.api.event_log import get_logger, fields
+
+ResourceType = QWebEngineUrlRequestInfo.ResourceType
+NavigationType = QWebEngineUrlRequestInfo.NavigationType
+RESOURCE_KINDS = {
+    ResourceType.ResourceTypeImage: "image",
+    ResourceType.ResourceTypeMedia: "media",
+    ResourceType.ResourceTypeObject: "media",
+    ResourceType.ResourceTypeFontResource: "font",
+    ResourceType.ResourceTypeSubFrame: "sub_frame",
+}
+# Recarregar/redirecionar mantém o "carregar tudo"; outra navegação zera
+KEEP_ALLOW_ALL = (NavigationType.NavigationTypeReload, NavigationType.NavigationTypeRedirect)
+CHANGED_DELAY_MS = 300
+
+log = get_logger("data_saver")
+
+
+# ---------------- DataSaverInterceptor ----------------
+# Interceptor da página (roda depois do interceptor do perfil): bloqueia imagens,
+# mídia, fontes e iframes pelas regras da seção "data_saver" e pelo orçamento da
+# página, e pede versões leves com "Save-Data: on". As contas ficam em
+# PageDataSaver; changed avisa a aba, no máximo a cada CHANGED_DELAY_MS.
+class DataSaverInterceptor(QWebEngineUrlRequestInterceptor):
+    changed = Signal()
+
+    def __init__(self, settings, parent=None):
+        super().__init__(parent)
+        self.settings = settings
+        self.saver = PageDataSaver(settings)
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(CHANGED_DELAY_MS)
+        self.timer.timeout.connect(self.changed.emit)
+
+    def interceptRequest(self, info):
+        # Ligado/desligado na aba Settings sem recriar as páginas
+        if not self.settings["enabled"]:
+            return
+        resource = info.resourceType()
+        if resource == ResourceType.ResourceTypeMainFrame:
+            self.saver.reset(allow_all=self.saver.allow_all and info.navigationType() in KEEP_ALLOW_ALL)
+            self.timer.start()
+        if self.saver.allow_all:
+            return
+        if self.settings["save_data_header"]:
+            info.setHttpHeader(b"Save-Data", b"on")
+        kind = RESOURCE_KINDS.get(resource)
+        if kind is None:
+            return
+        url = info.requestUrl()
+        reason = self.saver.check(kind, is_third_party(url.host(), info.firstPartyUrl().host()))
+        if reason is None:
+            return
+        info.block(True)
+        if not self.timer.isActive():
+            self.timer.start()
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("pedido bloqueado", extra=fields(kind=kind, reason=reason, url=url.toString()[:150]))
+
+    def load_all(self):
+        # Vale a partir do próximo carregamento (reload) desta página
+        self.saver.allow_all = True
+        self.changed.emit()
@@ -0,0 +1,345 @@
+import sys, os, time
+from concurrent.futures import ThreadPoolExecutor
+
+BROWSER_PATH = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+sys.path.append( BROWSER_PATH );
+
+from PySide6.QtCore import QObject, QTimer, QUrl, Signal
+from PySide6.QtNetwork import QNetworkCookie
+from PySide6.QtWebEngineCore import QWebEngineDownloadRequest, QWebEnginePage
+from browser.api.download_queue import DownloadQueue, unique_path, QUEUED, ACTIVE, PAUSED, COMPLETED, FAILED, CANCELLED
+from browser.api.bandwidth import BandwidthScheduler, PRIORITIES, NORMAL
+from browser.api.segmented_download import SegmentedDownload, DownloadCancelled, make_session, PART_SUFFIX, JOURNAL_SUFFIX
+
+DEFAULT_DOWNLOAD_FOLDER = "~/Downloads"
+DEFAULT_MAX_CONCURRENT = 3
+DEFAULT_SEGMENTS = 4
+DEFAULT_SEGMENT_THRESHOLD_MB = 32
+SAVE_INTERVAL_MS = 1000
+PROGRESS_INTERVAL = 0.1
+
+State = QWebEngineDownloadRequest.DownloadState
+
+
+# ---------------- DownloadManager ----------------
+# Todos os downloads passam pelo downloadRequested do perfil: o Chromium já decide
+# por MIME type / Content-Disposition, reaproveita cookies e sessão e não baixa o
+# arquivo duas vezes. No máximo "max_concurrent" transferências ficam ativas; as
+# demais ficam pausadas na fila até liberar vaga.
+# Arquivos grandes de servidores com Range saem do Chromium e vão para o
+# SegmentedDownload (N conexões, retomada por journal, SHA-256), usando os cookies
+# e o User-Agent do perfil.
+class DownloadManager(QObject):
+    added = Signal(object)
+    changed = Signal(object)
+    engine_progress = Signal(int, object, object)
+    engine_finished = Signal(int, str, object)
+
+    def __init__(self, profile, config=None, parent=None):
+        super().__init__(parent)
+        self.scheduler = BandwidthScheduler.from_config(config)
+        self.default_priority = (config or {}).get("bandwidth", {}).get("default_priority", NORMAL)
+        config = (config or {}).get("downloads", {})
+        self.profile = profile
+        self.folder = os.path.expanduser(config.get("folder", DEFAULT_DOWNLOAD_FOLDER))
+        self.max_concurrent = max(1, int(config.get("max_concurrent", DEFAULT_MAX_CONCURRENT)))
+        self.segments = max(1, int(config.get("segments", DEFAULT_SEGMENTS)))
+        self.segment_threshold = int(config.get("segment_threshold_mb", DEFAULT_SEGMENT_THRESHOLD_MB)) * 1024 * 1024
+        self.queue = DownloadQueue(profile.path)
+        self.requests = {}
+        self.jobs = {}
+        self.channels = {}
+        # Página de origem de cada download (IdleScheduler não congela essas abas)
+        self.pages = {}
+        self.order = []
+        self.restart_page = None
+        self.pool = ThreadPoolExecutor(max_workers=self.max_concurrent)
+        # Sessão HTTP (requests) só no primeiro download segmentado
+        self.session = None
+
+        # Cookies do perfil para o motor segmentado
+        self.cookies = {}
+        self.profile.cookieStore().cookieAdded.connect(self.on_cookie_added)
+        self.profile.cookieStore().cookieRemoved.connect(self.on_cookie_removed)
+        self.profile.cookieStore().loadAllCookies()
+        self.engine_progress.connect(self.on_engine_progress)
+        self.engine_finished.connect(self.on_engine_finished)
+
+        self.save_timer = QTimer(self)
+        self.save_timer.setSingleShot(True)
+        self.save_timer.setInterval(SAVE_INTERVAL_MS)
+        self.save_timer.timeout.connect(self.queue.save)
+
+        self.profile.downloadRequested.connect(self.on_download_requested)
+
+    # --- Fila ---
+    def busy_pages(self):
+        return {page for entry_id, page in self.pages.items() if entry_id in self.requests or entry_id in self.jobs}
+
+    def active_count(self):
+        return sum(1 for i in self.order if self.queue.get(i)["state"] == ACTIVE and (i in self.requests or i in self.jobs))
+
+    def use_engine(self, request):
+        return request.url().scheme() in ("http", "https") and request.totalBytes() >= self.segment_threshold
+
+    def on_download_requested(self, request):
+        if request.isSavePageDownload():
+            request.accept()
+            return
+        url = request.url().toString()
+        entry = self.queue.find_pending(url)
+        if entry is not None and (entry["id"] in self.requests or entry["id"] in self.jobs):
+            # Mesmo arquivo já está sendo baixado (pelo Chromium ou pelo motor segmentado)
+            request.cancel()
+            return
+        os.makedirs(self.folder, exist_ok=True)
+        if entry is None:
+            path = unique_path(self.folder, request.downloadFileName() or request.suggestedFileName(),
+                               self.queue.pending_paths())
+            entry = self.queue.add(url, path, request.mimeType(), max(0, request.totalBytes()))
+            self.added.emit(entry)
+        if entry["id"] not in self.order:
+            self.order.append(entry["id"])
+        if request.page() is not None:
+            self.pages[entry["id"]] = request.page()
+        if self.use_engine(request):
+            # Só os cabeçalhos chegaram; o corpo vem pelo motor segmentado
+            request.cancel()
+            self.queue.update(entry, engine="segmented")
+            self.start_job(entry)
+            return
+        request.setDownloadDirectory(os.path.dirname(entry["path"]))
+        request.setDownloadFileName(os.path.basename(entry["path"]))
+
+        self.requests[entry["id"]] = request
+        request.receivedBytesChanged.connect(lambda e=entry, r=request: self.on_progress(e, r))
+        request.totalBytesChanged.connect(lambda e=entry, r=request: self.on_progress(e, r))
+        request.stateChanged.connect(lambda state, e=entry, r=request: self.on_state_changed(e, r, state))
+        request.accept()
+
+    def on_state_changed(self, entry, request, state):
+        if state == State.DownloadInProgress:
+            if entry["state"] == QUEUED:
+                if self.active_count() < self.max_concurrent:
+                    self.queue.update(entry, state=ACTIVE)
+                else:
+                    request.pause()
+                    self.queue.update(entry, state=PAUSED)
+        elif state == State.DownloadCompleted:
+            self.finish(entry, COMPLETED)
+        elif state == State.DownloadCancelled:
+            self.finish(entry, CANCELLED)
+        elif state == State.DownloadInterrupted:
+            self.finish(entry, FAILED, request.interruptReasonString())
+        self.changed.emit(entry)
+
+    def on_progress(self, entry, request):
+        self.queue.update(entry, save=False, received=request.receivedBytes(), total=max(0, request.totalBytes()))
+        if not self.save_timer.isActive():
+            self.save_timer.start()
+        self.changed.emit(entry)
+
+    def finish(self, entry, state, error=""):
+        self.requests.pop(entry["id"], None)
+        self.pages.pop(entry["id"], None)
+        self.queue.update(entry, state=state, error=error)
+        self.schedule()
+
+    def schedule(self):
+        # Libera os próximos pausados pela fila
+        for entry_id in self.order:
+            if self.active_count() >= self.max_concurrent:
+                break
+            if entry_id in self.jobs:
+                continue
+            entry = self.queue.get(entry_id)
+            request = self.requests.get(entry_id)
+            if request is not None and entry["state"] == PAUSED and not entry.get("user_paused"):
+                request.resume()
+                self.queue.update(entry, state=ACTIVE)
+                self.changed.emit(entry)
+
+    # --- Motor segmentado ---
+    def on_cookie_added(self, cookie):
+        self.cookies[(cookie.domain(), cookie.path(), bytes(cookie.name()))] = QNetworkCookie(cookie)
+
+    def on_cookie_removed(self, cookie):
+        self.cookies.pop((cookie.domain(), cookie.path(), bytes(cookie.name())), None)
+
+    def cookie_jar(self):
+        from requests.cookies import RequestsCookieJar
+        jar = RequestsCookieJar()
+        for cookie in self.cookies.values():
+            jar.set(bytes(cookie.name()).decode("utf-8", "ignore"), bytes(cookie.value()).decode("utf-8", "ignore"),
+                    domain=cookie.domain(), path=cookie.path() or "/", secure=cookie.isSecure())
+        return jar
+
+    def start_job(self, entry):
+        if self.session is None:
+            self.session = make_session(self.max_concurrent * self.segments)
+        channel = self.scheduler.channel(entry["id"], entry.get("priority", self.default_priority))
+        self.channels[entry["id"]] = channel
+        job = SegmentedDownload(
+            entry["url"], entry["path"], segments=self.segments, session=self.session,
+            headers={"User-Agent": self.profile.httpUserAgent()}, cookies=self.cookie_jar(),
+            throttle=channel.throttle,
+        )
+        last = [0.0]
+
+        def progress(received, total, entry_id=entry["id"]):
+            now = time.monotonic()
+            if now - last[0] >= PROGRESS_INTERVAL:
+                last[0] = now
+                self.engine_progress.emit(entry_id, received, total)
+
+        job.progress = progress
+        self.jobs[entry["id"]] = job
+        self.queue.update(entry, state=QUEUED, error="", user_paused=False)
+        self.changed.emit(entry)
+        self.pool.submit(self.run_job, entry["id"], job)
+
+    def run_job(self, entry_id, job):
+        # Roda no pool; fala com a GUI só por sinais
+        self.engine_progress.emit(entry_id, job.received(), job.size)
+        try:
+            result = job.run()
+            self.engine_finished.emit(entry_id, COMPLETED, result)
+        except DownloadCancelled:
+            self.engine_finished.emit(entry_id, PAUSED, None)
+        except Exception as e:
+            self.engine_finished.emit(entry_id, FAILED, str(e))
+
+    def on_engine_progress(self, entry_id, received, total):
+        entry = self.queue.get(entry_id)
+        if entry is None or entry_id not in self.jobs:
+            return
+        fields = {"received": received, "total": total}
+        if entry["state"] == QUEUED:
+            fields["state"] = ACTIVE
+        self.queue.update(entry, save=False, **fields)
+        if not self.save_timer.isActive():
+            self.save_timer.start()
+        self.changed.emit(entry)
+
+    def on_engine_finished(self, entry_id, state, result):
+        job = self.jobs.pop(entry_id, None)
+        self.pages.pop(entry_id, None)
+        channel = self.channels.pop(entry_id, None)
+        if channel is not None:
+            channel.close()
+        entry = self.queue.get(entry_id)
+        if entry is None:
+            return
+        if state == COMPLETED:
+            self.queue.update(entry, state=COMPLETED, received=result["size"], total=result["size"], sha256=result["sha256"])
+        elif state == FAILED:
+            self.queue.update(entry, state=FAILED, error=result or "")
+        elif entry.get("cancel_requested"):
+            for suffix in (PART_SUFFIX, JOURNAL_SUFFIX):
+                if os.path.exists(entry["path"] + suffix):
+                    os.unlink(entry["path"] + suffix)
+            self.queue.update(entry, state=CANCELLED, cancel_requested=False)
+        else:
+            self.queue.update(entry, state=PAUSED, received=job.received() if job else entry["received"])
+        self.changed.emit(entry)
+        self.schedule()
+
+    # --- Banda ---
+    def set_priority(self, entry_id, priority):
+        entry = self.queue.get(entry_id)
+        if entry is None or priority not in PRIORITIES:
+            return
+        self.queue.update(entry, priority=priority)
+        channel = self.channels.get(entry_id)
+        if channel is not None:
+            channel.set_priority(priority)
+        self.changed.emit(entry)
+
+    def rates(self):
+        return self.scheduler.rates()
+
+    # --- Ações do painel ---
+    def pause(self, entry_id):
+        entry = self.queue.get(entry_id)
+        job = self.jobs.get(entry_id)
+        if job is not None:
+            # O journal fica no disco; retomar continua dos mesmos offsets
+            entry["user_paused"] = True
+            job.cancel()
+            return
+        request = self.requests.get(entry_id)
+        if request is not None and entry["state"] == ACTIVE:
+            request.pause()
+            self.queue.update(entry, state=PAUSED, user_paused=True)
+            self.changed.emit(entry)
+            self.schedule()
+
+    def resume(self, entry_id):
+        entry = self.queue.get(entry_id)
+        if entry is None:
+            return
+        if entry_id in self.jobs:
+            return
+        if entry.get("engine") == "segmented":
+            self.start_job(entry)
+            return
+        request = self.requests.get(entry_id)
+        if request is None:
+            self.restart(entry)
+            return
+        entry["user_paused"] = False
+        if entry["state"] == PAUSED and self.active_count() < self.max_concurrent:
+            request.resume()
+            self.queue.update(entry, state=ACTIVE)
+            self.changed.emit(entry)
+
+    def cancel(self, entry_id):
+        job = self.jobs.get(entry_id)
+        if job is not None:
+            self.queue.get(entry_id)["cancel_requested"] = True
+            job.cancel()
+            return
+        request = self.requests.get(entry_id)
+        if request is not None:
+            request.cancel()
+        else:
+            entry = self.queue.get(entry_id)
+            if entry is not None:
+                self.queue.update(entry, state=CANCELLED)
+                self.changed.emit(entry)
+
+    def restart(self, entry):
+        # Reenvia pela engine para reaproveitar cookies e sessão do perfil
+        if self.restart_page is None:
+            self.restart_page = QWebEnginePage(self.profile, self)
+        self.queue.update(entry, state=QUEUED, received=0, error="", user_paused=False)
+        if os.path.exists(entry["path"]):
+            os.unlink(entry["path"])
+        self.changed.emit(entry)
+        self.restart_page.download(QUrl(entry["url"]), entry["path"])
+
+    def restore(self):
+        # Downloads que ficaram pela metade na última execução voltam para a fila
+        for entry in self.queue.pending():
+            self.order.append(entry["id"])
+            if entry.get("user_paused"):
+                continue
+            if entry.get("engine") == "segmented":
+                self.start_job(entry)
+            else:
+                self.restart(entry)
+
+    def clear_finished(self):
+        self.queue.remove_finished()
+        self.order = [i for i in self.order if self.queue.get(i) is not None]
+
+    def entries(self):
+        return self.queue.entries
+
+    def close(self):
+        # Ao sair: os jobs segmentados param (journal fica no disco e retomam na
+        # próxima execução) e o pool não segura o processo até o fim do arquivo
+        for job in list(self.jobs.values()):
+            job.cancel()
+        self.pool.shutdown(wait=False, cancel_futures=True)
+        self.queue.save()
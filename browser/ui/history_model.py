@@ -0,0 +1,155 @@
+import os, sys, bisect
+from collections import OrderedDict
+
+BROWSER_PATH = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+sys.path.append(BROWSER_PATH)
+
+from PySide6.QtCore import Qt, QAbstractListModel, QModelIndex
+from PySide6.QtGui import QFont
+
+from browser.api.history_store import GROUP_DOMAIN
+
+PAGE_SIZE = 256
+# Páginas mantidas em memória (LRU)
+MAX_PAGES = 64
+
+HEADER_ROLE = Qt.UserRole + 1
+URL_ROLE = Qt.UserRole
+
+
+# ---------------- HistoryModel ----------------
+# Lista virtual do histórico: só conta as linhas e busca páginas do HistoryStore
+# quando a view pede uma linha visível. Com agrupamento, cada grupo ocupa uma linha
+# de cabeçalho seguida das suas entradas; "starts" guarda a linha do cabeçalho de
+# cada grupo para localizar uma linha com bisect.
+class HistoryModel(QAbstractListModel):
+    def __init__(self, store, parent=None):
+        super().__init__(parent)
+        self.store = store
+        self.text = ""
+        self.group = None
+        self.groups = []
+        self.starts = []
+        self.total = 0
+        self.pages = OrderedDict()
+        self.loaded = False
+        self.stale = False
+        self.header_font = QFont()
+        self.header_font.setBold(True)
+        store.listeners.append(self.on_history_event)
+
+    def on_history_event(self, kind, key, url, value):
+        self.stale = True
+
+    # --- Consulta ---
+    def refresh(self):
+        self.beginResetModel()
+        self.pages.clear()
+        if self.group:
+            self.groups = self.store.groups(self.group, self.text)
+        else:
+            self.groups = [(None, self.store.count(self.text))]
+        self.starts = []
+        row = 0
+        for key, count in self.groups:
+            self.starts.append(row)
+            row += count + (1 if self.group else 0)
+        self.total = row
+        self.loaded = True
+        self.stale = False
+        self.endResetModel()
+
+    def set_filter(self, text):
+        text = text.strip()
+        if text != self.text:
+            self.text = text
+            self.refresh()
+
+    def set_group(self, group):
+        if group != self.group:
+            self.group = group
+            self.refresh()
+
+    def locate(self, row):
+        # (índice do grupo, posição no grupo); -1 = cabeçalho
+        index = bisect.bisect_right(self.starts, row) - 1
+        offset = row - self.starts[index]
+        return index, offset - 1 if self.group else offset
+
+    def header_index(self, row):
+        return self.index(self.starts[self.locate(row)[0]], 0)
+
+    def entry(self, group_index, offset):
+        page_key = (group_index, offset // PAGE_SIZE)
+        page = self.pages.get(page_key)
+        if page is None:
+            key = self.groups[group_index][0]
+            page = self.store.page(page_key[1] * PAGE_SIZE, PAGE_SIZE, self.text, self.group, key)
+            self.pages[page_key] = page
+            if len(self.pages) > MAX_PAGES:
+                self.pages.popitem(last=False)
+        else:
+            self.pages.move_to_end(page_key)
+        offset %= PAGE_SIZE
+        return page[offset] if offset < len(page) else None
+
+    def header_text(self, key, count):
+        if self.group == GROUP_DOMAIN:
+            return f"{key or '(sem domínio)'}  ({count})"
+        return f"{key}  ({count})"
+
+    # --- QAbstractListModel ---
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.total
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or index.row() >= self.total:
+            return None
+        group_index, offset = self.locate(index.row())
+        if offset < 0:
+            key, count = self.groups[group_index]
+            if role == Qt.DisplayRole:
+                return self.header_text(key, count)
+            if role == Qt.FontRole:
+                return self.header_font
+            if role == HEADER_ROLE:
+                return key
+            return None
+        if role not in (Qt.DisplayRole, Qt.ToolTipRole, URL_ROLE):
+            return None
+        entry = self.entry(group_index, offset)
+        if entry is None:
+            return None
+        url, title = entry[0], entry[1]
+        if role == Qt.DisplayRole:
+            return f"{title}  —  {url}" if title else url
+        return url
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        if self.group and self.locate(index.row())[1] < 0:
+            return Qt.ItemIsEnabled
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable
+
+    # --- Exclusão ---
+    def urls_for(self, indexes):
+        # URLs das linhas; um cabeçalho leva o grupo inteiro
+        urls = []
+        for index in indexes:
+            group_index, offset = self.locate(index.row())
+            if offset < 0:
+                urls.extend(self.store.group_urls(self.group, self.groups[group_index][0], self.text))
+            else:
+                entry = self.entry(group_index, offset)
+                if entry is not None:
+                    urls.append(entry[4])
+        return list(dict.fromkeys(urls))
+
+    def delete(self, indexes):
+        urls = self.urls_for(indexes)
+        if urls:
+            self.store.delete(urls)
+            self.store.flush()
+            self.refresh()
+        return len(urls)
@@ -0,0 +1,100 @@
+import os, sys, time
+
+BROWSER_PATH = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+sys.path.append(BROWSER_PATH)
+
+from PySide6.QtCore import QObject, QTimer, Signal
+from PySide6.QtWebEngineCore import QWebEnginePage
+
+from browser.api.idle import CpuSavings, domain_allowed, DEFAULT_FREEZE_AFTER
+
+CHECK_INTERVAL_MS = 5000
+State = QWebEnginePage.LifecycleState
+
+
+# ---------------- IdleScheduler ----------------
+# Abas em segundo plano há "after_seconds" (contados desde que a aba saiu de foco)
+# vão de Active para Frozen (timers, animações e scripts param; a página continua
+# na memória). Ficam de fora abas tocando áudio, com download ativo ou de
+# domínios em "allow_domains".
+# Voltam para Active ao serem ativadas.
+class IdleScheduler(QObject):
+    reported = Signal(object)
+
+    def __init__(self, tabs, config=None, downloads=None, parent=None):
+        super().__init__(parent)
+        config = (config or {}).get("freeze", {})
+        self.tabs = tabs
+        self.downloads = downloads
+        self.enabled = bool(config.get("enabled", True))
+        self.after = float(config.get("after_seconds", DEFAULT_FREEZE_AFTER))
+        self.allow = {d.strip().lower() for d in config.get("allow_domains", []) if d.strip()}
+        self.savings = CpuSavings()
+        self.timer = QTimer(self)
+        self.timer.setInterval(CHECK_INTERVAL_MS)
+        self.timer.timeout.connect(self.check)
+        self.timer.start()
+
+    def browser_tabs(self):
+        for i in range(self.tabs.count()):
+            tab = self.tabs.widget(i)
+            if getattr(tab, "web_view", None) is not None:
+                yield tab
+
+    def exempt(self, page, busy_pages):
+        return (
+            page.recentlyAudible()
+            or page in busy_pages
+            or domain_allowed(page.url().host().lower(), self.allow)
+        )
+
+    def check(self):
+        now = time.monotonic()
+        current = self.tabs.currentWidget()
+        busy_pages = self.downloads.busy_pages() if self.downloads is not None else set()
+        pids = set()
+        for tab in self.browser_tabs():
+            page = tab.web_view.page()
+            state = page.lifecycleState()
+            if state == State.Discarded:
+                self.savings.thaw(tab, now)
+                continue
+            pid = page.renderProcessPid()
+            pids.add(pid)
+            if state == State.Frozen:
+                if tab is current or self.exempt(page, busy_pages):
+                    self.thaw(tab)
+                continue
+            self.savings.sample(pid, now)
+            if (
+                self.enabled
+                and tab is not current
+                and now - tab.last_active >= self.after
+                and page.recommendedState() != State.Active
+                and not self.exempt(page, busy_pages)
+            ):
+                page.setLifecycleState(State.Frozen)
+                self.savings.freeze(tab, pid, now)
+        self.savings.prune(pids)
+        self.reported.emit(self.report())
+
+    def thaw(self, tab):
+        if tab.web_view is None:
+            return
+        page = tab.web_view.page()
+        if page.lifecycleState() == State.Frozen:
+            page.setLifecycleState(State.Active)
+        self.savings.thaw(tab)
+
+    def forget(self, tab):
+        # Chamado com a aba já fora do QTabWidget
+        self.savings.thaw(tab)
+        if tab.web_view is None:
+            return
+        pid = tab.web_view.page().renderProcessPid()
+        if all(other.web_view.page().renderProcessPid() != pid for other in self.browser_tabs()):
+            self.savings.forget(pid)
+
+    def report(self):
+        frozen = sum(1 for tab in self.browser_tabs() if tab.web_view.page().lifecycleState() == State.Frozen)
+        return {"frozen": frozen, "cpu_saved": self.savings.total()}
@@ -0,0 +1,33 @@
+import os, sys
+
+BROWSER_PATH = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+sys.path.append(BROWSER_PATH)
+
+from PySide6.QtCore import Signal
+from PySide6.QtWidgets import QWidget, QVBoxLayout
+
+
+# ---------------- LazyPanel ----------------
+# Lugar de uma aba lateral: o painel de verdade (factory()) só é construído quando
+# a aba aparece pela primeira vez, fora do caminho até a primeira janela.
+class LazyPanel(QWidget):
+    built = Signal(object)
+
+    def __init__(self, factory, parent=None):
+        super().__init__(parent)
+        self.factory = factory
+        self.widget = None
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(0)
+
+    def build(self):
+        if self.widget is None:
+            self.widget = self.factory()
+            self.layout().addWidget(self.widget)
+            self.built.emit(self.widget)
+        return self.widget
+
+    def showEvent(self, event):
+        self.build()
+        super().showEvent(event)
@@ -0,0 +1,66 @@
+import os, sys
+
+BROWSER_PATH = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+sys.path.append(BROWSER_PATH)
+
+from PySide6.QtCore import QObject, QTimer, QUrl
+
+from browser.api import trace_events
+from browser.api.page_loads import LoadQueue, FOREGROUND, BACKGROUND, DEFAULT_MAX_CONCURRENT, DEFAULT_TIMEOUT
+
+CHECK_INTERVAL_MS = 1000
+
+
+# ---------------- LoadScheduler ----------------
+# Abre abas sem disparar todos os carregamentos juntos: a aba visível começa na
+# hora, as outras esperam vaga (seção "loading" do config.json: max_concurrent,
+# timeout_seconds). A vaga é liberada no loadFinished ou no timeout.
+class LoadScheduler(QObject):
+    def __init__(self, tabs, config=None, parent=None):
+        super().__init__(parent)
+        config = (config or {}).get("loading", {})
+        self.tabs = tabs
+        self.queue = LoadQueue(config.get("max_concurrent", DEFAULT_MAX_CONCURRENT))
+        self.timeout = float(config.get("timeout_seconds", DEFAULT_TIMEOUT))
+        self.timer = QTimer(self)
+        self.timer.setInterval(CHECK_INTERVAL_MS)
+        self.timer.timeout.connect(self.check_timeouts)
+
+    def enqueue(self, tab, url, priority=BACKGROUND):
+        if not getattr(tab, "load_connected", False):
+            tab.web_view.loadFinished.connect(lambda ok, t=tab: self.finished(t))
+            tab.load_connected = True
+        tab.url_bar.setText(url)
+        tab.url_bar.setCursorPosition(0)
+        self.queue.push(tab, url, priority)
+        self.start_ready()
+
+    def promote(self, tab):
+        # Aba selecionada antes de carregar passa na frente e não espera vaga
+        if self.queue.is_queued(tab):
+            self.queue.promote(tab, FOREGROUND)
+            self.start_ready()
+
+    def cancel(self, tab):
+        self.queue.remove(tab)
+        self.start_ready()
+
+    def finished(self, tab):
+        if self.queue.done(tab):
+            self.start_ready()
+
+    def check_timeouts(self):
+        if self.queue.expired(self.timeout):
+            self.start_ready()
+
+    def start_ready(self):
+        for tab, url in self.queue.ready():
+            if self.tabs.indexOf(tab) == -1:
+                self.queue.done(tab)
+                continue
+            tab.web_view.setUrl(QUrl(url))
+        trace_events.counter("page_loads", running=len(self.queue.running), queued=self.queue.pending())
+        if self.queue.running or self.queue.pending():
+            self.timer.start()
+        else:
+            self.timer.stop()
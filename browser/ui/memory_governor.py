@@ -0,0 +1,58 @@
+import os, sys, time
+
+BROWSER_PATH = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+sys.path.append(BROWSER_PATH)
+
+from PySide6.QtCore import QObject, QTimer, Signal
+
+from browser.api import trace_events
+from browser.api.memory import parse_size, process_rss, choose_victims
+
+SAMPLE_INTERVAL_MS = 10000
+
+
+# ---------------- MemoryGovernor ----------------
+# Amostra o RSS dos renderers das abas (/proc) e, acima do orçamento "ram" do
+# config.json, descarta as abas em segundo plano usadas há mais tempo. A aba guarda
+# URL, título e scroll e volta sozinha quando é ativada (BrowserTab.restore).
+class MemoryGovernor(QObject):
+    discarded = Signal(object)
+
+    def __init__(self, tabs, config, parent=None):
+        super().__init__(parent)
+        self.tabs = tabs
+        self.budget = parse_size((config or {}).get("ram", 0))
+        self.last_total = 0
+        self.timer = QTimer(self)
+        self.timer.setInterval(SAMPLE_INTERVAL_MS)
+        self.timer.timeout.connect(self.check)
+        if self.budget:
+            self.timer.start()
+
+    def browser_tabs(self):
+        for i in range(self.tabs.count()):
+            tab = self.tabs.widget(i)
+            if hasattr(tab, "discard"):
+                yield tab
+
+    def sample(self):
+        current = self.tabs.currentWidget()
+        samples = []
+        for tab in self.browser_tabs():
+            if tab.discarded or tab.web_view is None:
+                continue
+            pid = tab.web_view.page().renderProcessPid()
+            protected = tab is current or tab.web_view.page().recentlyAudible()
+            samples.append((tab, pid, process_rss(pid), tab.last_active, protected))
+        return samples
+
+    def check(self):
+        victims, self.last_total = choose_victims(self.sample(), self.budget)
+        trace_events.counter("renderer_memory", mb=round(self.last_total / 1024 ** 2))
+        for tab in victims:
+            tab.discard()
+            self.discarded.emit(tab)
+
+    def touch(self, tab):
+        if hasattr(tab, "last_active"):
+            tab.last_active = time.monotonic()
@@ -0,0 +1,99 @@
+import os, sys, time
+
+BROWSER_PATH = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+sys.path.append(BROWSER_PATH)
+
+from PySide6.QtCore import QObject, QTimer
+
+from browser.ui.user_scripts import World
+from browser.api.domains import registrable_domain
+from browser.api.page_metrics import MetricsStore, DEFAULT_RETENTION_DAYS
+
+SCRIPT_NAME = "nav_timing"
+SCRIPT_FILE = "nav_timing.js"
+TIMING_JS = "typeof __pac22Timing === 'function' ? __pac22Timing() : null"
+# loadEventEnd pode ainda estar zerado no loadFinished: tenta de novo algumas vezes
+TIMING_RETRIES = 3
+TIMING_RETRY_MS = 300
+FLUSH_INTERVAL_MS = 5000
+
+
+# ---------------- PageTimingCollector ----------------
+# Mede loadStarted -> loadFinished de cada navegação das abas e completa com o
+# Navigation/Paint Timing lido do script nav_timing (ApplicationWorld). As linhas
+# vão para o MetricsStore em <perfil>/metrics.sqlite, gravadas em lote.
+# Relatório: python3 browser/api/page_metrics.py <perfil>
+class PageTimingCollector(QObject):
+    def __init__(self, profile, config=None, parent=None):
+        super().__init__(parent)
+        config = (config or {}).get("metrics", {})
+        self.enabled = bool(config.get("enabled", True))
+        self.scripts = profile.user_scripts
+        self.store = None
+        if not self.enabled:
+            return
+        self.store = MetricsStore(profile.path, run=int(time.time()),
+                                  retention_days=config.get("retention_days", DEFAULT_RETENTION_DAYS))
+        self.scripts.register_file(SCRIPT_NAME, SCRIPT_FILE, subframes=False)
+        self.flush_timer = QTimer(self)
+        self.flush_timer.setSingleShot(True)
+        self.flush_timer.setInterval(FLUSH_INTERVAL_MS)
+        self.flush_timer.timeout.connect(self.store.flush)
+
+    def watch(self, page):
+        if not self.enabled:
+            return
+        page.timing_start = None
+        page.timing_generation = 0
+        page.loadStarted.connect(lambda: self.load_started(page))
+        page.loadFinished.connect(lambda ok: self.load_finished(page, ok))
+
+    def load_started(self, page):
+        page.timing_start = time.monotonic()
+        page.timing_generation += 1
+
+    def load_finished(self, page, ok):
+        start, page.timing_start = page.timing_start, None
+        if start is None:
+            return
+        url = page.url()
+        if url.scheme() not in ("http", "https"):
+            return
+        timings = {"wall": (time.monotonic() - start) * 1000}
+        if not ok or not self.scripts.is_enabled(SCRIPT_NAME):
+            self.record(url, ok, timings)
+            return
+        self.poll(page, url, timings, page.timing_generation, TIMING_RETRIES)
+
+    def poll(self, page, url, timings, generation, tries):
+        page.runJavaScript(TIMING_JS, World.ApplicationWorld.value,
+                           lambda result: self.collected(page, url, timings, generation, tries, result))
+
+    def collected(self, page, url, timings, generation, tries, result):
+        # Outra navegação começou nesse meio tempo: fica só o tempo medido no Qt
+        if page.timing_generation != generation:
+            result = None
+        elif result is None and tries > 0:
+            QTimer.singleShot(TIMING_RETRY_MS, page, lambda: self.poll(page, url, timings, generation, tries - 1))
+            return
+        if isinstance(result, dict):
+            timings = dict(result, wall=timings["wall"])
+        self.record(url, True, timings, (result or {}).get("type", ""))
+
+    def record(self, url, ok, timings, kind=""):
+        if self.store is None:
+            return
+        origin = f"{url.scheme()}://{url.host()}" + (f":{url.port()}" if url.port() != -1 else "")
+        self.store.add(origin, registrable_domain(url.host()), ok, timings, kind)
+        if not self.flush_timer.isActive():
+            self.flush_timer.start()
+
+    def flush(self):
+        if self.store is not None:
+            self.store.flush()
+
+    def close(self):
+        if self.store is not None:
+            self.store.close()
+            self.store = None
+            self.enabled = False
@@ -1,4 +1,4 @@
-import tldextract, sys, uuid, json, os, importlib
+import sys, uuid, json, os, importlib
 
 BROWSER_PATH = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
 sys.path.append( BROWSER_PATH );
@@ -7,15 +7,43 @@ from PySide6.QtWidgets import QLayout, QDialog, QApplication, QMainWindow, QVBox
 from PySide6.QtWebEngineWidgets import QWebEngineView
 from PySide6.QtGui import QAction
 from PySide6.QtCore import Qt, QSize
-from PySide6.QtWebEngineCore import QWebEnginePage, QWebEngineProfile, QWebEngineSettings, QWebEngineUrlRequestInterceptor
+from PySide6.QtWebEngineCore import QWebEnginePage, QWebEngineProfile, QWebEngineSettings, QWebEngineUrlRequestInterceptor, QWebEngineUrlRequestInfo
 from urllib.parse import urlparse
+from browser.api.blocklist import Blocklist
+from browser.api.site_settings import SiteSettings
+from browser.api.data_saver import data_saver_settings
+from browser.api.http_cache import cache_settings, CACHE_FOLDER
+from browser.ui.user_scripts import UserScriptRegistry
+
+BLOCKLIST_FOLDER = "blocklist"
+CACHE_TYPES = {
+    "disk": QWebEngineProfile.HttpCacheType.DiskHttpCache,
+    "memory": QWebEngineProfile.HttpCacheType.MemoryHttpCache,
+    "none": QWebEngineProfile.HttpCacheType.NoCache,
+}
+
+
+def apply_http_cache(profile, folder, cache):
+    # Cache HTTP em <folder>/cache, separado do armazenamento persistente
+    profile.setCachePath(os.path.join(folder, CACHE_FOLDER))
+    profile.setHttpCacheType(CACHE_TYPES[cache["type"]])
+    profile.setHttpCacheMaximumSize(cache["max_size"])
+
+# Scripts de tema/auxiliares: nome -> (arquivo em resources/scripts, opções do register).
+# A barra de rolagem é da página: iframes (anúncios, embeds) não precisam do script
+USER_SCRIPTS = {"dark_scrollbar": ("dark_scrollbar.js", {"subframes": False})}
 
 
 class WebEngineUrlRequestInterceptor(QWebEngineUrlRequestInterceptor):
-    def __init__(self, parent=None):
+    def __init__(self, blocklist=None, parent=None):
         super().__init__(parent)
+        self.blocklist = blocklist;
     def interceptRequest(self, info):
-        pass;
+        # Navegação principal fica com o acceptNavigationRequest da página
+        if self.blocklist is None or info.resourceType() == QWebEngineUrlRequestInfo.ResourceType.ResourceTypeMainFrame:
+            return;
+        if self.blocklist.is_blocked(info.requestUrl().host()):
+            info.block(True);
 #settings.imageAnimationPolicy: appSettings.imageAnimationPolicy
 #devToolsEnabled
 
@@ -24,14 +52,26 @@ class PrivateProfile(QWebEngineProfile):
     def __init__(self, path, config, parent=None):
         super().__init__("default")
         self.path = path;
-        self.intercept = WebEngineUrlRequestInterceptor();
+        # Listas hosts/EasyList em <path>/blocklist, compiladas e mapeadas em memória
+        self.blocklist = Blocklist.load(os.path.join(self.path, BLOCKLIST_FOLDER));
+        self.intercept = WebEngineUrlRequestInterceptor(self.blocklist);
         self.setUrlRequestInterceptor(self.intercept);
+        # Overrides por site (<path>/site_settings.json), aplicados em cada CustomWebEnginePage
+        self.site_settings = SiteSettings.load(self.path);
+        # Seção "data_saver": regras por tipo de recurso, lidas pelo interceptor de cada página
+        self.data_saver = data_saver_settings(config);
+        # Injetados pelo próprio perfil em DocumentCreation (seção "scripts" liga/desliga)
+        self.user_scripts = UserScriptRegistry();
+        self.user_scripts.attach(self);
+        for name, (filename, options) in USER_SCRIPTS.items():
+            self.user_scripts.register_file(name, filename, enabled=config.get("scripts", {}).get(name, True), **options);
         #self.setPersistentCookiesPolicy(QWebEngineProfile.NoPersistentCookies)
         self.setPersistentCookiesPolicy(QWebEngineProfile.ForcePersistentCookies);
-        self.setHttpCacheType(QWebEngineProfile.MemoryHttpCache)
         self.setPersistentPermissionsPolicy(QWebEngineProfile.PersistentPermissionsPolicy.StoreOnDisk);
         self.setPersistentStoragePath( os.path.join( self.path, "default" ) )
-        self.setCachePath( os.path.join( self.path, "default" ) );
+        # Seção "cache": type (disk/memory/none), max_size, warm_top, warm_delay_seconds
+        self.cache = cache_settings(config);
+        apply_http_cache(self, self.path, self.cache);
         settings = self.settings()
         settings.setAttribute(QWebEngineSettings.LocalStorageEnabled,               config["settings"]["LocalStorageEnabled"]); 
         settings.setAttribute(QWebEngineSettings.XSSAuditingEnabled,                config["settings"]["XSSAuditingEnabled"]);
@@ -0,0 +1,380 @@
+import os, sys, json, base64
+
+BROWSER_PATH = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+sys.path.append(BROWSER_PATH)
+
+from PySide6.QtCore import QObject, QTimer, QBuffer, QByteArray, QIODevice
+from PySide6.QtNetwork import QLocalServer
+
+from browser.api.event_log import get_logger, fields
+from browser.api.page_loads import normalize_url
+from browser.ui.custom_web_engine_page import WEB_ATTRIBUTES
+from browser.api.rpc_client import (rpc_name, RpcClient, RpcError, PARSE_ERROR, INVALID_REQUEST, METHOD_NOT_FOUND,
+                                    INVALID_PARAMS, INTERNAL_ERROR, TAB_NOT_FOUND, TIMEOUT)
+
+MAX_MESSAGE = 16 * 1024 * 1024
+DEFAULT_WAIT_TIMEOUT = 30
+DEFAULT_EVAL_TIMEOUT = 10
+MAIN_WORLD = 0
+PROBE_TIMEOUT = 2.0
+
+log = get_logger("rpc")
+
+
+def error_response(request_id, error):
+    return {"jsonrpc": "2.0", "id": request_id, "error": error.to_json()}
+
+
+def result_response(request_id, result):
+    return {"jsonrpc": "2.0", "id": request_id, "result": result}
+
+
+def rpc_alive(name, timeout=PROBE_TIMEOUT):
+    # True se outro navegador responde ao ping no socket
+    try:
+        with RpcClient(name, timeout=timeout) as rpc:
+            return rpc.call("ping") == "pong"
+    except (OSError, ValueError, RpcError):
+        return False
+
+
+# ---------------- LoadWaiter ----------------
+# Espera o próximo loadFinished de uma aba (ou o timeout) e responde uma vez só.
+# Apagar o objeto desfaz a conexão com o sinal.
+class LoadWaiter(QObject):
+    def __init__(self, server, tab, timeout, respond):
+        super().__init__(server)
+        self.server = server
+        self.tab = tab
+        self.respond = respond
+        tab.web_view.loadFinished.connect(self.finished)
+        QTimer.singleShot(int(timeout * 1000), self, self.expired)
+
+    def finished(self, ok):
+        self.server.expecting.discard(self.tab.session_id)
+        self.respond(self.server.tab_info(self.tab) | {"ok": ok})
+        self.deleteLater()
+
+    def expired(self):
+        self.respond(error=RpcError(TIMEOUT, "a página não terminou de carregar"))
+        self.deleteLater()
+
+
+# ---------------- RpcServer ----------------
+# API de automação local: JSON-RPC 2.0 no socket do usuário (QLocalServer, só o
+# dono acessa), uma mensagem por linha. Tudo o que chega numa leitura é despachado
+# na mesma passada do event loop, então chamadas em pipeline ou em lote (array
+# JSON-RPC) não pagam uma ida e volta da GUI cada. Métodos assíncronos (esperar
+# carregamento, JS, texto) respondem quando terminam, fora de ordem.
+class RpcServer(QObject):
+    def __init__(self, browser, name=None, parent=None):
+        super().__init__(parent)
+        self.browser = browser
+        self.name = name or rpc_name()
+        self.server = QLocalServer(self)
+        self.server.setSocketOptions(QLocalServer.SocketOption.UserAccessOption)
+        self.server.newConnection.connect(self.accept)
+        self.buffers = {}
+        # Abas com navegação pedida pela API que ainda não chegou ao loadFinished
+        self.expecting = set()
+        self.methods = {
+            "ping": self.ping,
+            "tabs.list": self.tabs_list,
+            "tabs.open": self.tabs_open,
+            "tabs.close": self.tabs_close,
+            "tabs.activate": self.tabs_activate,
+            "tab.info": self.tab_info_method,
+            "tab.navigate": self.tab_navigate,
+            "tab.wait_load": self.tab_wait_load,
+            "tab.eval": self.tab_eval,
+            "tab.text": self.tab_text,
+            "tab.html": self.tab_html,
+            "tab.screenshot": self.tab_screenshot,
+            "sites.list": self.sites_list,
+            "site.get": self.site_get,
+            "site.set": self.site_set,
+            "site.clear": self.site_clear,
+        }
+
+    # --- Conexões ---
+    def listen(self):
+        # Com UserAccessOption o listen troca o arquivo do socket sem reclamar: não
+        # rouba o socket de outro navegador que ainda responde nele
+        if rpc_alive(self.name):
+            return False
+        if self.server.listen(self.name):
+            return True
+        # Socket órfão de uma execução que caiu
+        QLocalServer.removeServer(self.name)
+        return self.server.listen(self.name)
+
+    def accept(self):
+        while self.server.hasPendingConnections():
+            socket = self.server.nextPendingConnection()
+            self.buffers[socket] = b""
+            socket.readyRead.connect(lambda s=socket: self.read(s))
+            socket.disconnected.connect(lambda s=socket: self.drop(s))
+
+    def read(self, socket):
+        data = self.buffers.get(socket, b"") + bytes(socket.readAll())
+        *lines, rest = data.split(b"\n")
+        if len(rest) > MAX_MESSAGE:
+            socket.abort()
+            return
+        self.buffers[socket] = rest
+        for line in lines:
+            if line.strip():
+                self.handle_line(socket, line)
+
+    def drop(self, socket):
+        self.buffers.pop(socket, None)
+        socket.deleteLater()
+
+    def send(self, socket, response):
+        # Conexão pode ter caído antes de uma resposta assíncrona; o QLocalSocket
+        # junta as escritas de uma mesma passada do event loop
+        if response is None or socket not in self.buffers:
+            return
+        socket.write((json.dumps(response, ensure_ascii=False) + "\n").encode("utf-8"))
+
+    def close(self):
+        self.server.close()
+
+    # --- Despacho ---
+    def handle_line(self, socket, line):
+        try:
+            message = json.loads(line)
+        except ValueError:
+            self.send(socket, error_response(None, RpcError(PARSE_ERROR, "JSON inválido")))
+            return
+        if not isinstance(message, list):
+            self.dispatch(message, lambda response: self.send(socket, response))
+            return
+        if not message:
+            self.send(socket, error_response(None, RpcError(INVALID_REQUEST, "lote vazio")))
+            return
+        # Lote: uma resposta (array) quando todas as chamadas terminarem
+        results = [None] * len(message)
+        pending = [len(message)]
+
+        def collect(index, response):
+            results[index] = response
+            pending[0] -= 1
+            if pending[0] == 0:
+                responses = [r for r in results if r is not None]
+                if responses:
+                    self.send(socket, responses)
+        for index, item in enumerate(message):
+            self.dispatch(item, lambda response, i=index: collect(i, response))
+
+    def dispatch(self, message, done):
+        if not isinstance(message, dict) or not isinstance(message.get("method"), str):
+            done(error_response(None, RpcError(INVALID_REQUEST, "requisição inválida")))
+            return
+        request_id = message.get("id")
+        params = message.get("params") or {}
+        answered = [False]
+
+        def respond(result=None, error=None):
+            if answered[0]:
+                return
+            answered[0] = True
+            # Notificação (sem id): executa, mas não responde
+            if request_id is None:
+                done(None)
+            elif error is not None:
+                done(error_response(request_id, error))
+            else:
+                done(result_response(request_id, result))
+
+        handler = self.methods.get(message["method"])
+        if handler is None:
+            respond(error=RpcError(METHOD_NOT_FOUND, f"método desconhecido: {message['method']}"))
+            return
+        if not isinstance(params, dict):
+            respond(error=RpcError(INVALID_PARAMS, "params precisa ser um objeto"))
+            return
+        try:
+            handler(params, respond)
+        except RpcError as e:
+            respond(error=e)
+        except Exception as e:
+            log.exception("erro na API", extra=fields(method=message["method"]))
+            respond(error=RpcError(INTERNAL_ERROR, str(e)))
+
+    # --- Abas ---
+    def browser_tabs(self):
+        for i in range(self.browser.tabs.count()):
+            tab = self.browser.tabs.widget(i)
+            if hasattr(tab, "session_id"):
+                yield tab
+
+    def find_tab(self, params):
+        tab_id = params.get("id")
+        if tab_id is None:
+            tab = self.browser.tabs.currentWidget()
+            if hasattr(tab, "session_id"):
+                return tab
+        for tab in self.browser_tabs():
+            if tab.session_id == tab_id:
+                return tab
+        raise RpcError(TAB_NOT_FOUND, f"aba não encontrada: {tab_id}")
+
+    def live_tab(self, params):
+        # Aba restaurada ainda sem QWebEngineView: cria agora (como ao selecionar)
+        tab = self.find_tab(params)
+        if tab.web_view is None:
+            tab.materialize()
+        return tab
+
+    def tab_info(self, tab):
+        if tab.web_view is None:
+            state = tab.pending_state or {}
+            url, title = state.get("url", ""), state.get("title", "")
+        else:
+            url, title = tab.web_view.url().toString(), tab.web_view.title()
+        return {
+            "id": tab.session_id,
+            "index": self.browser.tabs.indexOf(tab),
+            "url": url,
+            "title": title,
+            "loading": self.is_loading(tab),
+            "current": tab is self.browser.tabs.currentWidget(),
+            "materialized": tab.web_view is not None,
+            "discarded": tab.discarded,
+        }
+
+    def is_loading(self, tab):
+        return tab.web_view is not None and (tab.loading or tab.session_id in self.expecting
+                                             or self.browser.loads.queue.is_queued(tab))
+
+    def expect_load(self, tab):
+        self.expecting.add(tab.session_id)
+        if not getattr(tab, "rpc_connected", False):
+            tab.web_view.loadFinished.connect(lambda ok, t=tab: self.expecting.discard(t.session_id))
+            tab.rpc_connected = True
+
+    # --- Métodos ---
+    def ping(self, params, respond):
+        respond("pong")
+
+    def tabs_list(self, params, respond):
+        respond([self.tab_info(tab) for tab in self.browser_tabs()])
+
+    def tab_info_method(self, params, respond):
+        respond(self.tab_info(self.find_tab(params)))
+
+    def tabs_open(self, params, respond):
+        url = normalize_url(params.get("url") or "")
+        tab = self.browser.new_tab(url, background=params.get("background", True))
+        self.expect_load(tab)
+        respond(self.tab_info(tab))
+
+    def tabs_close(self, params, respond):
+        tab = self.find_tab(params)
+        self.expecting.discard(tab.session_id)
+        self.browser.close_tab(self.browser.tabs.indexOf(tab))
+        respond(True)
+
+    def tabs_activate(self, params, respond):
+        tab = self.find_tab(params)
+        self.browser.tabs.setCurrentWidget(tab)
+        respond(self.tab_info(tab))
+
+    def tab_navigate(self, params, respond):
+        url = normalize_url(params.get("url") or "")
+        if not url:
+            raise RpcError(INVALID_PARAMS, "url obrigatória")
+        tab = self.live_tab(params)
+        tab.url_bar.setText(url)
+        tab.load_url()
+        self.expect_load(tab)
+        respond(self.tab_info(tab))
+
+    def tab_wait_load(self, params, respond):
+        tab = self.live_tab(params)
+        if not self.is_loading(tab):
+            respond(self.tab_info(tab) | {"ok": True})
+            return
+        LoadWaiter(self, tab, float(params.get("timeout", DEFAULT_WAIT_TIMEOUT)), respond)
+
+    def with_timeout(self, params, respond, default):
+        QTimer.singleShot(int(float(params.get("timeout", default)) * 1000), self,
+                          lambda: respond(error=RpcError(TIMEOUT, "sem resposta da página")))
+
+    def tab_eval(self, params, respond):
+        script = params.get("script")
+        if not isinstance(script, str):
+            raise RpcError(INVALID_PARAMS, "script obrigatório")
+        tab = self.live_tab(params)
+        self.with_timeout(params, respond, DEFAULT_EVAL_TIMEOUT)
+        tab.web_view.page().runJavaScript(script, int(params.get("world", MAIN_WORLD)), lambda result: respond(result))
+
+    def tab_text(self, params, respond):
+        tab = self.live_tab(params)
+        self.with_timeout(params, respond, DEFAULT_EVAL_TIMEOUT)
+        tab.web_view.page().toPlainText(lambda text: respond(text))
+
+    def tab_html(self, params, respond):
+        tab = self.live_tab(params)
+        self.with_timeout(params, respond, DEFAULT_EVAL_TIMEOUT)
+        tab.web_view.page().toHtml(lambda html: respond(html))
+
+    def tab_screenshot(self, params, respond):
+        # Só a aba visível é pintada pelo Chromium: "activate" seleciona antes
+        tab = self.live_tab(params)
+        if params.get("activate"):
+            self.browser.tabs.setCurrentWidget(tab)
+        image = tab.web_view.grab()
+        path = params.get("path")
+        if path:
+            if not image.save(os.path.expanduser(path), "PNG"):
+                raise RpcError(INTERNAL_ERROR, f"não foi possível salvar {path}")
+            respond({"path": path, "width": image.width(), "height": image.height()})
+            return
+        data = QByteArray()
+        buffer = QBuffer(data)
+        buffer.open(QIODevice.OpenModeFlag.WriteOnly)
+        image.save(buffer, "PNG")
+        buffer.close()
+        respond({"png": base64.b64encode(bytes(data)).decode("ascii"), "width": image.width(), "height": image.height()})
+
+    # --- Configurações por site ---
+    def site_host(self, params):
+        host = params.get("host")
+        if not isinstance(host, str) or not host.strip():
+            raise RpcError(INVALID_PARAMS, "host obrigatório")
+        return host
+
+    def refresh_site_settings(self):
+        # Vale para as abas abertas já; o documento atual só muda depois de recarregar
+        for tab in self.browser_tabs():
+            if tab.web_view is not None:
+                page = tab.web_view.page()
+                if hasattr(page, "apply_site_settings"):
+                    page.apply_site_settings(page.url().host())
+
+    def sites_list(self, params, respond):
+        respond(self.browser.profile.site_settings.sites)
+
+    def site_get(self, params, respond):
+        sites = self.browser.profile.site_settings
+        host = self.site_host(params)
+        respond({"host": host, "settings": sites.get(host), "effective": dict(sites.resolve(host))})
+
+    def site_set(self, params, respond):
+        host = self.site_host(params)
+        values = params.get("settings")
+        if not isinstance(values, dict) or not values:
+            raise RpcError(INVALID_PARAMS, "settings precisa ser um objeto {atributo: true/false/null}")
+        unknown = [name for name, value in values.items() if name not in WEB_ATTRIBUTES or not (value is None or isinstance(value, bool))]
+        if unknown:
+            raise RpcError(INVALID_PARAMS, "atributo ou valor inválido", unknown)
+        settings = self.browser.profile.site_settings.set(host, values)
+        self.refresh_site_settings()
+        respond({"host": host, "settings": settings})
+
+    def site_clear(self, params, respond):
+        removed = self.browser.profile.site_settings.clear(self.site_host(params))
+        self.refresh_site_settings()
+        respond(removed)
@@ -0,0 +1,98 @@
+import os, sys, base64
+
+BROWSER_PATH = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+sys.path.append(BROWSER_PATH)
+
+from PySide6.QtCore import QObject, QTimer, QByteArray, QDataStream, QIODevice
+
+from browser.api.session_journal import SessionJournal
+
+SAVE_DELAY_MS = 500
+
+
+def capture_history(page):
+    # URL/título atuais + histórico voltar/avançar (serializado pelo próprio Qt)
+    history = page.history()
+    data = QByteArray()
+    stream = QDataStream(data, QIODevice.OpenModeFlag.WriteOnly)
+    stream << history
+    return {
+        "url": page.url().toString(),
+        "title": page.title(),
+        "index": history.currentItemIndex(),
+        "entries": [[item.url().toString(), item.title()] for item in history.items()],
+        "history": base64.b64encode(bytes(data)).decode("ascii"),
+    }
+
+
+def restore_history(page, state):
+    encoded = (state or {}).get("history")
+    if not encoded:
+        return False
+    data = QByteArray(base64.b64decode(encoded))
+    stream = QDataStream(data, QIODevice.OpenModeFlag.ReadOnly)
+    stream >> page.history()
+    return page.history().count() > 0
+
+
+# ---------------- SessionManager ----------------
+# Liga as abas ao SessionJournal: abrir, fechar, mover, selecionar e navegar viram
+# operações no journal. Navegações são agrupadas por aba (SAVE_DELAY_MS) para não
+# serializar o histórico a cada urlChanged.
+class SessionManager(QObject):
+    def __init__(self, tabs, folder, parent=None):
+        super().__init__(parent)
+        self.tabs = tabs
+        self.journal = SessionJournal(folder)
+        self.restoring = False
+        self.dirty = set()
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(SAVE_DELAY_MS)
+        self.timer.timeout.connect(self.save_dirty)
+
+    def browser_tabs(self):
+        for i in range(self.tabs.count()):
+            tab = self.tabs.widget(i)
+            if hasattr(tab, "session_id"):
+                yield tab
+
+    def load(self):
+        return self.journal.load()
+
+    def track(self, tab):
+        if not self.restoring:
+            self.journal.open(tab.session_id, tab.session_state() or {}, self.tabs.indexOf(tab))
+
+    def attach(self, tab):
+        view = tab.web_view
+        view.urlChanged.connect(lambda url, t=tab: self.mark(t))
+        view.titleChanged.connect(lambda title, t=tab: self.mark(t))
+        view.loadFinished.connect(lambda ok, t=tab: self.mark(t))
+
+    def mark(self, tab):
+        self.dirty.add(tab)
+        if not self.timer.isActive():
+            self.timer.start()
+
+    def save_dirty(self):
+        dirty, self.dirty = self.dirty, set()
+        for tab in dirty:
+            if self.tabs.indexOf(tab) != -1:
+                self.journal.update(tab.session_id, tab.session_state())
+
+    def untrack(self, tab):
+        self.dirty.discard(tab)
+        self.journal.close_tab(tab.session_id)
+
+    def moved(self):
+        if not self.restoring:
+            self.journal.order(tab.session_id for tab in self.browser_tabs())
+
+    def selected(self, tab):
+        if not self.restoring:
+            self.journal.select(tab.session_id)
+
+    def close(self):
+        self.save_dirty()
+        self.journal.close()
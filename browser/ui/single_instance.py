@@ -0,0 +1,72 @@
+import os, sys
+
+BROWSER_PATH = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+sys.path.append(BROWSER_PATH)
+
+from PySide6.QtCore import QObject, Signal
+from PySide6.QtNetwork import QLocalServer
+
+from browser.api.instance_client import instance_name, decode_message, forward_to_running
+
+MAX_MESSAGE = 1024 * 1024
+
+
+# ---------------- InstanceServer ----------------
+# Instância principal: escuta no socket local e repassa (received) as mensagens
+# JSON de execuções seguintes ({"args": [...], "cwd": ..., "show": ...}). Cada
+# mensagem é uma linha; a resposta "ok" libera o processo que enviou.
+class InstanceServer(QObject):
+    received = Signal(object)
+
+    def __init__(self, name=None, parent=None):
+        super().__init__(parent)
+        self.name = name or instance_name()
+        self.server = QLocalServer(self)
+        self.server.setSocketOptions(QLocalServer.SocketOption.UserAccessOption)
+        self.server.newConnection.connect(self.accept)
+        self.buffers = {}
+
+    def listen(self):
+        # Com UserAccessOption o listen troca o arquivo do socket sem reclamar: se outra
+        # instância abriu depois do nosso forward e ainda responde, o socket é dela
+        if forward_to_running({"args": [], "show": True}, self.name):
+            return False
+        if self.server.listen(self.name):
+            return True
+        # Socket órfão de uma execução que caiu
+        QLocalServer.removeServer(self.name)
+        return self.server.listen(self.name)
+
+    def accept(self):
+        while self.server.hasPendingConnections():
+            socket = self.server.nextPendingConnection()
+            self.buffers[socket] = b""
+            socket.readyRead.connect(lambda s=socket: self.read(s))
+            socket.disconnected.connect(lambda s=socket: self.drop(s))
+
+    def read(self, socket):
+        data = self.buffers.get(socket, b"") + bytes(socket.readAll())
+        if b"\n" not in data:
+            if len(data) > MAX_MESSAGE:
+                socket.abort()
+            else:
+                self.buffers[socket] = data
+            return
+        line = data.split(b"\n", 1)[0]
+        self.buffers[socket] = b""
+        try:
+            message = decode_message(line)
+        except ValueError:
+            socket.abort()
+            return
+        socket.write(b"ok\n")
+        socket.flush()
+        socket.disconnectFromServer()
+        self.received.emit(message)
+
+    def drop(self, socket):
+        self.buffers.pop(socket, None)
+        socket.deleteLater()
+
+    def close(self):
+        self.server.close()
@@ -1,4 +1,4 @@
-import tldextract, sys, uuid, json, os, importlib
+import sys, uuid, json, os, importlib
 
 BROWSER_PATH = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
 sys.path.append( BROWSER_PATH );
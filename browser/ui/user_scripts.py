@@ -0,0 +1,87 @@
+import os, sys
+
+BROWSER_PATH = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+sys.path.append(BROWSER_PATH)
+
+from PySide6.QtWebEngineCore import QWebEngineScript
+
+SCRIPTS_FOLDER = os.path.join(BROWSER_PATH, "resources", "scripts")
+
+Injection = QWebEngineScript.InjectionPoint
+World = QWebEngineScript.ScriptWorldId
+
+
+def read_script(filename):
+    with open(os.path.join(SCRIPTS_FOLDER, filename), "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def metadata(name, matches=None, excludes=None):
+    # Cabeçalho Greasemonkey: o próprio QtWebEngine filtra as URLs por @include/@exclude
+    lines = ["// ==UserScript==", f"// @name {name}"]
+    lines += [f"// @include {pattern}" for pattern in matches or ()]
+    lines += [f"// @exclude {pattern}" for pattern in excludes or ()]
+    lines.append("// ==/UserScript==")
+    return "\n".join(lines) + "\n"
+
+
+# ---------------- UserScriptRegistry ----------------
+# Scripts de tema/auxiliares montados uma vez como QWebEngineScript e instalados na
+# coleção de scripts dos perfis: o Chromium injeta (e guarda compilado) em cada
+# documento, sem runJavaScript a cada loadFinished. Desligar um script vale a partir
+# da próxima navegação.
+class UserScriptRegistry:
+    def __init__(self):
+        self.scripts = {}
+        self.enabled = {}
+        self.collections = []
+
+    def attach(self, profile):
+        collection = profile.scripts()
+        if any(c is collection for c in self.collections):
+            return
+        self.collections.append(collection)
+        for name, script in self.scripts.items():
+            if self.enabled[name]:
+                collection.insert(script)
+
+    def register(self, name, source, matches=None, excludes=None,
+                 injection=Injection.DocumentCreation, world=World.ApplicationWorld,
+                 subframes=True, enabled=True):
+        self.unregister(name)
+        script = QWebEngineScript()
+        script.setName(name)
+        script.setSourceCode(metadata(name, matches, excludes) + source)
+        script.setInjectionPoint(injection)
+        script.setWorldId(world)
+        script.setRunsOnSubFrames(subframes)
+        self.scripts[name] = script
+        self.enabled[name] = False
+        self.set_enabled(name, enabled)
+        return script
+
+    def register_file(self, name, filename, **kwargs):
+        return self.register(name, read_script(filename), **kwargs)
+
+    def unregister(self, name):
+        if name in self.scripts:
+            self.set_enabled(name, False)
+            del self.scripts[name]
+            del self.enabled[name]
+
+    def set_enabled(self, name, enabled):
+        enabled = bool(enabled)
+        if self.enabled.get(name) == enabled:
+            return
+        self.enabled[name] = enabled
+        for collection in self.collections:
+            if enabled:
+                collection.insert(self.scripts[name])
+            else:
+                collection.remove(self.scripts[name])
+
+    def is_enabled(self, name):
+        return self.enabled.get(name, False)
+
+    def names(self):
+        return list(self.scripts)
@@ -0,0 +1,88 @@
+# Proxy com cache contra uma origem local: o cache é compartilhado entre perfis,
+# então Set-Cookie de um perfil nunca pode ser repetido para outro.
+#
+#   python3 -m unittest tests/test_caching_proxy.py
+import os, sys, shutil, tempfile, threading, unittest, urllib.request
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+BASE_PATH = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+sys.path.append(BASE_PATH)
+
+from browser.api.caching_proxy import CachingProxy, probe_proxy
+
+
+class Origin(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    hits = {}
+    sessions = iter(range(1, 1000))
+
+    def do_GET(self):
+        Origin.hits[self.path] = Origin.hits.get(self.path, 0) + 1
+        body = f"{self.path} {Origin.hits[self.path]}".encode()
+        self.send_response(200)
+        self.send_header("Cache-Control", "public, max-age=3600")
+        if self.path == "/login":
+            self.send_header("Set-Cookie", f"session=SECRET-{next(Origin.sessions)}")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class CachingProxyCookieTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.origin = ThreadingHTTPServer(("127.0.0.1", 0), Origin)
+        threading.Thread(target=cls.origin.serve_forever, daemon=True).start()
+        cls.base = f"http://127.0.0.1:{cls.origin.server_address[1]}"
+        cls.folder = tempfile.mkdtemp()
+        cls.proxy = CachingProxy(cls.folder)
+        port = cls.proxy.start_in_thread()
+        cls.opener = urllib.request.build_opener(urllib.request.ProxyHandler({"http": f"http://127.0.0.1:{port}"}))
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.proxy.shutdown()
+        cls.origin.shutdown()
+        shutil.rmtree(cls.folder, ignore_errors=True)
+
+    def get(self, path, cookie=None):
+        request = urllib.request.Request(self.base + path)
+        if cookie:
+            request.add_header("Cookie", cookie)
+        with self.opener.open(request, timeout=10) as response:
+            return response.read().decode(), response.headers
+
+    def test_cacheable_response_is_hit(self):
+        first, _ = self.get("/static")
+        second, headers = self.get("/static")
+        self.assertEqual(first, second)
+        self.assertEqual(headers.get("X-Cache"), "HIT")
+        self.assertEqual(Origin.hits["/static"], 1)
+
+    def test_set_cookie_is_not_replayed(self):
+        _, profile_a = self.get("/login")
+        _, profile_b = self.get("/login")
+        self.assertIsNone(profile_b.get("X-Cache"))
+        self.assertNotEqual(profile_a.get("Set-Cookie"), profile_b.get("Set-Cookie"))
+        self.assertEqual(Origin.hits["/login"], 2)
+
+    def test_request_with_cookie_bypasses_cache(self):
+        self.get("/account", cookie="session=SECRET-A")
+        body, headers = self.get("/account", cookie="session=SECRET-B")
+        self.assertIsNone(headers.get("X-Cache"))
+        self.assertEqual(body, "/account 2")
+        # Sem Cookie o pedido não reaproveita a resposta do perfil com sessão
+        _, headers = self.get("/account")
+        self.assertIsNone(headers.get("X-Cache"))
+
+    def test_probe_only_accepts_the_proxy(self):
+        self.assertTrue(probe_proxy(self.proxy.port))
+        # Outro servidor HTTP na porta não é reaproveitado como proxy
+        self.assertFalse(probe_proxy(self.origin.server_address[1]))
+
+
+if __name__ == "__main__":
+    unittest.main()